@@ -1,4 +1,8 @@
+import atexit
+import io
+import os
 from datetime import date, datetime, timedelta
+import click
 from extensions import db
 from models import MoodEntry
 
@@ -11,19 +15,47 @@ from flask import (
     url_for,
     flash,
     session,
+    Response,
+    stream_with_context,
 )
 
 from mood_mastery.mood_journal import Mood_Journal
 from mood_mastery.entry import BIOMETRICS, Entry
 from apscheduler.schedulers.background import BackgroundScheduler
 from notifications import NotificationManager
+from sqlite_tuning import DEFAULT_SQLITE_PROFILE, SQLiteTuning
+from migrations import run_migrations
+from journal_export import JournalExport
+from journal_import import JournalImport
 from models_notification import NotificationSettings
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "dev-key"
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///app.db"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# Queue journal writes and group-commit them on a background thread instead of
+# committing inside each request
+app.config["MOOD_JOURNAL_WRITE_BEHIND"] = False
+# Only load this many recent days of entries at startup (None loads the whole journal);
+# older date ranges are fetched the first time a view asks for them
+app.config["MOOD_JOURNAL_LOAD_WINDOW_DAYS"] = None
+# Keep a columnar snapshot of the journal next to app.db (app.db.snapshot), written after a
+# full table load, and start from it while nothing has changed in the database since
+app.config["MOOD_JOURNAL_SNAPSHOT"] = True
+# Load entries with a short preview instead of their full body; a body is read from the
+# database (in batches) the first time something needs it, e.g. the view modal
+app.config["MOOD_JOURNAL_DEFER_BODIES"] = True
+# Work out the similar entries of written entries on a background thread, so the view modal
+# reads them from a cache instead of searching the journal (loaded entries are searched the
+# first time they're opened, then cached)
+app.config["MOOD_JOURNAL_PREFILL_SIMILAR"] = True
+# PRAGMAs run on every new SQLite connection (set to None to keep SQLite's defaults)
+app.config["SQLITE_PERFORMANCE_PROFILE"] = dict(DEFAULT_SQLITE_PROFILE)
+app.config["SQLITE_WAL_CHECKPOINT_MINUTES"] = 5
+# Rows per transaction when importing CSV/JSONL history
+app.config["MOOD_JOURNAL_IMPORT_CHUNK_SIZE"] = 1000
 db.init_app(app)
+SQLiteTuning.apply_profile(app)
 
 # ==============================
 # Toast Notification Ping Storage
@@ -88,6 +120,7 @@ def update_notifications():
 
 with app.app_context():
     db.create_all()
+    run_migrations(db.engine)
 
 
 
@@ -100,8 +133,20 @@ scheduler.start()
 with app.app_context():
     NotificationManager.schedule_job(scheduler, last_notification)
 
+SQLiteTuning.schedule_checkpoint(scheduler, app)
+
 # In-memory journal instance
-mj = Mood_Journal(use_database=True)
+mj = Mood_Journal(
+    use_database=True,
+    app=app,
+    write_behind=app.config["MOOD_JOURNAL_WRITE_BEHIND"],
+    load_window_days=app.config["MOOD_JOURNAL_LOAD_WINDOW_DAYS"],
+    snapshot=app.config["MOOD_JOURNAL_SNAPSHOT"],
+    defer_bodies=app.config["MOOD_JOURNAL_DEFER_BODIES"],
+    prefill_similar=app.config["MOOD_JOURNAL_PREFILL_SIMILAR"],
+)
+# Make sure queued writes reach the database before the process exits
+atexit.register(mj.mj_close)
 
 # ----------------- THEME CONFIG -----------------
 
@@ -257,6 +302,23 @@ def _build_report_dict(title: str, counts: list[int], start: date, end: date) ->
     }
 
 
+def _date_range_args(default_start: date, default_end: date) -> tuple[date, date]:
+    """
+    (start, end) from the ?start=YYYY-MM-DD&end=YYYY-MM-DD query args, falling back to
+    the defaults for missing or invalid values; a reversed range is swapped.
+    """
+    bounds = []
+    for name, default in (("start", default_start), ("end", default_end)):
+        try:
+            bounds.append(date.fromisoformat(request.args.get(name, "")))
+        except ValueError:
+            bounds.append(default)
+    start, end = bounds
+    if end < start:
+        start, end = end, start
+    return start, end
+
+
 # ----------------- NEW: Mood trends + difficulty helpers -----------------
 
 
@@ -290,33 +352,14 @@ def _difficulty_by_weekday():
     Compute average difficulty_ranking per weekday.
     Returns list[ { label, avg, count } ] in Mon→Sun order.
     """
-    entries = mj.mj_get_all_entries()
-    sums = {i: 0 for i in range(7)}
-    counts = {i: 0 for i in range(7)}
-
-    for e in entries:
-        d = e.entry_date
-        if not d:
-            continue
-        w = d.weekday()  # Monday=0 .. Sunday=6
-        val = getattr(e, "difficulty_ranking", None)
-        if val is None:
-            continue
-        sums[w] += val
-        counts[w] += 1
-
     labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
     result = []
-    for i in range(7):
-        if counts[i] > 0:
-            avg = sums[i] / counts[i]
-        else:
-            avg = None
+    for label, (avg, count) in zip(labels, mj.mj_difficulty_by_weekday()):
         result.append(
             {
-                "label": labels[i],
+                "label": label,
                 "avg": avg,
-                "count": counts[i],
+                "count": count,
             }
         )
     return result
@@ -403,7 +446,11 @@ def add_entry():
     month = int(request.form.get("month"))
     day = int(request.form.get("day"))
     body = request.form.get("body", "")
-    ranking = int(request.form.get("ranking", "5"))
+    try:
+        ranking = int(request.form.get("ranking", "5"))
+    except ValueError:
+        ranking = 5
+    ranking = max(1, min(8, ranking))
 
     mood_rating_raw = request.form.get("mood_rating", "").strip()
     try:
@@ -424,11 +471,11 @@ def add_entry():
     tags_str = request.form.get("tags", "")
     tags = [t.strip() for t in tags_str.split(",") if t.strip()] if tags_str else None
 
-    # Biometrics
+    # Biometrics (values outside the vocabulary are dropped, as Entry always did)
     biometrics = {}
     for key in BIOMETRICS.keys():
         val = request.form.get(f"bio_{key}", "").strip()
-        if val:
+        if val in BIOMETRICS[key]:
             biometrics[key] = val
 
     mj.mj_log_entry(
@@ -482,7 +529,7 @@ def view_entry(entry_id):
         view_e=e,
         view_body=view_body,
         view_ask_password=view_ask_password,
-        view_excluded=getattr(e, "excluded_from_reports", False),
+        view_excluded=e.is_excluded_from_reports,
         open_view_modal=True,
         open_edit_modal=False,
         open_report_modal=False,
@@ -523,7 +570,7 @@ def unlock_entry(entry_id):
         view_e=e,
         view_body=e.entry_body,
         view_ask_password=False,
-        view_excluded=getattr(e, "excluded_from_reports", False),
+        view_excluded=e.is_excluded_from_reports,
         open_view_modal=True,
         open_edit_modal=False,
         open_report_modal=False,
@@ -609,7 +656,11 @@ def edit_entry_save(entry_id):
     month = int(request.form.get("month"))
     day = int(request.form.get("day"))
     body = request.form.get("body", "")
-    ranking = int(request.form.get("ranking", "5"))
+    try:
+        ranking = int(request.form.get("ranking", "5"))
+    except ValueError:
+        ranking = e.ranking
+    ranking = max(1, min(8, ranking))
 
     mood_rating_raw = request.form.get("mood_rating", "").strip()
     try:
@@ -683,7 +734,7 @@ def add_tag(entry_id):
         return redirect(url_for("index"))
 
     tag = request.form.get("tag", "")
-    if e.add_tag(tag):
+    if mj.mj_add_tag(entry_id, tag):
         flash("Tag added.", "success")
     else:
         flash("Tag not added (maybe empty or duplicate).", "error")
@@ -698,7 +749,7 @@ def delete_tag(entry_id):
         return redirect(url_for("index"))
 
     tag = request.form.get("tag", "")
-    if e.remove_tag(tag):
+    if mj.mj_remove_tag(entry_id, tag):
         flash("Tag removed.", "success")
     else:
         flash("Tag not found.", "error")
@@ -712,7 +763,7 @@ def clear_tags(entry_id):
         flash("Entry not found.", "error")
         return redirect(url_for("index"))
 
-    e.clear_tags()
+    mj.mj_clear_tags(entry_id)
     flash("All tags cleared.", "success")
     return redirect(url_for("edit_entry_open", entry_id=entry_id))
 
@@ -741,14 +792,11 @@ def toggle_exclude_entry(entry_id):
     Toggle whether an entry is included in mood/streak reports.
     Uses a hidden 'exclude' field with values '0' or '1'.
     """
-    e = mj.mj_get_entry(entry_id)
-    if not e:
-        flash("Entry not found.", "error")
-        return redirect(url_for("index"))
-
     raw = request.form.get("exclude", "0")
     new_val = raw == "1"
-    setattr(e, "excluded_from_reports", new_val)
+    if not mj.mj_set_entry_excluded_from_reports(entry_id, new_val):
+        flash("Entry not found.", "error")
+        return redirect(url_for("index"))
 
     if new_val:
         flash("Entry excluded from mood reports.", "success")
@@ -794,6 +842,40 @@ def weekly_report():
     )
 
 
+@app.get("/report/range")
+def range_report():
+    """Mood snapshot over any ?start=&end= range (the last 7 days by default)"""
+    today = date.today()
+    start, end = _date_range_args(today - timedelta(days=6), today)
+    counts = mj.mj_range_report(start, end)
+    if counts is None:
+        flash(f"No entries between {start.isoformat()} and {end.isoformat()}.", "error")
+        return redirect(url_for("index"))
+
+    report = _build_report_dict("Mood Snapshot", counts, start, end)
+
+    entries = _sorted_entries()
+    summary = _streak_summary_for_ui()
+    tag_ctx = _tag_context()
+    mood_trends = _mood_trends_for_ui()
+    difficulty_weekday = _difficulty_by_weekday()
+
+    return render_template(
+        "index.html",
+        entries=entries,
+        today=today,
+        summary=summary,
+        password_set=(ENTRY_PASSWORD is not None),
+        report=report,
+        open_report_modal=True,
+        open_view_modal=False,
+        open_edit_modal=False,
+        mood_trends=mood_trends,
+        difficulty_weekday=difficulty_weekday,
+        **tag_ctx,
+    )
+
+
 @app.get("/report/monthly")
 def monthly_report():
     today = date.today()
@@ -862,15 +944,15 @@ def calendar_view():
 @app.get("/mood-graph")
 def mood_graph():
     """
-    Mood rating graph (line or bar) for the last 14 days.
+    Mood rating graph (line or bar) for the last 14 days, or any ?start=&end= range.
     """
     mode = request.args.get("mode", "line")
     if mode not in ("line", "bar"):
         mode = "line"
 
     today = date.today()
-    start = today - timedelta(days=13)
-    data_dict = mj.mj_mood_rating_graph(mode, start, today)
+    start, end = _date_range_args(today - timedelta(days=13), today)
+    data_dict = mj.mj_mood_rating_graph(mode, start, end)
 
     if mode == "line":
         days_sorted = sorted(data_dict.keys())
@@ -894,6 +976,7 @@ def mood_graph():
         mood_graph_labels=labels,
         mood_graph_values=values,
         mood_graph_mode=mode,
+        mood_graph_range=(start.isoformat(), end.isoformat()),
         password_set=(ENTRY_PASSWORD is not None),
         open_view_modal=False,
         open_edit_modal=False,
@@ -912,9 +995,10 @@ def emoji_groups():
     """Show all emoji groups with distribution"""
     emoji_data = {}
 
-    # Get data for all emojis (1-5 rankings)
+    # Get data for all emojis (1-5 rankings) in one call
+    groups = mj.mj_emoji_groups_all()
     for emoji_rank in range(1, 6):
-        rating_count, entry_keys = mj.mj_emoji_groups(emoji_rank)
+        rating_count, entry_keys = groups[emoji_rank]
         total_entries = sum(rating_count)
 
         if total_entries > 0:
@@ -1002,7 +1086,7 @@ def similar_entries(entry_id):
             view_e=e,
             view_body=view_body,
             view_ask_password=view_ask_password,
-            view_excluded=getattr(e, "excluded_from_reports", False),
+            view_excluded=e.is_excluded_from_reports,
             open_view_modal=True,
             open_edit_modal=False,
             open_report_modal=False,
@@ -1035,12 +1119,7 @@ def emoji_group_detail(emoji_rank):
         flash(f"No entries found for {ranking_emoji(emoji_rank)} emoji.", "error")
         return redirect(url_for("emoji_groups"))
 
-    emoji_entries = []
-    for key in entry_keys:
-        entry = mj.mj_get_entry(key)
-        if entry:
-            emoji_entries.append(entry)
-
+    emoji_entries = mj.mj_get_entries(entry_keys)
     emoji_entries.sort(key=lambda e: e.entry_date, reverse=True)
 
     distribution = []
@@ -1103,5 +1182,93 @@ def clear_all_data():
     return redirect(url_for("index"))
 
 
+def _export_response(chunks, mimetype, filename):
+    """Stream an export out page by page instead of building it in memory"""
+    mj.mj_flush()  # queued write-behind saves belong in the export
+    rows = JournalExport.iter_rows()
+    return Response(
+        stream_with_context(chunks(rows)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@app.get("/export.csv")
+def export_csv():
+    """Download every entry as CSV (private entries without their body)"""
+    return _export_response(JournalExport.csv_chunks, "text/csv", "mood_journal.csv")
+
+
+@app.get("/export.jsonl")
+def export_jsonl():
+    """Download every entry as JSON Lines (private entries without their body)"""
+    return _export_response(
+        JournalExport.jsonl_chunks, "application/x-ndjson", "mood_journal.jsonl"
+    )
+
+
+@app.post("/import")
+def import_entries():
+    """Import entries from an uploaded CSV/JSONL file (same columns as the export)"""
+    upload = request.files.get("file")
+    fmt = JournalImport.format_for(upload.filename if upload else None)
+    if not upload or fmt is None:
+        flash("Choose a .csv or .jsonl file to import.", "error")
+        return redirect(url_for("index"))
+
+    stream = io.TextIOWrapper(upload.stream, encoding="utf-8-sig", newline="")
+    try:
+        summary = JournalImport.import_stream(
+            mj, stream, fmt, chunk_size=app.config["MOOD_JOURNAL_IMPORT_CHUNK_SIZE"]
+        )
+    except Exception as ex:
+        app.logger.error(f"Error importing {upload.filename}: {str(ex)}")
+        flash(f"Import failed: {str(ex)}", "error")
+        return redirect(url_for("index"))
+    message = (
+        f"Imported {summary['imported']} entries "
+        f"({summary['duplicates']} already present, {summary['failed']} invalid)."
+    )
+    if summary["stopped"]:
+        message += f" Stopped early: {summary['stopped']}."
+    flash(message, "success" if not summary["failed"] else "error")
+    return redirect(url_for("index"))
+
+
+@app.cli.command("import-entries")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default=None,
+              help="Defaults to the file extension.")
+@click.option("--chunk-size", type=int, default=None, help="Rows per transaction.")
+@click.option("--no-resume", is_flag=True, help="Ignore a checkpoint left by an earlier run.")
+def import_entries_command(path, fmt, chunk_size, no_resume):
+    """Import a CSV/JSONL file; an interrupted run resumes from its last committed chunk."""
+    fmt = fmt or JournalImport.format_for(path)
+    if fmt is None:
+        raise click.UsageError("can't tell the format from the file name, pass --format")
+    checkpoint_path = path + ".checkpoint"
+    if no_resume and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    with open(path, encoding="utf-8-sig", newline="") as stream:
+        summary = JournalImport.import_stream(
+            mj,
+            stream,
+            fmt,
+            chunk_size=chunk_size or app.config["MOOD_JOURNAL_IMPORT_CHUNK_SIZE"],
+            checkpoint_path=checkpoint_path,
+        )
+    if summary["resumed_from"]:
+        click.echo(f"Resumed after row {summary['resumed_from']}")
+    click.echo(
+        f"Imported {summary['imported']} entries, skipped {summary['duplicates']} duplicates, "
+        f"{summary['failed']} invalid rows"
+    )
+    for row_number, reason in summary["errors"]:
+        click.echo(f"  row {row_number}: {reason}")
+    if summary["stopped"]:
+        click.echo(f"Stopped early ({summary['stopped']}); fix the file and rerun to resume")
+
+
 if __name__ == "__main__":
     app.run(debug=True)
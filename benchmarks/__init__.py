@@ -0,0 +1,8 @@
+"""
+Micro-benchmarks for the mood journal's hot paths.
+
+Each module is a standalone script run from the repository root, e.g.:
+    python -m benchmarks.bench_upsert
+
+They build their own throwaway SQLite databases and never touch instance/app.db.
+"""
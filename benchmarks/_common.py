@@ -0,0 +1,63 @@
+"""Shared helpers for the benchmark scripts"""
+
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+from flask import Flask
+
+import models  # noqa: F401  (registers the tables on db)
+from extensions import db
+
+
+def make_app(db_path=None):
+    """
+    Create a Flask app bound to a fresh SQLite file (a temp file unless db_path is given).
+    """
+    if db_path is None:
+        db_path = Path(tempfile.mkdtemp(prefix="mj-bench-")) / "bench.db"
+    bench_app = Flask(__name__)
+    bench_app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    db.init_app(bench_app)
+    with bench_app.app_context():
+        db.create_all()
+    return bench_app
+
+
+def synthetic_rows(n, seed=555, start=date(2015, 1, 1)):
+    """
+    Yield n rows of mj_create_entry arguments with plausible, reproducible values.
+    """
+    rng = random.Random(seed)
+    tag_pool = ["work", "gym", "friends", "family", "sleep", "school", "travel", "focus"]
+    for i in range(n):
+        d = start + timedelta(days=rng.randrange(3650))
+        yield (
+            f"Entry {i}",
+            d.day,
+            d.month,
+            d.year,
+            " ".join(rng.choice(tag_pool) for _ in range(rng.randrange(5, 60))),
+            rng.randint(1, 8),
+            rng.randint(1, 100),
+            rng.randint(1, 5),
+            rng.sample(tag_pool, rng.randrange(0, 3)),
+        )
+
+
+@contextmanager
+def timed(label, count=None, unit="ops"):
+    """Print how long the block took and, given a count, the throughput"""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    if count:
+        print(f"{label:<48} {elapsed:8.3f}s  {count / elapsed:12,.0f} {unit}/s")
+    else:
+        print(f"{label:<48} {elapsed:8.3f}s")
@@ -0,0 +1,91 @@
+"""
+Database size and body read/write throughput for each entry-body storage format on a
+synthetic journal corpus:
+  - legacy: the body stored twice (entry_body and notes), uncompressed
+  - one row per body_codec codec: a single compressed copy in entry_body_z
+
+Usage:
+    python -m benchmarks.bench_body_storage [table_rows]
+"""
+
+import os
+import random
+import sys
+
+from benchmarks._common import make_app, synthetic_rows, timed
+from extensions import db
+from mood_mastery import body_codec
+from mood_mastery.mood_journal import Mood_Journal
+
+_PHRASES = [
+    "I felt really tired this morning",
+    "the lecture ran long and I couldn't focus",
+    "had coffee with my friends after class",
+    "I'm worried about the exam on Friday",
+    "went for a walk to clear my head",
+    "my roommate and I cooked dinner together",
+    "work was stressful but I managed to finish the project",
+    "I slept badly and felt anxious all day",
+    "called my parents and felt a lot better",
+    "the gym was empty so I stayed for an hour",
+    "I'm proud of how the presentation went",
+    "I need to start the assignment earlier next time",
+]
+
+
+def journal_rows(n, seed=14):
+    """synthetic_rows with bodies made of everyday journal sentences (2-12 per entry)"""
+    rng = random.Random(seed)
+    for row in synthetic_rows(n):
+        sentences = (rng.choice(_PHRASES) for _ in range(rng.randint(2, 12)))
+        body = ". ".join(s[0].upper() + s[1:] for s in sentences) + "."
+        yield row[:4] + (body,) + row[5:]
+
+
+def database_mb(app):
+    with app.app_context():
+        db.session.execute(db.text("VACUUM"))
+        path = db.engine.url.database
+    return os.path.getsize(path) / 1e6
+
+
+def store_legacy(app):
+    """Rewrite every row the way from_entry used to: plain body in entry_body and in notes"""
+    with app.app_context():
+        rows = db.session.execute(db.text("SELECT id, entry_body_z FROM mood_entry")).all()
+        db.session.execute(
+            db.text(
+                "UPDATE mood_entry SET entry_body = :body, notes = :body, entry_body_z = NULL"
+                " WHERE id = :id"
+            ),
+            [{"id": row_id, "body": body_codec.decode_body(z)} for row_id, z in rows],
+        )
+        db.session.commit()
+
+
+def main(table_rows=50_000):
+    rows = list(journal_rows(table_rows))
+    text_mb = sum(len(row[4].encode("utf-8")) for row in rows) / 1e6
+    print(f"{table_rows:,} entries, {text_mb:.1f} MB of body text")
+
+    sizes = {}
+    for codec in body_codec.available_codecs():
+        body_codec.DEFAULT_CODEC = codec
+        app = make_app()
+        with timed(f"codec {codec}: write", table_rows, "rows"):
+            Mood_Journal(app=app).mj_bulk_create(rows)
+        with timed(f"codec {codec}: read (full load with bodies)", table_rows, "rows"):
+            Mood_Journal(app=app).mj_get_all_entries()
+        sizes[f"codec {codec}"] = database_mb(app)
+        if codec == body_codec.RAW:
+            store_legacy(app)
+            with timed("legacy: read (full load with bodies)", table_rows, "rows"):
+                Mood_Journal(app=app).mj_get_all_entries()
+            sizes["legacy (body + notes)"] = database_mb(app)
+
+    for label, size in sizes.items():
+        print(f"database size, {label:<24} {size:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,78 @@
+"""
+A whole-journal analytic (average difficulty_ranking per weekday, shown on every page) at
+10k / 100k / 1M resident entries: the per-Entry attribute loop it used to be, against the
+column store's reduction with NumPy (when installed) and with plain loops over the arrays.
+
+Entries are built with Entry._from_trusted and added to a bare ColumnStore, so the
+million-entry case doesn't pay for the journal's other indexes.
+
+Usage:
+    python -m benchmarks.bench_column_store [sizes...] [--calls N]
+"""
+
+import random
+import sys
+from datetime import date
+
+from benchmarks._common import timed
+from mood_mastery import column_store
+from mood_mastery.column_store import ColumnStore
+from mood_mastery.entry import Entry
+
+
+def make_entries(n, seed=22):
+    rng = random.Random(seed)
+    first = date(2015, 1, 1).toordinal()
+    return [
+        Entry._from_trusted(
+            f"id-{i}", "", date.fromordinal(first + rng.randrange(3650)), "",
+            rng.randint(1, 8), rng.randint(1, 100), rng.randint(1, 100),
+        )
+        for i in range(n)
+    ]
+
+
+def entry_loop(entries):
+    """The old _difficulty_by_weekday: one date and one attribute read per Entry"""
+    sums, counts = [0] * 7, [0] * 7
+    for e in entries:
+        w = e.entry_date.weekday()
+        sums[w] += e.difficulty_ranking
+        counts[w] += 1
+    return sums, counts
+
+
+def main(sizes=(10_000, 100_000, 1_000_000), calls=5):
+    numpy = column_store.numpy
+    for n in sizes:
+        entries = make_entries(n)
+        store = ColumnStore()
+        with timed(f"{n:>9,}: fill column store", n, "rows"):
+            for e in entries:
+                store.add(e)
+        expected = entry_loop(entries)
+
+        with timed(f"{n:>9,}: Entry attribute loop", calls, "calls"):
+            for _ in range(calls):
+                entry_loop(entries)
+        column_store.numpy = None
+        with timed(f"{n:>9,}: column store, plain loops", calls, "calls"):
+            for _ in range(calls):
+                assert store.weekday_sums("difficulty_ranking") == expected
+        column_store.numpy = numpy
+        if numpy is not None:
+            with timed(f"{n:>9,}: column store, NumPy", calls * 10, "calls"):
+                for _ in range(calls * 10):
+                    assert store.weekday_sums("difficulty_ranking") == expected
+        else:
+            print(f"{n:>9,}: column store, NumPy               (numpy not installed)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    calls = 5
+    if "--calls" in args:
+        i = args.index("--calls")
+        calls = int(args[i + 1])
+        del args[i:i + 2]
+    main(tuple(int(arg) for arg in args) or (10_000, 100_000, 1_000_000), calls)
@@ -0,0 +1,49 @@
+"""
+Date-range queries on a fully resident journal: the sorted date index (two bisects, then
+only the days in range) against the full scan of entries_dict it replaced.
+
+Usage:
+    python -m benchmarks.bench_date_queries [entries] [queries]
+"""
+
+import random
+import sys
+from datetime import date, timedelta
+
+from benchmarks._common import synthetic_rows, timed
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def scan_between(mj, start, end):
+    """The previous mj_entries_between: test every resident entry, then sort the matches"""
+    items = [e for e in mj.entries_dict.values() if start <= e.entry_date <= end]
+    items.sort(key=lambda e: (e.entry_date,) + Mood_Journal._between_key(e))
+    return items
+
+
+def main(n=100_000, queries=500):
+    mj = Mood_Journal(use_database=False)
+    mj.mj_bulk_create(synthetic_rows(n))
+
+    rng = random.Random(16)
+    weeks = [date(2015, 1, 1) + timedelta(days=rng.randrange(3650)) for _ in range(queries)]
+    months = [(d.year, d.month) for d in weeks]
+
+    with timed(f"week range, full scan ({n:,} entries)", queries, "queries"):
+        for start in weeks:
+            scan_between(mj, start, start + timedelta(days=6))
+    with timed("week range, date index", queries, "queries"):
+        for start in weeks:
+            mj.mj_entries_between(start, start + timedelta(days=6))
+    with timed("month calendar, date index", queries, "queries"):
+        for year, month in months:
+            mj.mj_month_calendar(year, month)
+
+    start = weeks[0]
+    assert scan_between(mj, start, start + timedelta(days=6)) == mj.mj_entries_between(
+        start, start + timedelta(days=6)
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
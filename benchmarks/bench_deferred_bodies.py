@@ -0,0 +1,77 @@
+"""
+Resident memory of a fully loaded journal with long entries: full bodies versus
+metadata-only entries (defer_bodies=True), measured with tracemalloc, for a few body
+lengths (journal entries of a few KB are typical for people who write daily).
+
+Usage:
+    python -m benchmarks.bench_deferred_bodies [table_rows] [body_kb...]
+"""
+
+import random
+import sys
+import tracemalloc
+
+from benchmarks._common import make_app, synthetic_rows, timed
+from extensions import db
+from migrations import run_migrations
+from mood_mastery.mood_journal import Mood_Journal
+
+_WORDS = (
+    "today I felt tired after work but the walk home helped and dinner with friends was "
+    "good though I still worry about the exam next week so I will try to sleep earlier "
+    "and keep a calmer morning routine with coffee reading and a short run before class"
+).split()
+
+
+def long_body(rng, body_bytes):
+    """Plausible prose of about body_bytes characters"""
+    words, size = [], 0
+    while size < body_bytes:
+        sentence = " ".join(rng.choice(_WORDS) for _ in range(rng.randrange(6, 20))).capitalize() + "."
+        words.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(words)
+
+
+def long_rows(n, body_bytes):
+    rng = random.Random(13)
+    for row in synthetic_rows(n):
+        name, day, month, year, _, *rest = row
+        yield (name, day, month, year, long_body(rng, body_bytes), *rest)
+
+
+def resident_mb(app, **options):
+    tracemalloc.start()
+    mj = Mood_Journal(app=app, **options)
+    mj.mj_get_all_entries()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return mj, size / 1e6
+
+
+def main(table_rows=10_000, body_kb=(1, 4, 8)):
+    print(f"{table_rows:,} entries; resident MB after a full load")
+    print(f"{'body':>8} {'full bodies':>12} {'metadata-only':>14} {'saved':>10} {'ratio':>7}")
+    for kb in body_kb:
+        app = make_app()
+        with app.app_context():
+            run_migrations(db.engine)
+        Mood_Journal(app=app).mj_bulk_create(long_rows(table_rows, kb * 1024))
+
+        _, full = resident_mb(app)
+        mj, deferred = resident_mb(app, defer_bodies=True)
+        print(
+            f"{kb:>5} KB {full:12.1f} {deferred:14.1f} {full - deferred:10.1f} "
+            f"{full / deferred:6.1f}x"
+        )
+
+    with timed(f"search across deferred {body_kb[-1]} KB bodies", table_rows, "entries"):
+        mj.mj_search_entries("exam")
+    with timed("read every deferred body (batched)", table_rows, "bodies"):
+        for e in mj.entries_dict.values():
+            e.entry_body
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args[:1], *([tuple(args[1:])] if args[1:] else []))
@@ -0,0 +1,42 @@
+"""
+The /emoji-groups page's journal work on n resident entries: one full scan of entries_dict
+per ranking, as mj_emoji_groups used to do, against one mj_emoji_groups_all() over the
+ranking index.
+
+Usage:
+    python -m benchmarks.bench_emoji_groups [entries] [pages]
+"""
+
+import sys
+
+from benchmarks._common import synthetic_rows, timed
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def scan_groups(mj, ranking):
+    """The old mj_emoji_groups: walk every entry, keep the ones with this ranking"""
+    keys = []
+    counts = [0] * 100
+    for key, e in mj.entries_dict.items():
+        if e.ranking == ranking:
+            counts[e.mood_rating - 1] += 1
+            keys.append(key)
+    return counts, keys
+
+
+def main(n=100_000, pages=20):
+    mj = Mood_Journal(use_database=False)
+    with timed(f"create {n:,} entries (ranking index maintained)", n, "entries"):
+        mj.mj_bulk_create(synthetic_rows(n))
+
+    with timed("emoji groups page, 5 full scans", pages, "pages"):
+        for _ in range(pages):
+            for ranking in range(1, 6):
+                scan_groups(mj, ranking)
+    with timed("emoji groups page, mj_emoji_groups_all", pages, "pages"):
+        for _ in range(pages):
+            mj.mj_emoji_groups_all()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,82 @@
+"""
+Bytes per resident Entry, measured with tracemalloc, for the compact __slots__ Entry
+against the previous layout (a per-instance __dict__ holding a date, a tag list and a
+biometrics dict). Entries are built the way a full load builds them (Entry._from_trusted).
+
+Usage:
+    python -m benchmarks.bench_entry_memory [entries]
+"""
+
+import gc
+import sys
+import tracemalloc
+from datetime import date
+
+from benchmarks._common import timed
+from mood_mastery.entry import Entry
+
+_TAG_POOL = ["work", "gym", "friends", "family", "sleep", "school", "travel", "focus"]
+_BIOMETRICS = [{}, {"Sleep": "meh"}, {"Sleep": "well rested", "Mental Wellness": "normal"}]
+
+
+class DictEntry:
+    """The previous Entry layout: attributes in a per-instance __dict__"""
+
+
+def dict_entry(entry_id, name, entry_date, body, ranking, mood, difficulty, tags, biometrics):
+    e = DictEntry.__new__(DictEntry)
+    e.__dict__ = {
+        "entry_id_str": entry_id,
+        "entry_name": name,
+        "entry_date": entry_date,
+        "_entry_body": body,
+        "ranking": ranking,
+        "tags": tags,
+        "is_private": False,
+        "is_excluded_from_reports": False,
+        "biometrics": biometrics,
+        "mood_rating": mood,
+        "difficulty_ranking": difficulty,
+    }
+    return e
+
+
+def stored_values(n):
+    """Per-entry values as a load would read them: fresh strings, a new date/list/dict per row"""
+    start = date(2015, 1, 1).toordinal()
+    for i in range(n):
+        yield (
+            f"{i:08d}-0000-4000-8000-000000000000",
+            f"Entry {i}",
+            date.fromordinal(start + i % 3650),
+            "",  # bodies are deferred by default (user-013) and weigh the same in both layouts
+            i % 8 + 1,
+            i % 100 + 1,
+            i % 5 + 1,
+            [_TAG_POOL[(i + k) % len(_TAG_POOL)].encode().decode() for k in range(i % 3)],
+            dict(_BIOMETRICS[i % len(_BIOMETRICS)]),
+        )
+
+
+def bytes_per_entry(build, n):
+    """Traced memory still held once n entries are built (the entries and all they reference)"""
+    gc.collect()
+    tracemalloc.start()
+    entries = [build(*values) for values in stored_values(n)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(entries)
+
+
+def main(n=1_000_000):
+    with timed(f"build {n:,} __dict__ entries", n, "entries"):
+        legacy = bytes_per_entry(dict_entry, n)
+    with timed(f"build {n:,} __slots__ entries", n, "entries"):
+        compact = bytes_per_entry(Entry._from_trusted, n)
+    print(f"bytes per entry, __dict__ layout   {legacy:8.0f}")
+    print(f"bytes per entry, __slots__ Entry   {compact:8.0f}  ({legacy / compact:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,43 @@
+"""
+Streaming export throughput and peak Python memory (tracemalloc) at growing table sizes.
+The peak should stay flat as the table grows: only one page of rows is held at a time.
+
+Usage:
+    python -m benchmarks.bench_export [largest_table_rows]
+"""
+
+import sys
+import tracemalloc
+
+from benchmarks._common import make_app, synthetic_rows, timed
+from journal_export import JournalExport
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def drain(chunks):
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+    return size
+
+
+def main(largest=100_000):
+    sizes = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= largest]
+    for n in sizes:
+        app = make_app()
+        Mood_Journal(app=app).mj_bulk_create(synthetic_rows(n))
+
+        with app.app_context():
+            for label, serializer in (("csv", JournalExport.csv_chunks), ("jsonl", JournalExport.jsonl_chunks)):
+                with timed(f"export {n:,} rows as {label}", n, "rows"):
+                    size = drain(serializer(JournalExport.iter_rows()))
+                # Second pass for memory: tracing slows the export down several times over
+                tracemalloc.start()
+                drain(serializer(JournalExport.iter_rows()))
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"    {size / 1e6:8.1f} MB written, peak traced memory {peak / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
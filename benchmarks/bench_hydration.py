@@ -0,0 +1,67 @@
+"""
+Row -> Entry hydration throughput:
+  - legacy: the full Entry(...) constructor, as to_entry used to do it (uuid4, add_tag and
+    initialize_biometrics per row, then entry_id_str overwritten)
+  - trusted: MoodEntry.entry_from_row -> Entry._from_trusted
+and whole-table loads through ORM objects versus plain column rows.
+
+Usage:
+    python -m benchmarks.bench_hydration [table_rows]
+"""
+
+import json
+import sys
+
+from benchmarks._common import make_app, synthetic_rows, timed
+from extensions import db
+from models import MoodEntry
+from mood_mastery.body_codec import decode_body
+from mood_mastery.entry import Entry
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def legacy_entry(row, tags):
+    e = Entry(
+        row.entry_name,
+        row.entry_date.day,
+        row.entry_date.month,
+        row.entry_date.year,
+        row.body if isinstance(row, MoodEntry) else decode_body(row.entry_body),
+        row.ranking,
+        row.mood_rating,
+        row.difficulty_ranking,
+        tags=tags,
+        biometrics=json.loads(row.biometrics_raw) if row.biometrics_raw else None,
+    )
+    e.entry_id_str = row.entry_id_str
+    e.is_private = row.is_private
+    e.is_excluded_from_reports = bool(row.is_excluded_from_reports)
+    return e
+
+
+def main(table_rows=100_000):
+    app = make_app()
+    Mood_Journal(app=app).mj_bulk_create(synthetic_rows(table_rows))
+
+    with app.app_context():
+        rows = db.session.execute(MoodEntry.entry_select()).all()
+        tags = ["work", "gym"]
+
+        with timed("hydrate: Entry(...) constructor", len(rows), "rows"):
+            for row in rows:
+                legacy_entry(row, tags)
+        with timed("hydrate: Entry._from_trusted", len(rows), "rows"):
+            for row in rows:
+                MoodEntry.entry_from_row(row, list(tags))
+
+        with timed("load table: ORM objects + constructor", len(rows), "rows"):
+            for db_entry in MoodEntry.query:
+                legacy_entry(db_entry, [])
+        db.session.expunge_all()
+
+    with timed("load table: Mood_Journal (column rows + trusted)", len(rows), "rows"):
+        Mood_Journal(app=app).mj_get_all_entries()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
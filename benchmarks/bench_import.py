@@ -0,0 +1,46 @@
+"""
+Streaming import throughput: JSONL rows validated and committed chunk by chunk into an
+empty, tuned (WAL) database.
+
+Usage:
+    python -m benchmarks.bench_import [rows] [chunk_size]
+"""
+
+import io
+import json
+import sys
+
+from benchmarks._common import make_app, synthetic_rows, timed
+from journal_import import JournalImport
+from mood_mastery.mood_journal import Mood_Journal
+from sqlite_tuning import DEFAULT_SQLITE_PROFILE, SQLiteTuning
+
+
+def jsonl_source(n):
+    lines = []
+    for name, day, month, year, body, ranking, mood, difficulty, tags in synthetic_rows(n):
+        lines.append(json.dumps({
+            "entry_name": name,
+            "entry_date": f"{year:04d}-{month:02d}-{day:02d}",
+            "entry_body": body,
+            "ranking": ranking,
+            "mood_rating": mood,
+            "difficulty_ranking": difficulty,
+            "tags": tags,
+        }))
+    return io.StringIO("\n".join(lines))
+
+
+def main(rows=100_000, chunk_size=1000):
+    app = make_app()
+    SQLiteTuning.apply_profile(app, DEFAULT_SQLITE_PROFILE)
+    mj = Mood_Journal(app=app)
+    source = jsonl_source(rows)
+
+    with timed(f"import {rows:,} rows, {chunk_size:,} per commit", rows, "rows"):
+        summary = JournalImport.import_stream(mj, source, "jsonl", chunk_size=chunk_size)
+    print(f"imported {summary['imported']:,}, entries held in memory: {len(mj.entries_dict):,}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
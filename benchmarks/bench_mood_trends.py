@@ -0,0 +1,40 @@
+"""
+mj_mood_graph_trends (run on every index page render) on a journal of n resident entries:
+the per-call rescan of every entry it used to do against the running sum/count accumulators.
+
+Usage:
+    python -m benchmarks.bench_mood_trends [entries] [calls]
+"""
+
+import sys
+
+from benchmarks._common import synthetic_rows, timed
+from mood_mastery.mood_journal import _TREND_BUCKETS, Mood_Journal, _trend_slots
+
+
+def rescan_averages(mj):
+    """The work the old implementation repeated per call: bucket every entry, then average"""
+    buckets = {name: [[] for _ in labels] for name, labels in _TREND_BUCKETS}
+    for e in mj.entries_dict.values():
+        for (name, _), slot in zip(_TREND_BUCKETS, _trend_slots(e.entry_ordinal)):
+            buckets[name][slot].append(e.mood_rating)
+    return {
+        name: [sum(r) / len(r) if r else 0 for r in groups] for name, groups in buckets.items()
+    }
+
+
+def main(n=100_000, calls=20):
+    mj = Mood_Journal(use_database=False)
+    with timed(f"create {n:,} entries (accumulators maintained)", n, "entries"):
+        mj.mj_bulk_create(synthetic_rows(n))
+
+    with timed("trends, rescan every entry", calls, "calls"):
+        for _ in range(calls):
+            rescan_averages(mj)
+    with timed("trends, accumulators", calls * 1000, "calls"):
+        for _ in range(calls * 1000):
+            mj.mj_mood_graph_trends()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,51 @@
+"""
+Mood bar graph and ranking report over random date ranges (a week up to the whole ten years)
+on a journal of n resident entries: walking the range's entries, as both used to, against
+the Fenwick-tree range histogram.
+
+Usage:
+    python -m benchmarks.bench_range_histogram [entries] [queries]
+"""
+
+import random
+import sys
+from datetime import date, timedelta
+
+from benchmarks._common import synthetic_rows, timed
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def walk_histogram(mj, start, end):
+    """What the bar graph and reports used to do per call: visit every entry in the range"""
+    moods, rankings = [0] * 100, [0] * 8
+    for _, day_entries in mj._indexed_days(start, end):
+        for e in day_entries:
+            moods[e.mood_rating - 1] += 1
+            if not e.is_excluded_from_reports:
+                rankings[e.ranking - 1] += 1
+    return moods, rankings
+
+
+def main(n=100_000, queries=200):
+    mj = Mood_Journal(use_database=False)
+    with timed(f"create {n:,} entries (histogram maintained)", n, "entries"):
+        mj.mj_bulk_create(synthetic_rows(n))
+
+    rng = random.Random(20)
+    first = date(2015, 1, 1)
+    ranges = []
+    for _ in range(queries):
+        start = first + timedelta(days=rng.randrange(3650))
+        ranges.append((start, start + timedelta(days=rng.choice((6, 29, 365, 3650)))))
+
+    with timed("bar graph + report, walk the range", queries, "queries"):
+        for start, end in ranges:
+            walk_histogram(mj, start, end)
+    with timed("bar graph + report, range histogram", queries, "queries"):
+        for start, end in ranges:
+            mj.mj_mood_rating_graph("bar", start, end)
+            mj.mj_range_report(start, end)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
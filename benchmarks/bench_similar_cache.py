@@ -0,0 +1,61 @@
+"""
+Similar entries for the view modal: a search per lookup (as before) against the neighbour
+cache, filled by its background thread. Also times the fill itself and what one edit
+costs: settling it and how many cached lists it drops out of the whole journal.
+
+Usage:
+    python -m benchmarks.bench_similar_cache [sizes...]
+"""
+
+import random
+import sys
+import time
+
+from benchmarks._common import synthetic_rows, timed
+from mood_mastery.mood_journal import Mood_Journal
+from mood_mastery.similarity import resolve_weights
+
+
+def latency_ms(lookup, targets):
+    start = time.perf_counter()
+    for entry_id in targets:
+        lookup(entry_id)
+    return (time.perf_counter() - start) / len(targets) * 1000
+
+
+def main(sizes=(5_000, 20_000), lookups=200, edits=50):
+    weights = resolve_weights(None)
+    for n in sizes:
+        mj = Mood_Journal(use_database=False, prefill_similar=True)
+        cache = mj._similar_cache
+        mj.mj_bulk_create(synthetic_rows(n))
+        with timed(f"{n:>9,}: background fill", n, "entries"):
+            while len(cache) < n:
+                time.sleep(0.01)
+        rng = random.Random(25)
+        ids = list(mj.entries_dict)
+        targets = rng.sample(ids, lookups)
+
+        searched = latency_ms(lambda i: mj._search_similar(i, 3, weights), targets)
+        cached = latency_ms(lambda i: mj.mj_find_similar_entries(i, limit=3), targets)
+        print(f"{n:>9,}: {'search per lookup':<30} {searched:10.4f} ms/lookup")
+        print(f"{n:>9,}: {'cached':<30} {cached:10.4f} ms/lookup")
+
+        mj.mj_close()  # settle on the caller's thread from here, to time it
+        dropped = 0
+        start = time.perf_counter()
+        for entry_id in rng.sample(ids, edits):
+            entry = mj.mj_get_entry(entry_id)
+            before = len(cache)
+            entry.mood_rating = rng.randint(1, 100)
+            with cache.lock:
+                cache._settle(len(cache._pending))
+            dropped += before - len(cache)
+            mj.mj_find_similar_entries(entry_id)  # refill its own list
+        elapsed = (time.perf_counter() - start) / edits * 1000
+        print(f"{n:>9,}: {'edit + settle + own refill':<30} {elapsed:10.4f} ms/edit")
+        print(f"{n:>9,}: {'lists dropped per edit':<30} {dropped / edits:10.1f} of {n:,}")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (5_000, 20_000))
@@ -0,0 +1,69 @@
+"""
+mj_find_similar_entries (run on every view_entry / similar_entries click) on a journal of n
+resident entries: the per-Entry loop with a full sort it used to be, against the column-store
+scoring with plain loops + heapq and with NumPy + argpartition (when installed).
+
+Usage:
+    python -m benchmarks.bench_similar_entries [entries] [lookups]
+"""
+
+import random
+import sys
+
+from benchmarks._common import synthetic_rows, timed
+from mood_mastery import column_store
+from mood_mastery.mood_journal import Mood_Journal
+from mood_mastery.similarity import SIMILARITY_WEIGHTS
+
+
+def per_entry_similar(mj, entry_id_str, limit=3, weights=SIMILARITY_WEIGHTS):
+    """The old implementation: Python sets and five terms per Entry, then a full sort"""
+    target = mj.entries_dict[entry_id_str]
+    target_tags = set(target.tags)
+    similarities = []
+    for entry_id, entry in mj.entries_dict.items():
+        if entry_id == entry_id_str:
+            continue
+        entry_tags = set(entry.tags)
+        if target_tags or entry_tags:
+            tag_sim = len(target_tags & entry_tags) / len(target_tags | entry_tags)
+        else:
+            tag_sim = 1.0
+        days_diff = abs((target.entry_date - entry.entry_date).days)
+        similarities.append((entry, (
+            (1.0 - abs(target.mood_rating - entry.mood_rating) / 100.0) * weights["mood"]
+            + (1.0 - abs(target.ranking - entry.ranking) / 7.0) * weights["ranking"]
+            + (1.0 - abs(target.difficulty_ranking - entry.difficulty_ranking) / 4.0) * weights["difficulty"]
+            + tag_sim * weights["tags"]
+            + (1.0 - min(days_diff / 365.0, 1.0)) * weights["date"]
+        )))
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:limit]
+
+
+def main(n=100_000, lookups=10):
+    mj = Mood_Journal(use_database=False)
+    with timed(f"create {n:,} entries", n, "entries"):
+        mj.mj_bulk_create(synthetic_rows(n))
+    targets = random.Random(23).sample(list(mj.entries_dict), lookups)
+
+    with timed("similar entries, per-Entry loop + sort", lookups, "lookups"):
+        for entry_id in targets:
+            per_entry_similar(mj, entry_id)
+    numpy = column_store.numpy
+    column_store.numpy = None
+    with timed("similar entries, column loop + heapq", lookups, "lookups"):
+        for entry_id in targets:
+            mj.mj_find_similar_entries(entry_id)
+    column_store.numpy = numpy
+    if numpy is not None:
+        with timed("similar entries, NumPy + argpartition", lookups * 10, "lookups"):
+            for _ in range(10):
+                for entry_id in targets:
+                    mj.mj_find_similar_entries(entry_id)
+    else:
+        print("similar entries, NumPy + argpartition            (numpy not installed)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
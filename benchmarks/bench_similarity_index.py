@@ -0,0 +1,54 @@
+"""
+Similar-entry lookup latency at several journal sizes: the branch-and-bound
+SimilarityIndex against the full column-store scan it replaces, with plain loops and
+with NumPy (when installed). All three return the same entries and scores.
+
+Usage:
+    python -m benchmarks.bench_similarity_index [sizes...]
+"""
+
+import random
+import sys
+import time
+
+from benchmarks._common import synthetic_rows, timed
+from mood_mastery import column_store
+from mood_mastery.mood_journal import Mood_Journal
+from mood_mastery.similarity import resolve_weights, top_similar
+
+
+def latency_ms(lookup, targets):
+    start = time.perf_counter()
+    for entry_id in targets:
+        lookup(entry_id)
+    return (time.perf_counter() - start) / len(targets) * 1000
+
+
+def main(sizes=(10_000, 100_000, 300_000), lookups=50):
+    weights = resolve_weights(None)
+    numpy = column_store.numpy
+    for n in sizes:
+        mj = Mood_Journal(use_database=False)
+        with timed(f"{n:>9,}: create entries (index maintained)", n, "entries"):
+            mj.mj_bulk_create(synthetic_rows(n))
+        targets = random.Random(24).sample(list(mj.entries_dict), lookups)
+        index, store = mj._similarity_index, mj._columns
+
+        results = {
+            "index": latency_ms(lambda i: index.top_similar(store, i, 3, weights), targets),
+        }
+        column_store.numpy = None
+        results["full scan, loops"] = latency_ms(
+            lambda i: top_similar(store, i, 3, weights), targets[:5]
+        )
+        column_store.numpy = numpy
+        if numpy is not None:
+            results["full scan, NumPy"] = latency_ms(
+                lambda i: top_similar(store, i, 3, weights), targets
+            )
+        for label, ms in results.items():
+            print(f"{n:>9,}: {label:<36} {ms:9.2f} ms/lookup")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (10_000, 100_000, 300_000))
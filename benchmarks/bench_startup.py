@@ -0,0 +1,43 @@
+"""
+Cold start of a fully loaded Mood_Journal: hydrating the table through the ORM versus
+reading the columnar snapshot (mood_mastery/snapshot.py).
+
+Usage:
+    python -m benchmarks.bench_startup [table_rows]
+"""
+
+import os
+import sys
+
+from benchmarks._common import make_app, synthetic_rows, timed
+from extensions import db
+from migrations import run_migrations
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def main(table_rows=100_000):
+    app = make_app()
+    with app.app_context():
+        run_migrations(db.engine)
+        snapshot_path = db.engine.url.database + ".snapshot"
+
+    seeded = Mood_Journal(app=app)
+    with timed(f"seed {table_rows:,} rows (bulk create)", table_rows, "rows"):
+        seeded.mj_bulk_create(synthetic_rows(table_rows))
+    seeded.mj_close()
+
+    with timed("cold start from the table", table_rows, "entries"):
+        Mood_Journal(app=app).mj_get_all_entries()
+
+    # The snapshot is only written by a full table load into an empty journal
+    with timed("cold start from the table + write the snapshot", table_rows, "entries"):
+        Mood_Journal(app=app, snapshot=True).mj_get_all_entries()
+    print(f"snapshot size: {os.path.getsize(snapshot_path) / 1e6:.1f} MB")
+
+    with timed("cold start from the snapshot", table_rows, "entries"):
+        entries = Mood_Journal(app=app, snapshot=True).mj_get_all_entries()
+    assert len(entries) == table_rows
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,46 @@
+"""
+Cost of keeping the streak current on writes, on a journal of n resident entries:
+  - full recompute: sort every distinct date, then walk the runs (what every write used to do)
+  - incremental: the run-length StreakRuns updated as days join or leave the date index
+
+Usage:
+    python -m benchmarks.bench_streak [entries] [writes]
+"""
+
+import sys
+from datetime import timedelta
+
+from benchmarks._common import synthetic_rows, timed
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def full_recompute(mj):
+    """The previous recompute_streak body"""
+    dates = sorted({e.entry_date for e in mj.entries_dict.values()})
+    longest = run = 1
+    for i in range(1, len(dates)):
+        run = run + 1 if dates[i] - dates[i - 1] == timedelta(days=1) else 1
+        longest = max(longest, run)
+    return longest
+
+
+def main(n=100_000, writes=200):
+    mj = Mood_Journal(use_database=False)
+    mj.mj_bulk_create(synthetic_rows(n))
+
+    with timed(f"full recompute per write ({n:,} entries)", writes, "writes"):
+        for _ in range(writes):
+            full_recompute(mj)
+
+    created = []
+    with timed("create + incremental streak", writes, "writes"):
+        for i in range(writes):
+            created.append(mj.mj_create_entry(f"New {i}", 1 + i % 28, 1, 2030, "", 1, 50, 5))
+    with timed("delete + incremental streak", writes, "writes"):
+        for entry_id in created:
+            mj.mj_delete_entry(entry_id)
+    assert mj.streak_longest == full_recompute(mj)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,54 @@
+"""
+Tag queries on a fully resident journal: the inverted tag index against the per-entry
+scans it replaced (has_tag on every entry, recounting every tag for the summary).
+
+Usage:
+    python -m benchmarks.bench_tag_queries [entries] [queries]
+"""
+
+import sys
+
+from benchmarks._common import synthetic_rows, timed
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def scan_entries_with_tag(mj, tag):
+    items = [e for e in mj.entries_dict.values() if e.has_tag(tag)]
+    items.sort(key=lambda e: (e.entry_ordinal, e.entry_name, e.entry_id_str))
+    return items
+
+
+def scan_tag_summary(mj):
+    counts = {}
+    for e in mj.entries_dict.values():
+        for t in e.tags:
+            counts[t] = counts.get(t, 0) + 1
+    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+def main(n=100_000, queries=50):
+    mj = Mood_Journal(use_database=False)
+    # Give every 100th entry a rare tag so the tag page has a small k
+    rows = [row[:8] + (row[8] + (["rare"] if i % 100 == 0 else []),) for i, row in enumerate(synthetic_rows(n))]
+    with timed(f"create {n:,} entries (indexes maintained)", n, "entries"):
+        mj.mj_bulk_create(rows)
+
+    with timed("entries_with_tag('rare'), scan", queries, "queries"):
+        for _ in range(queries):
+            scan_entries_with_tag(mj, "rare")
+    with timed("entries_with_tag('rare'), index", queries, "queries"):
+        for _ in range(queries):
+            mj.mj_entries_with_tag("rare")
+    with timed("tag_summary, scan", queries, "queries"):
+        for _ in range(queries):
+            scan_tag_summary(mj)
+    with timed("tag_summary, index", queries, "queries"):
+        for _ in range(queries):
+            mj.mj_tag_summary()
+
+    assert scan_entries_with_tag(mj, "rare") == mj.mj_entries_with_tag("rare")
+    assert scan_tag_summary(mj) == mj.mj_tag_summary()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,69 @@
+"""
+Saves per second for Mood_Journal persistence on a 100k-row mood_entry table:
+  - legacy: MoodEntry.query.filter_by(...).first() then mutate/add, one commit per save
+  - upsert: INSERT ... ON CONFLICT(entry_id_str) DO UPDATE, one commit per save
+  - upsert (batched): the same statement as one executemany for the whole batch
+
+Usage:
+    python -m benchmarks.bench_upsert [table_rows] [saves]
+"""
+
+import sys
+
+from benchmarks._common import make_app, synthetic_rows, timed
+from extensions import db
+from models import MoodEntry
+from mood_mastery.entry import Entry
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def legacy_save(columns):
+    """The query-then-update path _save_entry_to_db used before the upsert"""
+    existing = MoodEntry.query.filter_by(entry_id_str=columns["entry_id_str"]).first()
+    if existing:
+        for column, value in columns.items():
+            setattr(existing, column, value)
+    else:
+        db.session.add(MoodEntry(**columns))
+    db.session.commit()
+
+
+def main(table_rows=100_000, saves=2_000):
+    app = make_app()
+    mj = Mood_Journal(app=app)
+
+    with timed(f"seed {table_rows:,} rows (bulk create)", table_rows, "rows"):
+        mj.mj_bulk_create(synthetic_rows(table_rows))
+
+    existing = list(mj.entries_dict.values())[:saves]
+    for e in existing:
+        e.mood_rating = 100 - e.mood_rating + 1
+
+    def fresh_rows(n, seed):
+        return [
+            MoodEntry.columns_from_entry(Entry(*row))
+            for row in synthetic_rows(n, seed=seed)
+        ]
+
+    updates = [MoodEntry.columns_from_entry(e) for e in existing]
+
+    with app.app_context():
+        batch = updates + fresh_rows(saves, seed=1)
+        with timed("legacy query-then-update, commit per save", len(batch), "saves"):
+            for columns in batch:
+                legacy_save(columns)
+
+        batch = updates + fresh_rows(saves, seed=2)
+        with timed("upsert, commit per save", len(batch), "saves"):
+            for columns in batch:
+                mj._apply_writes([("save", (columns, []))])
+
+        batch = updates + fresh_rows(saves, seed=3)
+        with timed("upsert, one executemany + commit", len(batch), "saves"):
+            mj._apply_writes([("save", (columns, [])) for columns in batch])
+
+        print(f"rows in table: {MoodEntry.query.count():,}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -1,9 +1,11 @@
 from app import app, db
 from models import MoodEntry
+from migrations import run_migrations
 
 def init_database():
   with app.app_context():
     db.create_all()
+    run_migrations(db.engine)
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
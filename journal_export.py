@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+
+from sqlalchemy import select, text
+
+from extensions import db
+from models import EntryTag, MoodEntry
+from mood_mastery.body_codec import decode_body
+
+# Column order of both export formats (and what the importer reads back)
+EXPORT_FIELDS = [
+    "entry_id_str",
+    "entry_name",
+    "entry_date",
+    "entry_body",
+    "ranking",
+    "mood_rating",
+    "difficulty_ranking",
+    "tags",
+    "biometrics",
+    "is_private",
+    "is_excluded_from_reports",
+    "created_at",
+]
+
+
+class JournalExport:
+
+    @staticmethod
+    def iter_rows(batch_size=1000, include_private_bodies=False):
+        """
+        Yield every stored entry as a plain dict (keys = EXPORT_FIELDS), oldest row first.
+        Pages through mood_entry by primary key (WHERE id > last_id LIMIT batch_size), one
+        short-lived connection per page, so memory stays at one page however big the table is.
+        Needs an app context. Private entries have their body blanked unless
+        include_private_bodies is set.
+        """
+        columns = [
+            MoodEntry.id,
+            MoodEntry.entry_id_str,
+            MoodEntry.entry_name,
+            MoodEntry.entry_date,
+            MoodEntry.stored_body().label("entry_body"),
+            MoodEntry.ranking,
+            MoodEntry.mood_rating,
+            MoodEntry.difficulty_ranking,
+            MoodEntry.tags_raw,
+            MoodEntry.biometrics_raw,
+            MoodEntry.is_private,
+            MoodEntry.is_excluded_from_reports,
+            MoodEntry.created_at,
+        ]
+        last_id = 0
+        while True:
+            with db.engine.connect() as conn:
+                page = conn.execute(
+                    select(*columns)
+                    .where(MoodEntry.id > last_id)
+                    .order_by(MoodEntry.id)
+                    .limit(batch_size)
+                ).all()
+                if not page:
+                    return
+                tags_by_id = {}
+                tag_rows = conn.execute(
+                    select(EntryTag.entry_id, EntryTag.tag)
+                    .where(EntryTag.entry_id.in_([row.entry_id_str for row in page]))
+                    .order_by(EntryTag.entry_id, text("entry_tags.rowid"))
+                )
+                for entry_id, tag in tag_rows:
+                    tags_by_id.setdefault(entry_id, []).append(tag)
+
+            for row in page:
+                tags = tags_by_id.get(row.entry_id_str)
+                if tags is None:
+                    # Rows written before migration 3 still carry their tags inline
+                    tags = row.tags_raw.split(",") if row.tags_raw else []
+                private = bool(row.is_private)
+                yield {
+                    "entry_id_str": row.entry_id_str,
+                    "entry_name": row.entry_name,
+                    "entry_date": row.entry_date.isoformat(),
+                    "entry_body": "" if private and not include_private_bodies else decode_body(row.entry_body),
+                    "ranking": row.ranking,
+                    "mood_rating": row.mood_rating,
+                    "difficulty_ranking": row.difficulty_ranking,
+                    "tags": tags,
+                    "biometrics": json.loads(row.biometrics_raw) if row.biometrics_raw else {},
+                    "is_private": private,
+                    "is_excluded_from_reports": bool(row.is_excluded_from_reports),
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                }
+            last_id = page[-1].id
+
+    @staticmethod
+    def csv_chunks(rows, rows_per_chunk=500):
+        """
+        Serialize rows to CSV text, yielding a chunk every rows_per_chunk rows.
+        tags are comma-joined and biometrics JSON-encoded within their cell.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        pending = 0
+        for row in rows:
+            cells = dict(row, tags=",".join(row["tags"]), biometrics=json.dumps(row["biometrics"]))
+            writer.writerow([cells[field] for field in EXPORT_FIELDS])
+            pending += 1
+            if pending >= rows_per_chunk:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        yield buffer.getvalue()
+
+    @staticmethod
+    def jsonl_chunks(rows, rows_per_chunk=500):
+        """
+        Serialize rows as JSON Lines (one object per line), yielding a chunk every rows_per_chunk rows.
+        """
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(row, ensure_ascii=False))
+            if len(lines) >= rows_per_chunk:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
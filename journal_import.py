@@ -0,0 +1,219 @@
+import csv
+import json
+import os
+from datetime import date
+from itertools import islice
+
+from mood_mastery.entry import Entry, validate_entry_fields
+
+IMPORT_FORMATS = ("csv", "jsonl")
+# How many bad rows are kept (with their reason) in the summary; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+_TRUE_STRINGS = {"1", "true", "yes", "y", "on"}
+
+
+class JournalImport:
+
+    @staticmethod
+    def format_for(filename):
+        """Guess the import format from a file name (.csv, .jsonl/.ndjson); None if unknown"""
+        extension = os.path.splitext(filename or "")[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        return None
+
+    @staticmethod
+    def parse_rows(stream, fmt):
+        """
+        Yield one raw dict per data row of a text stream, reading it line by line.
+        CSV needs a header row (the /export.csv columns); JSONL has one object per line.
+        A JSONL line that isn't valid JSON is yielded as a ValueError so the caller can
+        report it against its row number and carry on.
+        """
+        if fmt == "csv":
+            yield from csv.DictReader(stream)
+        elif fmt == "jsonl":
+            for line in stream:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield ValueError(f"invalid JSON: {e}")
+        else:
+            raise ValueError(f"unknown import format '{fmt}' (expected one of {IMPORT_FORMATS})")
+
+    @staticmethod
+    def entry_from_row(row):
+        """
+        Build an Entry from one parsed row, applying the same rules as the rest of the journal
+        (validate_entry_fields, BIOMETRICS vocabulary). Raises ValueError for a bad row.
+        Accepts both the export's shapes: tags as a list or comma-joined string, biometrics as
+        a dict or JSON text. Rows without an entry_id_str get a fresh one.
+        """
+        if isinstance(row, Exception):
+            raise row
+        if not isinstance(row, dict):
+            raise ValueError("row must be an object")
+
+        def integer(field):
+            value = row.get(field)
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{field} must be an int")
+
+        try:
+            entry_date = date.fromisoformat(str(row.get("entry_date", "")).strip())
+        except ValueError:
+            raise ValueError("entry_date must be YYYY-MM-DD")
+
+        tags = row.get("tags") or []
+        if isinstance(tags, str):
+            tags = tags.split(",")
+        if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            raise ValueError("tags must be a list of strings or comma-separated text")
+        entry_body = row.get("entry_body") or ""
+        if not isinstance(entry_body, str):
+            raise ValueError("entry_body must be a string")
+        biometrics = row.get("biometrics") or {}
+        if isinstance(biometrics, str):
+            try:
+                biometrics = json.loads(biometrics)
+            except ValueError:
+                raise ValueError("biometrics must be a JSON object")
+        if not isinstance(biometrics, dict):
+            raise ValueError("biometrics must be a JSON object")
+
+        entry_name = row.get("entry_name")
+        ranking = integer("ranking")
+        mood_rating = integer("mood_rating")
+        difficulty_ranking = integer("difficulty_ranking")
+        validate_entry_fields(entry_name, ranking, mood_rating, difficulty_ranking, biometrics)
+
+        entry = Entry(
+            entry_name,
+            entry_date.day,
+            entry_date.month,
+            entry_date.year,
+            entry_body,
+            ranking,
+            mood_rating,
+            difficulty_ranking,
+            tags=tags,
+            biometrics=biometrics,
+        )
+        entry_id = str(row.get("entry_id_str") or "").strip()
+        if entry_id:
+            if len(entry_id) > 36:
+                raise ValueError("entry_id_str must be at most 36 characters")
+            entry.entry_id_str = entry_id
+        entry.is_private = JournalImport._flag(row.get("is_private"))
+        entry.is_excluded_from_reports = JournalImport._flag(row.get("is_excluded_from_reports"))
+        return entry
+
+    @staticmethod
+    def _flag(value):
+        if isinstance(value, str):
+            return value.strip().lower() in _TRUE_STRINGS
+        return bool(value)
+
+    @staticmethod
+    def read_checkpoint(checkpoint_path):
+        """Rows already committed by an earlier run of the same import (0 if none)"""
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path) as f:
+            return int(json.load(f).get("rows_done", 0))
+
+    @staticmethod
+    def write_checkpoint(checkpoint_path, rows_done):
+        # Write-then-rename so a crash never leaves a half-written checkpoint behind
+        temp_path = checkpoint_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"rows_done": rows_done}, f)
+        os.replace(temp_path, checkpoint_path)
+
+    @staticmethod
+    def import_stream(mj, stream, fmt, chunk_size=1000, checkpoint_path=None):
+        """
+        Stream rows from a CSV/JSONL text stream into the journal. Rows are validated one at
+        a time and committed chunk_size at a time through mj.mj_import_entries, so memory
+        stays at one chunk. Entries whose entry_id_str is already stored are skipped,
+        which makes re-running an import harmless.
+
+        With a checkpoint_path, the number of committed rows is recorded after every chunk.
+        A rerun skips those rows, and the file is removed once the import finishes.
+
+        Input that can't be read at all (not valid UTF-8, a malformed or oversized CSV field)
+        stops the import there: the rows before it are committed, the problem is reported as
+        a failed row and as "stopped", and the checkpoint (if any) is kept for a rerun.
+        Database errors are raised.
+
+        Returns a dictionary of the form:
+            { "imported" : int, "duplicates" : int, "failed" : int, "resumed_from" : int,
+              "errors" : [(row_number (int), reason (str)), ...],  // first MAX_REPORTED_ERRORS
+              "stopped" : str or None }                             // why reading stopped early
+
+        Parameters -------------------------
+        - mj : Mood_Journal         // The journal to import into
+        - stream : text file        // Opened in text mode (newline="" for CSV)
+        - fmt : str                 // "csv" or "jsonl"
+        - chunk_size : int          // Rows per transaction
+        - checkpoint_path : str     // Optional file that makes the import resumable
+        """
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"unknown import format '{fmt}' (expected one of {IMPORT_FORMATS})")
+
+        resumed_from = JournalImport.read_checkpoint(checkpoint_path)
+        summary = {
+            "imported": 0,
+            "duplicates": 0,
+            "failed": 0,
+            "resumed_from": resumed_from,
+            "errors": [],
+            "stopped": None,
+        }
+        rows = enumerate(JournalImport.parse_rows(stream, fmt), start=1)
+        rows = islice(rows, resumed_from, None)
+
+        def commit(chunk, rows_done):
+            written = mj.mj_import_entries(chunk)
+            summary["imported"] += len(written)
+            summary["duplicates"] += len(chunk) - len(written)
+            if checkpoint_path:
+                JournalImport.write_checkpoint(checkpoint_path, rows_done)
+
+        def fail(row_number, reason):
+            summary["failed"] += 1
+            if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+                summary["errors"].append((row_number, reason))
+
+        chunk = []
+        row_number = resumed_from
+        while True:
+            try:
+                row_number, row = next(rows)
+            except StopIteration:
+                break
+            except (UnicodeError, csv.Error) as e:
+                # The reader can't go on past this point; keep what was read before it
+                summary["stopped"] = f"unreadable input after row {row_number}: {e}"
+                fail(row_number + 1, summary["stopped"])
+                break
+            try:
+                chunk.append(JournalImport.entry_from_row(row))
+            except (TypeError, ValueError) as e:
+                fail(row_number, str(e))
+            if len(chunk) >= chunk_size:
+                commit(chunk, row_number)
+                chunk = []
+        commit(chunk, row_number)
+
+        mj.mj_refresh_streak()
+        if checkpoint_path and not summary["stopped"] and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        return summary
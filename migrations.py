@@ -0,0 +1,167 @@
+"""
+Lightweight versioned migrations for existing app.db files.
+
+db.create_all() only creates missing tables; it never changes a table that already exists.
+Each migration here brings an older mood_entry table up to what models.py declares, without
+dropping data. The number of the last applied migration lives in SQLite's PRAGMA user_version.
+
+Run after db.create_all():
+    run_migrations(db.engine)
+
+Migrations must be safe on fresh databases too (create_all already made the latest schema),
+so they check before altering and use IF NOT EXISTS.
+"""
+
+from sqlalchemy import inspect
+
+
+def _column_names(conn, table):
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+def _add_is_excluded_from_reports(conn):
+    if "is_excluded_from_reports" not in _column_names(conn, "mood_entry"):
+        conn.exec_driver_sql(
+            "ALTER TABLE mood_entry ADD COLUMN is_excluded_from_reports BOOLEAN DEFAULT 0"
+        )
+
+
+def _add_mood_entry_indexes(conn):
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS ix_mood_entry_date_created ON mood_entry (entry_date, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_mood_entry_ranking_date ON mood_entry (ranking, entry_date)",
+        "CREATE INDEX IF NOT EXISTS ix_mood_entry_mood_rating ON mood_entry (mood_rating)",
+        "CREATE INDEX IF NOT EXISTS ix_mood_entry_private_date ON mood_entry (is_private, entry_date)",
+    ):
+        conn.exec_driver_sql(statement)
+
+
+def _create_entry_tags(conn):
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS entry_tags ("
+        " entry_id VARCHAR(36) NOT NULL REFERENCES mood_entry (entry_id_str),"
+        " tag VARCHAR(100) NOT NULL,"
+        " PRIMARY KEY (entry_id, tag))"
+    )
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_entry_tags_tag ON entry_tags (tag)")
+
+    # Move the comma-joined tags over, cleaned the same way Entry.add_tag cleans them
+    rows = conn.exec_driver_sql(
+        "SELECT entry_id_str, tags_raw FROM mood_entry WHERE tags_raw IS NOT NULL AND tags_raw != ''"
+    ).fetchall()
+    pairs = []
+    for entry_id, tags_raw in rows:
+        seen = set()
+        for tag in tags_raw.split(","):
+            tag = tag.strip().lower()
+            if tag and tag not in seen:
+                seen.add(tag)
+                pairs.append((entry_id, tag))
+    if pairs:
+        conn.exec_driver_sql(
+            "INSERT OR IGNORE INTO entry_tags (entry_id, tag) VALUES (?, ?)", pairs
+        )
+    conn.exec_driver_sql("UPDATE mood_entry SET tags_raw = NULL WHERE tags_raw IS NOT NULL")
+
+
+def _add_change_counter(conn):
+    # Bumped by triggers on every row change, so a cache (see mood_mastery/snapshot.py) can
+    # tell whether the tables still match what it was built from, whoever wrote to them
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS journal_meta ("
+        " key VARCHAR(50) NOT NULL PRIMARY KEY,"
+        " value INTEGER NOT NULL)"
+    )
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO journal_meta (key, value) VALUES ('change_counter', 0)"
+    )
+    for table in ("mood_entry", "entry_tags"):
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_counter"
+                f" AFTER {event} ON {table} BEGIN"
+                " UPDATE journal_meta SET value = value + 1 WHERE key = 'change_counter';"
+                " END"
+            )
+
+
+def _add_entry_preview(conn):
+    from mood_mastery.entry import make_preview
+
+    if "entry_preview" not in _column_names(conn, "mood_entry"):
+        conn.exec_driver_sql("ALTER TABLE mood_entry ADD COLUMN entry_preview VARCHAR(200)")
+
+    # Backfill in pages so a large table never has every body in memory at once
+    last_id = 0
+    while True:
+        rows = conn.exec_driver_sql(
+            "SELECT id, entry_body FROM mood_entry"
+            " WHERE id > ? AND entry_preview IS NULL ORDER BY id LIMIT 1000",
+            (last_id,),
+        ).fetchall()
+        if not rows:
+            break
+        conn.exec_driver_sql(
+            "UPDATE mood_entry SET entry_preview = ? WHERE id = ?",
+            [(make_preview(body), row_id) for row_id, body in rows],
+        )
+        last_id = rows[-1][0]
+
+
+def _compress_entry_bodies(conn):
+    from mood_mastery.body_codec import encode_body
+
+    if "entry_body_z" not in _column_names(conn, "mood_entry"):
+        conn.exec_driver_sql("ALTER TABLE mood_entry ADD COLUMN entry_body_z BLOB")
+
+    # Keep one compressed copy: entry_body is emptied (it is NOT NULL on old tables) and
+    # the duplicate in notes dropped. Paged like migration 5 to bound memory
+    last_id = 0
+    while True:
+        rows = conn.exec_driver_sql(
+            "SELECT id, entry_body FROM mood_entry"
+            " WHERE id > ? AND entry_body_z IS NULL ORDER BY id LIMIT 1000",
+            (last_id,),
+        ).fetchall()
+        if not rows:
+            break
+        conn.exec_driver_sql(
+            "UPDATE mood_entry SET entry_body_z = ?, entry_body = '', notes = NULL WHERE id = ?",
+            [(encode_body(body), row_id) for row_id, body in rows],
+        )
+        last_id = rows[-1][0]
+    conn.exec_driver_sql("UPDATE mood_entry SET notes = NULL WHERE notes IS NOT NULL")
+
+
+# (version, description, function) -- append only; never renumber or edit an applied migration
+MIGRATIONS = [
+    (1, "add mood_entry.is_excluded_from_reports", _add_is_excluded_from_reports),
+    (2, "add secondary indexes on mood_entry", _add_mood_entry_indexes),
+    (3, "move mood_entry.tags_raw into the entry_tags table", _create_entry_tags),
+    (4, "add journal_meta change counter and its triggers", _add_change_counter),
+    (5, "add mood_entry.entry_preview for list views", _add_entry_preview),
+    (6, "store each entry body once, compressed, in mood_entry.entry_body_z", _compress_entry_bodies),
+]
+
+
+def schema_version(engine) -> int:
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def run_migrations(engine) -> list:
+    """
+    Apply every migration newer than the database's user_version, each in its own transaction.
+    Returns the list of versions that were applied (empty if already up to date).
+    """
+    applied = []
+    current = schema_version(engine)
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+        print(f"Applied migration {version}: {description}")
+        applied.append(version)
+    return applied
@@ -1,11 +1,13 @@
 from extensions import db
 from datetime import datetime, date
+from sqlalchemy import func, select
+from mood_mastery.body_codec import decode_body, encode_body
 import json  # Add this import
 
 class MoodEntry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     mood = db.Column(db.String(50), nullable=False)
-    notes = db.Column(db.Text)
+    notes = db.Column(db.Text)  # No longer written; migration 6 cleared the old copies of the body
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Fields for mood journal integration
@@ -15,39 +17,143 @@ class MoodEntry(db.Model):
     ranking = db.Column(db.Integer, nullable=False)
     mood_rating = db.Column(db.Integer, nullable=False)
     difficulty_ranking = db.Column(db.Integer, nullable=False)  # Add missing field
-    entry_body = db.Column(db.Text, nullable=False)  # Rename from 'note' to match usage
-    tags_raw = db.Column(db.Text, nullable=True)
+    entry_body = db.Column(db.Text, nullable=False)  # Legacy plain body; "" once entry_body_z holds it
+    entry_body_z = db.Column(db.LargeBinary, nullable=True)  # Compressed body (see body_codec); added by migration 6
+    entry_preview = db.Column(db.String(200), nullable=True)  # make_preview(entry_body); added by migration 5
+    tags_raw = db.Column(db.Text, nullable=True)  # Legacy comma-joined tags; moved to entry_tags by migration 3
     biometrics_raw = db.Column(db.Text, nullable=True)
     is_private = db.Column(db.Boolean, default=False)  # Add privacy field
+    is_excluded_from_reports = db.Column(db.Boolean, default=False)  # US-19; added by migration 1
 
-    def to_entry(self):
+    # Added to existing databases by migration 2 (see migrations.py); keep the names in sync
+    __table_args__ = (
+        db.Index("ix_mood_entry_date_created", "entry_date", "created_at"),
+        db.Index("ix_mood_entry_ranking_date", "ranking", "entry_date"),
+        db.Index("ix_mood_entry_mood_rating", "mood_rating"),
+        db.Index("ix_mood_entry_private_date", "is_private", "entry_date"),
+    )
+
+    def to_entry(self, tags=None):
+        """
+        Build the Entry for this row. tags comes from entry_tags; rows written before
+        migration 3 fall back to the legacy tags_raw column.
+        """
+        return MoodEntry.entry_from_row(
+            (
+                self.entry_id_str,
+                self.entry_name,
+                self.entry_date,
+                self.body,
+                self.ranking,
+                self.mood_rating,
+                self.difficulty_ranking,
+                self.tags_raw,
+                self.biometrics_raw,
+                self.is_private,
+                self.is_excluded_from_reports,
+                self.created_at,
+            ),
+            tags,
+        )
+
+    @property
+    def body(self):
+        """The entry body, whichever column it is stored in"""
+        return decode_body(self.entry_body_z if self.entry_body_z is not None else self.entry_body)
+
+    @body.setter
+    def body(self, value):
+        self.entry_body_z = encode_body(value)
+        self.entry_body = ""
+
+    @classmethod
+    def stored_body(cls):
+        """
+        SQL expression for the stored body: the compressed entry_body_z, or the plain
+        entry_body of rows not yet moved by migration 6. Pass the value to body_codec.decode_body.
+        """
+        return func.coalesce(cls.entry_body_z, cls.entry_body, type_=db.Text)
+
+    @classmethod
+    def entry_select(cls, with_body=True):
+        """
+        SELECT of just the columns an Entry needs, for bulk loads that skip ORM objects.
+        with_body=False selects the short entry_preview in the body's place, for
+        metadata-only entries. entry_from_row unpacks these rows by position, so keep
+        the two in the same order.
+        """
+        return select(
+            cls.entry_id_str,
+            cls.entry_name,
+            cls.entry_date,
+            cls.stored_body().label("entry_body") if with_body else cls.entry_preview,
+            cls.ranking,
+            cls.mood_rating,
+            cls.difficulty_ranking,
+            cls.tags_raw,
+            cls.biometrics_raw,
+            cls.is_private,
+            cls.is_excluded_from_reports,
+            cls.created_at,
+        )
+
+    @staticmethod
+    def entry_from_row(row, tags=None, body_loader=None):
+        """
+        Build an Entry from a row of entry_select() through the trusted Entry._from_trusted
+        path: the values were validated when they were saved. The row is unpacked by
+        position (much cheaper than named access on SQLAlchemy rows).
+        Pass body_loader for rows of entry_select(with_body=False): the entry then holds
+        the preview and loads its body on first access.
+        """
         from mood_mastery.entry import Entry
 
-        tags = self.tags_raw.split(",") if self.tags_raw else []
-        biometrics = json.loads(self.biometrics_raw) if self.biometrics_raw else None
-
-        e = Entry(
-            self.entry_name,
-            self.entry_date.day,
-            self.entry_date.month,
-            self.entry_date.year,
-            self.entry_body,
-            self.ranking,
-            self.mood_rating,
-            self.difficulty_ranking,  # Add this
+        (
+            entry_id_str,
+            entry_name,
+            entry_date,
+            entry_body,
+            ranking,
+            mood_rating,
+            difficulty_ranking,
+            tags_raw,
+            biometrics_raw,
+            is_private,
+            is_excluded_from_reports,
+            created_at,
+        ) = row
+        if tags is None:
+            tags = []
+            if tags_raw:
+                # Legacy tags_raw was never cleaned on the way in, so clean it like Entry.add_tag does
+                raw = (t.strip().lower() for t in tags_raw.split(","))
+                tags = list(dict.fromkeys(t for t in raw if t))
+        return Entry._from_trusted(
+            entry_id_str,
+            entry_name,
+            entry_date,
+            decode_body(entry_body),
+            ranking,
+            mood_rating,
+            difficulty_ranking,
             tags=tags,
-            biometrics=biometrics,
+            biometrics=json.loads(biometrics_raw) if biometrics_raw else None,
+            is_private=bool(is_private),
+            is_excluded_from_reports=bool(is_excluded_from_reports),
+            created_at=created_at,
+            body_loader=body_loader,
         )
-        e.entry_id_str = self.entry_id_str
-        e.is_private = self.is_private
-        # Set the created_at if needed
-        if hasattr(e, 'created_at'):
-            e.created_at = self.created_at
-        return e
 
     @classmethod
     def from_entry(cls, entry):
-        return cls(
+        return cls(**cls.columns_from_entry(entry))
+
+    @staticmethod
+    def columns_from_entry(entry):
+        """Column values for an Entry, usable for ORM objects and Core bulk inserts alike"""
+        from mood_mastery.entry import make_preview
+
+        return dict(
             entry_id_str=entry.entry_id_str,
             entry_name=entry.entry_name,
             entry_date=entry.entry_date,
@@ -55,9 +161,39 @@ class MoodEntry(db.Model):
             mood_rating=entry.mood_rating,
             difficulty_ranking=getattr(entry, 'difficulty_ranking', 3),  # Default if missing
             mood=str(entry.mood_rating),
-            notes=entry.entry_body,  # Map to notes field
-            entry_body=entry.entry_body,  # Keep original
-            tags_raw=",".join(entry.tags) if getattr(entry, "tags", None) else None,
+            entry_body="",  # the body is stored once, compressed, in entry_body_z
+            entry_body_z=encode_body(entry.entry_body),
+            entry_preview=make_preview(entry.entry_body),
+            tags_raw=None,  # tags live in entry_tags (see EntryTag)
             biometrics_raw=json.dumps(entry.biometrics) if getattr(entry, "biometrics", None) else None,
-            is_private=getattr(entry, 'is_private', False)
+            is_private=getattr(entry, 'is_private', False),
+            is_excluded_from_reports=getattr(entry, 'is_excluded_from_reports', False),
         )
+
+
+class EntryTag(db.Model):
+    """
+    One row per (entry, tag), replacing MoodEntry.tags_raw so tag lookups, counts and
+    distinct tags run as indexed SQL instead of splitting every row's CSV.
+    Tags are stored cleaned (stripped, lowercased), exactly as Entry.tags holds them.
+    """
+    __tablename__ = "entry_tags"
+
+    entry_id = db.Column(
+        db.String(36), db.ForeignKey("mood_entry.entry_id_str"), primary_key=True
+    )
+    tag = db.Column(db.String(100), primary_key=True)
+
+    # Created on existing databases by migration 3 (see migrations.py); keep the names in sync
+    __table_args__ = (db.Index("ix_entry_tags_tag", "tag"),)
+
+
+class JournalMeta(db.Model):
+    """
+    Small key/value table for journal bookkeeping. "change_counter" is bumped by triggers
+    on mood_entry and entry_tags (created by migration 4) and stamps the startup snapshot.
+    """
+    __tablename__ = "journal_meta"
+
+    key = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False)
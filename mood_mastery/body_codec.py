@@ -0,0 +1,124 @@
+"""
+Compressed storage format for entry bodies (MoodEntry.entry_body_z).
+
+A stored body is one codec byte followed by the payload:
+
+    0  raw UTF-8          (short bodies, where compression would only add overhead)
+    1  zlib
+    2  zlib primed with SHARED_DICTIONARY
+    3  zstd primed with SHARED_DICTIONARY (only when the zstandard package is installed)
+
+Journal entries are short and full of the same everyday words, so a shared dictionary
+lets even a few-sentence body compress well. The byte stays in every value, so bodies
+written with one codec remain readable after DEFAULT_CODEC changes. Never edit
+SHARED_DICTIONARY: codecs 2 and 3 need the exact bytes they were written with.
+"""
+
+import zlib
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # optional; codec 3 is unavailable without it
+    zstandard = None
+
+RAW = 0
+ZLIB = 1
+ZLIB_DICT = 2
+ZSTD_DICT = 3
+
+DEFAULT_CODEC = ZLIB_DICT
+# Bodies shorter than this (in bytes) are stored raw
+MIN_COMPRESS_LENGTH = 64
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 9
+
+# Common journaling words and phrases; zlib matches against the end of the dictionary
+# most cheaply, so the most frequent strings come last
+SHARED_DICTIONARY = (
+    " appointment assignment presentation deadline interview project meeting lecture exam"
+    " homework class professor roommate partner parents brother sister family friends"
+    " coffee breakfast lunch dinner walk run gym workout yoga meditation sleep tired"
+    " anxious stressed overwhelmed frustrated nervous worried sad lonely angry upset"
+    " calm relaxed grateful proud excited happy content motivated productive hopeful"
+    " I think I need to I want to I have to I wish I could I'm not sure I don't know"
+    " I realized I noticed I decided I tried to I managed to I couldn't I didn't I wasn't"
+    " this morning this afternoon this evening last night tomorrow yesterday today"
+    " at work at school at home with my friends with my family for a while all day"
+    " a little bit a lot of kind of going to want to have to was really felt really"
+    " feel like I felt like I'm feeling I was feeling I feel I felt it was and then"
+    " because but so that this the and to of a in it was I my me is for on with"
+).encode("utf-8")
+
+_ZSTD_DICTIONARY = (
+    zstandard.ZstdCompressionDict(SHARED_DICTIONARY, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+    if zstandard
+    else None
+)
+
+
+def available_codecs() -> tuple:
+    """Codec bytes this installation can write (and read)"""
+    return (RAW, ZLIB, ZLIB_DICT) + ((ZSTD_DICT,) if zstandard else ())
+
+
+def encode_body(body: Optional[str], codec: Optional[int] = None) -> bytes:
+    """
+    Stored form of an entry body. Falls back to RAW whenever compressing wouldn't
+    make the value smaller.
+
+    Parameters -------------------------
+    - body : str        // The entry body (None is stored as "")
+    - codec : int       // One of available_codecs(); DEFAULT_CODEC if omitted
+    """
+    raw = (body or "").encode("utf-8")
+    codec = DEFAULT_CODEC if codec is None else codec
+    if codec == RAW or len(raw) < MIN_COMPRESS_LENGTH:
+        return bytes((RAW,)) + raw
+
+    if codec == ZLIB:
+        payload = zlib.compress(raw, _ZLIB_LEVEL)
+    elif codec == ZLIB_DICT:
+        compressor = zlib.compressobj(_ZLIB_LEVEL, zdict=SHARED_DICTIONARY)
+        payload = compressor.compress(raw) + compressor.flush()
+    elif codec == ZSTD_DICT:
+        if zstandard is None:
+            raise ValueError("codec 3 (zstd) needs the zstandard package")
+        payload = zstandard.ZstdCompressor(
+            level=_ZSTD_LEVEL, dict_data=_ZSTD_DICTIONARY
+        ).compress(raw)
+    else:
+        raise ValueError(f"unknown body codec {codec}")
+
+    if len(payload) >= len(raw):
+        return bytes((RAW,)) + raw
+    return bytes((codec,)) + payload
+
+
+def decode_body(stored) -> str:
+    """
+    Entry body from its stored form. Plain str values (rows written before migration 6
+    moved bodies into entry_body_z) are returned as they are.
+    """
+    if stored is None:
+        return ""
+    if isinstance(stored, str):
+        return stored
+    stored = bytes(stored)
+    if not stored:
+        return ""
+    codec, payload = stored[0], stored[1:]
+    if codec == RAW:
+        raw = payload
+    elif codec == ZLIB:
+        raw = zlib.decompress(payload)
+    elif codec == ZLIB_DICT:
+        decompressor = zlib.decompressobj(zdict=SHARED_DICTIONARY)
+        raw = decompressor.decompress(payload) + decompressor.flush()
+    elif codec == ZSTD_DICT:
+        if zstandard is None:
+            raise ValueError("this body was stored with zstd; install the zstandard package")
+        raw = zstandard.ZstdDecompressor(dict_data=_ZSTD_DICTIONARY).decompress(payload)
+    else:
+        raise ValueError(f"unknown body codec {codec}")
+    return raw.decode("utf-8")
@@ -0,0 +1,241 @@
+"""
+Column store for journal analytics.
+
+ColumnStore keeps the numeric fields of the resident entries as parallel typed arrays (one
+row per entry) plus a row <-> entry id map, so analytics read a few flat columns instead
+of an attribute per Entry object. Removing an entry moves the last row into its place, so
+rows stay dense but are in no particular order; the sequence column records the order the
+entries were added in. Tags are kept as bit vectors: each tag gets a bit the first time it
+is seen, and tag_words[w] holds bits 64*w .. 64*w + 63 of every row. A tag's bit is freed
+once no row holds it and handed to the next new tag (lowest first), and words left with
+no live bits at the end are dropped, so the words track the tags in use, not every tag
+ever seen.
+
+With NumPy installed, reductions run over NumPy copies of the columns (a copy, not a view:
+an array.array can't grow while a buffer view of it is alive, and another request may be
+writing). Without it they loop over the arrays in plain Python.
+"""
+
+import heapq
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:  # optional; reductions fall back to plain loops
+    numpy = None
+
+# (name, array typecode) of each column; the typecodes match the snapshot's columns
+COLUMNS = (
+    ("ordinal", "i"),
+    ("mood_rating", "h"),
+    ("ranking", "h"),
+    ("difficulty_ranking", "h"),
+    ("excluded", "B"),
+    ("private", "B"),
+)
+
+# One tag_words value: 64 tag bits
+_WORD_MASK = (1 << 64) - 1
+
+
+def _row_values(entry) -> tuple:
+    """The entry's values in COLUMNS order"""
+    return (
+        entry.entry_ordinal,
+        entry.mood_rating,
+        entry.ranking,
+        entry.difficulty_ranking,
+        1 if entry.is_excluded_from_reports else 0,
+        1 if entry.is_private else 0,
+    )
+
+
+class ColumnStore:
+    def __init__(self):
+        self.columns: Dict[str, array] = {name: array(typecode) for name, typecode in COLUMNS}
+        self._column_list = list(self.columns.values())
+        self.ids: List[str] = []  # row -> entry id
+        self._rows: Dict[str, int] = {}  # entry id -> row
+        self.sequence = array("Q")  # row -> order the entry was added in
+        self._next_sequence = 0
+        self._tag_bits: Dict[str, int] = {}  # tag -> bit
+        self._bit_tags: List[Optional[str]] = []  # bit -> tag, None while free
+        self._bit_rows: List[int] = []  # bit -> rows holding it
+        self._free_bits: List[int] = []  # heap of free bits below len(self._bit_tags)
+        self.tag_words: List[array] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, entry_id_str: str) -> bool:
+        return entry_id_str in self._rows
+
+    def _row_arrays(self) -> List[array]:
+        return self._column_list + [self.sequence] + self.tag_words
+
+    def clear(self):
+        for column in self._row_arrays():
+            del column[:]
+        self.ids.clear()
+        self._rows.clear()
+        self._next_sequence = 0
+        self._tag_bits.clear()
+        self._bit_tags.clear()
+        self._bit_rows.clear()
+        self._free_bits.clear()
+        self.tag_words.clear()
+
+    def row_of(self, entry_id_str: str) -> Optional[int]:
+        return self._rows.get(entry_id_str)
+
+    def add(self, entry):
+        """Append a row for entry (or refresh its row if it already has one)"""
+        if entry.entry_id_str in self._rows:
+            self.update(entry)
+            return
+        mask = self._tag_mask(entry)  # before the row exists: a new word is sized to len(self)
+        self._count_bits(mask, 1)
+        self._rows[entry.entry_id_str] = len(self.ids)
+        self.ids.append(entry.entry_id_str)
+        for column, value in zip(self._column_list, _row_values(entry)):
+            column.append(value)
+        self.sequence.append(self._next_sequence)
+        self._next_sequence += 1
+        for word in self.tag_words:
+            word.append(mask & _WORD_MASK)
+            mask >>= 64
+
+    def update(self, entry):
+        """Rewrite entry's row after one of its fields changed"""
+        row = self._rows.get(entry.entry_id_str)
+        if row is None:
+            return
+        for column, value in zip(self._column_list, _row_values(entry)):
+            column[row] = value
+        old_mask, mask = self.tag_mask(row), self._tag_mask(entry)
+        self._count_bits(mask & ~old_mask, 1)
+        freed = self._count_bits(old_mask & ~mask, -1)
+        for word in self.tag_words:
+            word[row] = mask & _WORD_MASK
+            mask >>= 64
+        if freed:
+            self._trim_words()
+
+    def remove(self, entry_id_str: str):
+        """Drop an entry's row, moving the last row into the hole"""
+        row = self._rows.get(entry_id_str)
+        if row is None:
+            return
+        freed = self._count_bits(self.tag_mask(row), -1)
+        del self._rows[entry_id_str]
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self._rows[moved] = row
+            for column in self._row_arrays():
+                column[row] = column[last]
+        self.ids.pop()
+        for column in self._row_arrays():
+            column.pop()
+        if freed:
+            self._trim_words()
+
+    def _tag_mask(self, entry) -> int:
+        """Bit vector of entry's tags, giving new tags a bit (and a new word when needed)"""
+        mask = 0
+        for tag in entry._tags:
+            bit = self._tag_bits.get(tag)
+            if bit is None:
+                if self._free_bits:
+                    bit = heapq.heappop(self._free_bits)
+                    self._bit_tags[bit] = tag
+                else:
+                    bit = len(self._bit_tags)
+                    self._bit_tags.append(tag)
+                    self._bit_rows.append(0)
+                self._tag_bits[tag] = bit
+                if bit >= 64 * len(self.tag_words):
+                    self.tag_words.append(array("Q", bytes(8 * len(self.ids))))
+            mask |= 1 << bit
+        return mask
+
+    def _count_bits(self, mask: int, delta: int) -> bool:
+        """
+        Add delta to the row count of every bit in mask, freeing the bits no row holds any
+        more. Returns whether any bit was freed.
+
+        A freed bit is already clear in every row but the one being rewritten or removed,
+        which the caller clears before the bit can be handed out again.
+        """
+        freed = False
+        bit_rows = self._bit_rows
+        while mask:
+            low = mask & -mask
+            bit = low.bit_length() - 1
+            mask ^= low
+            bit_rows[bit] += delta
+            if not bit_rows[bit]:
+                del self._tag_bits[self._bit_tags[bit]]
+                self._bit_tags[bit] = None
+                heapq.heappush(self._free_bits, bit)
+                freed = True
+        return freed
+
+    def _trim_words(self):
+        """Drop the free bits at the top, and the words left holding none of the rest"""
+        bit_tags = self._bit_tags
+        if bit_tags and bit_tags[-1] is not None:
+            return
+        while bit_tags and bit_tags[-1] is None:
+            bit_tags.pop()
+            self._bit_rows.pop()
+        self._free_bits = [bit for bit in self._free_bits if bit < len(bit_tags)]
+        heapq.heapify(self._free_bits)
+        del self.tag_words[-(-len(bit_tags) // 64):]
+
+    def tag_mask(self, row: int) -> int:
+        """The tag bit vector of a row"""
+        mask = 0
+        for shift, word in enumerate(self.tag_words):
+            mask |= word[row] << (64 * shift)
+        return mask
+
+    def numpy_columns(self, *names: str) -> Optional[Dict[str, "numpy.ndarray"]]:
+        """
+        NumPy copies of the named columns (all of them if none are named), or None when
+        NumPy isn't installed
+        """
+        if numpy is None:
+            return None
+        return {name: numpy.array(self.columns[name]) for name in (names or self.columns)}
+
+    def weekday_sums(self, name: str, include_excluded: bool = True) -> Tuple[List[int], List[int]]:
+        """
+        (sums, counts) of column name per weekday of the entry dates, Monday first
+
+        Parameters -------------------------
+        - name : str                // One of the COLUMNS names
+        - include_excluded : bool   // False skips the rows excluded from reports
+        """
+        if numpy is not None:
+            columns = self.numpy_columns("ordinal", name, "excluded")
+            weekdays = (columns["ordinal"] - 1) % 7  # ordinal 1 (0001-01-01) was a Monday
+            values = columns[name]
+            if not include_excluded:
+                keep = columns["excluded"] == 0
+                weekdays, values = weekdays[keep], values[keep]
+            sums = numpy.bincount(weekdays, weights=values, minlength=7)
+            counts = numpy.bincount(weekdays, minlength=7)
+            return [int(s) for s in sums], counts.tolist()
+
+        sums, counts = [0] * 7, [0] * 7
+        columns = self.columns
+        for ordinal, value, excluded in zip(columns["ordinal"], columns[name], columns["excluded"]):
+            if excluded and not include_excluded:
+                continue
+            weekday = (ordinal - 1) % 7
+            sums[weekday] += value
+            counts[weekday] += 1
+        return sums, counts
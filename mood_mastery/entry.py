@@ -1,4 +1,5 @@
 # Any imports we may need (TODO: update as necessary as we implement more things here)
+import sys
 import uuid
 from datetime import date
 from datetime import datetime
@@ -16,6 +17,191 @@ BIOMETRICS: Dict[str, list[str]] = {
     "Menstruation": ["yes", "no"],
 }
 
+
+# Valid range of each numeric field; the journal's indexes have one slot per ranking and mood value
+_FIELD_RANGES = {
+    "ranking": (1, 8),
+    "mood_rating": (1, 100),
+    "difficulty_ranking": (1, 100),
+}
+
+
+def _check_field(field: str, value) -> None:
+    """Raises ValueError unless value is an int in field's _FIELD_RANGES range"""
+    low, high = _FIELD_RANGES[field]
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{field} must be an int")
+    if not low <= value <= high:
+        raise ValueError(f"{field} must be between {low} and {high}")
+
+
+def _clamp_field(field: str, value: int) -> int:
+    """value moved into field's _FIELD_RANGES range"""
+    low, high = _FIELD_RANGES[field]
+    return min(max(value, low), high)
+
+
+def validate_entry_fields(
+    entry_name: str,
+    ranking: int,
+    mood_rating: int,
+    difficulty_ranking: int,
+    biometrics: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Checks entry values against the rules the rest of the journal relies on
+    (reports index rankings 1-8, graphs index mood_ratings 1-100).
+    Raises ValueError describing the first problem found.
+
+    Parameters -------------------------
+    - entry_name : str          // Must be a string
+    - ranking : int             // Must be an int from 1 to 8 (one per ranking emoji)
+    - mood_rating : int         // Must be an int from 1 to 100
+    - difficulty_ranking : int  // Must be an int from 1 to 100
+    - biometrics : dict         // Optional; every key/value must be in BIOMETRICS
+    """
+    if not isinstance(entry_name, str):
+        raise ValueError("entry_name must be a string")
+    _check_field("ranking", ranking)
+    _check_field("mood_rating", mood_rating)
+    _check_field("difficulty_ranking", difficulty_ranking)
+    if biometrics:
+        for key, value in biometrics.items():
+            if key not in BIOMETRICS:
+                raise ValueError(f"unknown biometric '{key}'")
+            if value not in BIOMETRICS[key]:
+                raise ValueError(f"invalid value '{value}' for biometric '{key}'")
+
+# Biometrics are stored per entry as one small int: 3 bits per BIOMETRICS key, holding
+# 1 + the index of its value (0 = not set). Keys decode in BIOMETRICS order
+_BIOMETRIC_KEYS = tuple(BIOMETRICS)
+_BIOMETRIC_BITS = 3
+
+
+def encode_biometrics(biometrics: Optional[Dict[str, str]]) -> int:
+    """Packed code for a biometrics dict; keys/values outside BIOMETRICS are dropped"""
+    code = 0
+    if biometrics:
+        for shift, key in enumerate(_BIOMETRIC_KEYS):
+            value = biometrics.get(key)
+            if value in BIOMETRICS[key]:
+                code |= (BIOMETRICS[key].index(value) + 1) << (shift * _BIOMETRIC_BITS)
+    return code
+
+
+def decode_biometrics(code: int) -> Dict[str, str]:
+    """Inverse of encode_biometrics"""
+    biometrics = {}
+    shift = 0
+    while code:
+        index = code & 0b111
+        if index:
+            key = _BIOMETRIC_KEYS[shift]
+            biometrics[key] = BIOMETRICS[key][index - 1]
+        code >>= _BIOMETRIC_BITS
+        shift += 1
+    return biometrics
+
+
+def _intern_tags(tags) -> tuple:
+    """Tags as a tuple of interned strings, so every entry with a tag shares one copy of it"""
+    if not tags:
+        return ()
+    return tuple(map(sys.intern, tags))
+
+
+# List cards show this much of an entry's body (see make_preview / MoodEntry.entry_preview)
+PREVIEW_LENGTH = 120
+
+# Stands in for a body that hasn't been read from the database yet (see Entry.entry_body)
+_BODY_NOT_LOADED = object()
+
+
+def make_preview(body: Optional[str], length: int = PREVIEW_LENGTH) -> str:
+    """
+    Short single-line version of an entry body for list views: whitespace collapsed,
+    cut at length characters with an ellipsis.
+    """
+    text = " ".join((body or "").split())
+    if len(text) <= length:
+        return text
+    return text[: length - 1].rstrip() + "…"
+
+
+class _TagsView(list):
+    """
+    What Entry.tags returns: a list of the entry's tags that writes in-place changes
+    (append, remove, item assignment, ...) back to the entry, as they were when Entry.tags
+    was a plain list attribute. Each change starts from the entry's current tags, so a
+    view kept around doesn't undo changes made through the entry since.
+    """
+
+    __slots__ = ("_entry",)
+
+    def __init__(self, entry):
+        super().__init__(entry._tags)
+        self._entry = entry
+
+
+class _BiometricsView(dict):
+    """
+    What Entry.biometrics returns: a dict of the entry's biometrics that writes in-place
+    changes back to the entry, like _TagsView. The entry only stores BIOMETRICS keys and
+    values, so anything else set through the view is dropped (the view then shows what
+    was stored).
+    """
+
+    __slots__ = ("_entry",)
+
+    def __init__(self, entry):
+        super().__init__(decode_biometrics(entry._biometrics))
+        self._entry = entry
+
+
+def _writes_back(base, name: str, refresh, store):
+    """base.name wrapped to run on the entry's current values and store the result on it"""
+    method = getattr(base, name)
+
+    def write_back(self, *args, **kwargs):
+        refresh(self)
+        result = method(self, *args, **kwargs)
+        store(self)
+        refresh(self)
+        return result
+
+    write_back.__name__ = name
+    return write_back
+
+
+def _refresh_tags(view):
+    list.__setitem__(view, slice(None), view._entry._tags)
+
+
+def _store_tags(view):
+    view._entry._set_tags(_intern_tags(view))
+
+
+def _refresh_biometrics(view):
+    dict.clear(view)
+    dict.update(view, decode_biometrics(view._entry._biometrics))
+
+
+def _store_biometrics(view):
+    view._entry._biometrics = encode_biometrics(view)
+
+
+for _name in (
+    "append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+    "__setitem__", "__delitem__", "__iadd__", "__imul__",
+):
+    setattr(_TagsView, _name, _writes_back(list, _name, _refresh_tags, _store_tags))
+for _name in (
+    "__setitem__", "__delitem__", "pop", "popitem", "clear", "update", "setdefault", "__ior__",
+):
+    setattr(_BiometricsView, _name, _writes_back(dict, _name, _refresh_biometrics, _store_biometrics))
+del _name
+
+
 class Entry:
     """
     A class representing a user's entry.
@@ -23,22 +209,38 @@ class Entry:
     Attributes -------------------------
      - entry_name : str     // The name assigned to a user's entry
      - entry_date : date    // The date of a user's entry
-     - entry_body : str     // The body/main text of a user's entry
+     - entry_body : str     // The body/main text of a user's entry (may be read from the database on first access)
+     - entry_preview : str  // A short single-line preview of entry_body for list views
      - ranking : int        // The ranking assigned to the entry by a user (TODO: describe valid range if we're doing it numerically in the code + then representing certain value ranges with different emojis)
      - is_private : bool    // The privacy status of the entry (True = private; False = public)
      - mood_rating: int     // The user's rating of their mood on the day/at the time of the entry (range of 1 to 100)
     """
 
     # Attributes (TODO: update if we have more features to add to entries)
-    entry_id_str = ""
-    entry_name = ""
-    entry_date = None
-    entry_body = ""
-    ranking = -999  # CMNT: this default value is for if we want to keep a numerical representation for rankings in the code
-    is_private = None
-    mood_rating = -999  # For US-20; rating from 1 (terrible/worst) to 100 (fantastic/best)
-    difficulty_ranking = -999  # For US-28; ranking from 1 (not a challenge at all) to 100 (impossible)
-    is_excluded_from_reports = False  # For US-19; whether this entry should be excluded from weekly/monthly reviews
+    # A journal keeps every entry in memory, so entries use __slots__ instead of a per-instance
+    # __dict__. entry_date, tags and biometrics are properties over compact storage:
+    #   _ordinal    : int               // entry_date.toordinal()
+    #   _tags       : tuple[str]        // interned, cleaned tags in the order they were added
+    #   _biometrics : int               // encode_biometrics(...) of the biometrics dict
+    # mood_rating, ranking, difficulty_ranking, is_private and is_excluded_from_reports are
+    # properties too, so the journal's aggregates and column store hear about changes to them
+    __slots__ = (
+        "entry_id_str",
+        "entry_name",
+        "_ordinal",
+        "_entry_body",
+        "_preview",  # stored preview, only used while the body isn't loaded
+        "_body_loader",  # called with the entry to fill in a deferred body
+        "_ranking",
+        "_private",
+        "_mood_rating",  # For US-20; rating from 1 (terrible/worst) to 100 (fantastic/best)
+        "_difficulty_ranking",  # For US-28; ranking from 1 (not a challenge at all) to 100 (impossible)
+        "_excluded",  # For US-19; is_excluded_from_reports: whether this entry should be excluded from weekly/monthly reviews
+        "_tags",
+        "_biometrics",
+        "created_at",  # Only set on entries loaded from storage (or by callers that need it)
+        "_journal",  # The Mood_Journal indexing this entry (None if none); told about tag and date changes
+    )
 
     def __init__(
         self,
@@ -66,23 +268,217 @@ class Entry:
         - mood_rating: int          // The user's rating of their mood on the day/at the time of the entry (range of 1 to 100)
         - difficulty_ranking: int   // The user's ranking of the difficulty of getting through the day (range of 1 to 100)
         """
+        self._journal = None
         self.entry_id_str = str(uuid.uuid4())  # Generating a unique id for the entry
         self.entry_name = entry_name
         self.entry_date = date(entry_year, entry_month, entry_day)
-        self.entry_body = entry_body
+        self._entry_body = entry_body
+        self._preview = None
+        self._body_loader = None
         self.ranking = ranking
-        self.tags: list[str] = []
+        self._tags = ()
         if tags:
             for t in tags:
                 self.add_tag(t)
         self.is_private = False  # By default, entry is not private
         self.is_excluded_from_reports = False  # By default, entry is included in reports
-        self.biometrics: Dict[str, str] = {}
+        self._biometrics = 0
         if biometrics:
             self.initialize_biometrics(biometrics)
         self.mood_rating = mood_rating
         self.difficulty_ranking = difficulty_ranking
 
+    @classmethod
+    def _from_trusted(
+        cls,
+        entry_id_str: str,
+        entry_name: str,
+        entry_date: date,
+        entry_body: str,
+        ranking: int,
+        mood_rating: int,
+        difficulty_ranking: int,
+        tags: Optional[list] = None,
+        biometrics: Optional[Dict[str, str]] = None,
+        is_private: bool = False,
+        is_excluded_from_reports: bool = False,
+        created_at: Optional[datetime] = None,
+        body_loader=None,
+    ) -> "Entry":
+        """
+        Builds an Entry straight from values that were validated when they were first saved
+        (a database row, a snapshot). Skips __init__, so no throwaway uuid is generated and
+        tags/biometrics are taken as already cleaned. Not for user input: use Entry(...) there.
+        Rows saved before rankings and mood_ratings were checked may hold values outside
+        1-8 / 1-100; those are clamped into range, since the journal's indexes need it.
+
+        Parameters -------------------------
+        - entry_id_str : str        // The stored id
+        - entry_date : date         // The date of the entry (not split into day/month/year)
+        - tags : list[str]          // Already cleaned, deduplicated tags
+        - biometrics : dict         // Already filtered against BIOMETRICS
+        - created_at : datetime     // Only set on the entry when given
+        - body_loader : callable    // Metadata-only entry: entry_body is then the stored preview, and
+                                       body_loader(entry) is called to fill in the real body on first access
+        (the rest as in __init__)
+        """
+        e = cls.__new__(cls)
+        e._journal = None
+        e.entry_id_str = entry_id_str
+        e.entry_name = entry_name
+        e._ordinal = entry_date.toordinal()
+        e._ranking = ranking if 1 <= ranking <= 8 else _clamp_field("ranking", ranking)
+        e._tags = _intern_tags(tags)
+        e._private = is_private
+        e._excluded = is_excluded_from_reports
+        e._biometrics = encode_biometrics(biometrics)
+        e._mood_rating = mood_rating if 1 <= mood_rating <= 100 else _clamp_field("mood_rating", mood_rating)
+        e._difficulty_ranking = difficulty_ranking
+        if created_at is not None:
+            e.created_at = created_at
+        if body_loader is None:
+            e._entry_body = entry_body
+            e._preview = None
+            e._body_loader = None
+        else:
+            e._preview = entry_body
+            e._entry_body = _BODY_NOT_LOADED
+            e._body_loader = body_loader
+        return e
+
+    @property
+    def entry_date(self) -> date:
+        return date.fromordinal(self._ordinal)
+
+    @entry_date.setter
+    def entry_date(self, value: date):
+        old_ordinal = getattr(self, "_ordinal", None)
+        self._ordinal = value.toordinal()
+        if self._journal is not None and old_ordinal != self._ordinal:
+            self._journal._on_date_changed(self, old_ordinal)
+
+    @property
+    def mood_rating(self) -> int:
+        return self._mood_rating
+
+    @mood_rating.setter
+    def mood_rating(self, value: int):
+        if self._journal is not None:
+            _check_field("mood_rating", value)  # before the journal's indexes see it
+        old_rating = getattr(self, "_mood_rating", None)
+        self._mood_rating = value
+        if self._journal is not None and old_rating != value:
+            self._journal._on_mood_changed(self, old_rating)
+
+    @property
+    def ranking(self) -> int:
+        return self._ranking
+
+    @ranking.setter
+    def ranking(self, value: int):
+        if self._journal is not None:
+            _check_field("ranking", value)  # before the journal's indexes see it
+        old_ranking = getattr(self, "_ranking", None)
+        self._ranking = value
+        if self._journal is not None and old_ranking != value:
+            self._journal._on_ranking_changed(self, old_ranking, self._excluded)
+
+    @property
+    def is_excluded_from_reports(self) -> bool:
+        return self._excluded
+
+    @is_excluded_from_reports.setter
+    def is_excluded_from_reports(self, value: bool):
+        old_excluded = getattr(self, "_excluded", None)
+        self._excluded = value
+        if self._journal is not None and old_excluded != value:
+            self._journal._on_ranking_changed(self, self._ranking, old_excluded)
+
+    @property
+    def difficulty_ranking(self) -> int:
+        return self._difficulty_ranking
+
+    @difficulty_ranking.setter
+    def difficulty_ranking(self, value: int):
+        if self._journal is not None:
+            _check_field("difficulty_ranking", value)  # before the journal's indexes see it
+        old_difficulty = getattr(self, "_difficulty_ranking", None)
+        self._difficulty_ranking = value
+        if self._journal is not None and old_difficulty != value:
+            self._journal._on_column_changed(self)
+
+    @property
+    def is_private(self) -> bool:
+        return self._private
+
+    @is_private.setter
+    def is_private(self, value: bool):
+        old_private = getattr(self, "_private", None)
+        self._private = value
+        if self._journal is not None and old_private != value:
+            self._journal._on_column_changed(self)
+
+    @property
+    def entry_ordinal(self) -> int:
+        """entry_date.toordinal(), without building the date"""
+        return self._ordinal
+
+    @property
+    def tags(self) -> list:
+        """The entry's tags as a list; changing the list in place changes the entry's tags"""
+        return _TagsView(self)
+
+    @tags.setter
+    def tags(self, tags):
+        self._set_tags(_intern_tags(tags))
+
+    def _set_tags(self, new_tags: tuple):
+        old_tags = self._tags
+        self._tags = new_tags
+        if self._journal is not None:
+            for t in old_tags:
+                if t not in new_tags:
+                    self._journal._on_tag_removed(self, t)
+            for t in new_tags:
+                if t not in old_tags:
+                    self._journal._on_tag_added(self, t)
+
+    @property
+    def biometrics(self) -> Dict[str, str]:
+        """The entry's biometrics as a dict; changing the dict in place changes the entry's biometrics"""
+        return _BiometricsView(self)
+
+    @biometrics.setter
+    def biometrics(self, biometrics: Dict[str, str]):
+        self._biometrics = encode_biometrics(biometrics)
+
+    @property
+    def entry_body(self) -> str:
+        if self._entry_body is _BODY_NOT_LOADED:
+            self._body_loader(self)
+        return self._entry_body
+
+    @entry_body.setter
+    def entry_body(self, body: str):
+        self._entry_body = body
+
+    @property
+    def body_loaded(self) -> bool:
+        """False while entry_body is still only in the database"""
+        return self._entry_body is not _BODY_NOT_LOADED
+
+    @property
+    def entry_preview(self) -> str:
+        """Short preview of the body that never forces the body to load"""
+        if self._entry_body is _BODY_NOT_LOADED:
+            return self._preview or ""
+        return make_preview(self._entry_body)
+
+    def _fill_body(self, body: str) -> None:
+        """Loader callback: set a deferred body (no-op if the body was set in the meantime)"""
+        if self._entry_body is _BODY_NOT_LOADED:
+            self._entry_body = body
+
     def edit_entry(
         self,
         new_name: str,
@@ -118,16 +514,18 @@ class Entry:
         """
         bulk set biometrics
         """
+        current = decode_biometrics(self._biometrics)
         for key, value in data.items():
             if key in BIOMETRICS and value in BIOMETRICS[key]:
-                self.biometrics[key] = value
+                current[key] = value
+        self._biometrics = encode_biometrics(current)
 
     def set_biometric(self, key: str, value: str) -> bool:
         """
         sets one biometric, returns True if accepted
         """
         if key in BIOMETRICS and value in BIOMETRICS[key]:
-            self.biometrics[key] = value
+            self._biometrics = encode_biometrics(dict(decode_biometrics(self._biometrics), **{key: value}))
             return True
         return False
 
@@ -135,13 +533,17 @@ class Entry:
         """
         Returns the raw storage values (e.g., {'sleep': 'well rested'})
         """
-        return dict(self.biometrics)
+        return decode_biometrics(self._biometrics)
 
     def delete_biometric(self, key: str) -> bool:
         """
         removes one biometric field, returns True if removed
         """
-        return bool(self.biometrics.pop(key, None))
+        current = decode_biometrics(self._biometrics)
+        if current.pop(key, None) is None:
+            return False
+        self._biometrics = encode_biometrics(current)
+        return True
 
     def determine_ranking_emoji(self):
         """
@@ -176,16 +578,19 @@ class Entry:
 
     def has_tag(self, tag):
         t = self._clean(tag)
-        return t in self.tags
+        return t in self._tags
 
     def add_tag(self, tag):
         # Add one tag, return true if added, false if blank or already added
         t = self._clean(tag)
         if t == "":
             return False
-        if t in self.tags:
+        if t in self._tags:
             return False
-        self.tags.append(t)
+        t = sys.intern(t)
+        self._tags += (t,)
+        if self._journal is not None:
+            self._journal._on_tag_added(self, t)
         return True
 
     def add_tags(self, tags):
@@ -199,14 +604,14 @@ class Entry:
     def remove_tag(self, tag):
         # Remove tags, Returns true if removed
         t = self._clean(tag)
-        if t in self.tags:
-            self.tags.remove(t)
+        if t in self._tags:
+            self._set_tags(tuple(x for x in self._tags if x != t))
             return True
         return False
 
     def clear_tags(self):
         # remove all tags
-        self.tags = []
+        self._set_tags(())
 
     def is_private_check(self):
         return self.is_private
@@ -27,16 +27,78 @@ wish to follow them to a T, or we can see how we'd do the equivalents with what
 in entry.py and mood_journal.py
 """
 
+import gc
+from bisect import bisect_left, bisect_right, insort
 from extensions import db
 from datetime import datetime, date, timedelta
-from mood_mastery.entry import Entry
-from models import MoodEntry
-import json
+from mood_mastery.body_codec import decode_body
+from mood_mastery.column_store import ColumnStore
+from mood_mastery.entry import Entry, validate_entry_fields
+from mood_mastery.range_histogram import RangeHistogram
+from mood_mastery.similar_cache import NeighbourCache
+from mood_mastery.similarity import resolve_weights, top_similar
+from mood_mastery.similarity_index import SimilarityIndex
+from mood_mastery.snapshot import read_snapshot, snapshot_path_for, write_snapshot
+from mood_mastery.streak_runs import StreakRuns
+from mood_mastery.write_behind import WriteBehindQueue
+from models import EntryTag, JournalMeta, MoodEntry
+from collections.abc import Mapping
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from typing import Optional, Dict, List, Tuple
 
 
+_CHUNK_SIZE = 500
+
+
+def _chunks(items, size=_CHUNK_SIZE):
+    """Split a list into slices small enough for SQLite's bound-parameter limit"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# mj_mood_graph_trends buckets: (name, labels in order); see _trend_slots for the mapping
+_TREND_BUCKETS = (
+    ("day_of_week", ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")),
+    ("time_of_month", ("First third", "Second third", "Last third")),
+    (
+        "month_of_year",
+        (
+            "January", "February", "March", "April", "May", "June", "July",
+            "August", "September", "October", "November", "December",
+        ),
+    ),
+)
+
+
+def _trend_slots(ordinal: int) -> Tuple[int, int, int]:
+    """(weekday, third of the month, month - 1) of a day ordinal, as _TREND_BUCKETS indexes"""
+    day = date.fromordinal(ordinal)
+    third = 0 if day.day < 11 else 1 if day.day < 21 else 2
+    return day.weekday(), third, day.month - 1
+
+
+# RangeHistogram buckets: mood_rating - 1 for every entry, then _RANKING_BUCKET + ranking - 1
+# for the entries that count towards reports (not excluded)
+_MOOD_BUCKETS = 100
+_RANKING_BUCKET = _MOOD_BUCKETS
+_HISTOGRAM_BUCKETS = _MOOD_BUCKETS + 8
+
+
 class Mood_Journal:
-    def __init__(self, use_database=True):
+    def __init__(
+        self,
+        use_database=True,
+        app=None,
+        write_behind=False,
+        write_queue_size=1000,
+        write_batch_size=100,
+        write_flush_interval=0.5,
+        load_window_days=None,
+        snapshot=False,
+        defer_bodies=False,
+        prefill_similar=False,
+    ):
         # TODO
         # This is likely where we'll try to get the database file/instance, or create one if it doesn't exist
         # we can work on this together to get it set up and then be able to create tests.
@@ -46,118 +108,710 @@ class Mood_Journal:
         # delete_entry, even if not specifically for a database just yet
 
         self.entries_dict = {}
+        # Date index over entries_dict: day ordinal -> ids of that day's entries, plus the sorted
+        # ordinals that have entries, so a date range is two bisects and then only its own days.
+        # Every add/remove of a resident entry goes through _index_entry/_unindex_entry
+        self._date_index: Dict[int, Dict[str, None]] = {}
+        self._date_ordinals: List[int] = []
+        # Tag index over entries_dict: tag -> ids of the entries carrying it, with the tags also
+        # kept sorted by name and by (-count, name) so tag pages and the summary are views.
+        # Indexed entries point back here (Entry._journal) and report tag/date changes themselves
+        self._tag_index: Dict[str, set] = {}
+        self._sorted_tags: List[str] = []
+        self._tag_ranking: List[Tuple[int, str]] = []
         self.streak_current = 0
         self.streak_longest = 0
         self.last_entry_date = None
+        # Runs of consecutive days in the date index; days joining/leaving the index update it
+        # (see _index_date), so streaks follow every write without recomputing from all dates
+        self._streak_runs = StreakRuns()
+        # Running mood_rating sum/count per weekday, third of the month and month of the year
+        # over the date-indexed entries, so mj_mood_graph_trends never rescans the journal
+        self._trend_sums = {name: [0] * len(labels) for name, labels in _TREND_BUCKETS}
+        self._trend_counts = {name: [0] * len(labels) for name, labels in _TREND_BUCKETS}
+        # Mood and report-ranking counts per day as a Fenwick tree (see _add_to_histogram), so
+        # the bar graph and reports get any date range's histogram without walking its entries
+        self._histogram = RangeHistogram(_HISTOGRAM_BUCKETS)
+        # Ranking index over entries_dict: ranking -> ids of its entries, with a mood_rating
+        # histogram per ranking, so the emoji group views are a lookup instead of a scan
+        self._ranking_index: Dict[int, Dict[str, None]] = {}
+        self._ranking_moods: Dict[int, List[int]] = {}
+        # Numeric fields of every indexed entry as parallel arrays (see column_store.py), for
+        # analytics that need a pass over the whole journal
+        self._columns = ColumnStore()
+        # Entries bucketed by mood/ranking/difficulty for branch-and-bound similar-entry
+        # lookups (see similarity_index.py)
+        self._similarity_index = SimilarityIndex()
+        # Each entry's most similar entries, kept until a change could alter them (see
+        # similar_cache.py). Its lock is held around every change to the two structures above
+        self._similar_cache = NeighbourCache(self._columns, self._search_similar)
         self.use_database = use_database
+        self.app = app
         self._db_loaded = False
 
+        # Windowed loading: None loads the whole table on first use; a number of days only
+        # loads that recent window up front and fetches older date ranges when asked for them
+        self.load_window_days = load_window_days
+        self._resident_ranges: List[Tuple[date, date]] = []
+
+        # Startup snapshot: keep a columnar copy of the journal next to the database file and
+        # load that instead of the table while it's current (see mood_mastery/snapshot.py).
+        # Only used when the whole journal is loaded (no load window)
+        self.snapshot = snapshot and load_window_days is None
+
+        # Metadata-only entries: stored entries are loaded with their short preview instead of
+        # the body, and each body is read (a batch at a time) the first time it's accessed.
+        # _deferred_ids keeps the resident entries whose body hasn't been read yet, in load order
+        self.defer_bodies = defer_bodies
+        self._deferred_ids: Dict[str, None] = {}
+
+        # Optional write-behind mode: database writes are queued and group-committed by a
+        # background thread instead of blocking the caller (see mood_mastery/write_behind.py)
+        self._writer = None
+        if use_database and write_behind:
+            self._writer = WriteBehindQueue(
+                self._write_queued_batch,
+                max_pending=write_queue_size,
+                batch_size=write_batch_size,
+                flush_interval=write_flush_interval,
+            )
+
+        # Optional prefilling: a background thread computes the similar entries of the entries
+        # written (and refills the lists writes drop), so opening one is a lookup even the first
+        # time. Loaded entries are searched when first opened.
+        if prefill_similar:
+            self._similar_cache.start()
+
     def _get_app(self):
-        """Safely get the Flask app from db"""
+        """Safely get the Flask app (the one passed in, otherwise the one bound to db)"""
+        if self.app is not None:
+            return self.app
         return getattr(db, "app", None)
 
     def _ensure_db_loaded(self, app=None):
-        """Lazy load from database when needed"""
-        if not self._db_loaded and self.use_database:
-            app = self._get_app()
-            if app:
-                try:
-                    with app.app_context():
-                        db_entries = MoodEntry.query.all()
-                        for db_entry in db_entries:
-                            entry = db_entry.to_entry()
-                            # Ensure exclusion flag is present; default False if missing
-                            if not hasattr(entry, "is_excluded_from_reports"):
-                                entry.is_excluded_from_reports = getattr(
-                                    db_entry, "is_excluded_from_reports", False
-                                )
-                            self.entries_dict[entry.entry_id_str] = entry
-                        self.recompute_streak()
-                        self._db_loaded = True
-                except Exception as e:
-                    print(f"Warning: Could not load from database: {e}")
-
-    def _load_entries_from_db(self):
-        """Load all entries from database into memory"""
-        with db.app.app_context():  # Ensure app context
-            db_entries = MoodEntry.query.all()
-            for db_entry in db_entries:
-                entry = db_entry.to_entry()
-                if not hasattr(entry, "is_excluded_from_reports"):
-                    entry.is_excluded_from_reports = getattr(
-                        db_entry, "is_excluded_from_reports", False
+        """Lazy load from database when needed (everything that isn't resident yet)"""
+        self._ensure_range_loaded(date.min, date.max)
+
+    def _ensure_range_loaded(self, start: date, end: date):
+        """
+        Make sure every stored entry dated start..end (inclusive) is in entries_dict.
+        Without a load window the first call loads the whole table, as before. With one, the
+        first call also loads the recent window, and each date range is only read once.
+        """
+        if self._db_loaded or not self.use_database:
+            return
+        app = self._get_app()
+        if not app:
+            return
+
+        if self.load_window_days is None:
+            start, end = date.min, date.max
+        wanted = [(start, end)]
+        if self.load_window_days is not None and not self._resident_ranges:
+            window_start = date.today() - timedelta(days=self.load_window_days)
+            wanted.append((window_start, date.max))
+
+        gaps = []
+        for wanted_start, wanted_end in wanted:
+            for gap in self._missing_ranges(wanted_start, wanted_end):
+                if gap not in gaps:
+                    gaps.append(gap)
+        if not gaps:
+            return
+
+        self._flush_pending_writes()
+        try:
+            cold_start = self.snapshot and not self._resident_ranges
+            # Only a load into an empty journal holds nothing but the rows it just read
+            fresh_load = cold_start and not self.entries_dict
+            with app.app_context():
+                counter = self._change_counter() if fresh_load else None
+                if cold_start and self._load_snapshot():
+                    gaps = []
+                for gap_start, gap_end in gaps:
+                    self._load_entries_from_db(gap_start, gap_end)
+                if fresh_load and gaps:
+                    self._write_snapshot(counter)
+            for gap_start, gap_end in wanted:
+                self._mark_resident(gap_start, gap_end)
+            # Mark loaded first: recompute_streak reads entries back, which would otherwise load again
+            self._db_loaded = self._missing_ranges(date.min, date.max) == []
+            self.recompute_streak()
+        except Exception as e:
+            print(f"Warning: Could not load from database: {e}")
+
+    def _change_counter(self) -> Optional[int]:
+        """journal_meta's change counter (needs an app context); None if the table isn't there"""
+        try:
+            return db.session.execute(
+                select(JournalMeta.value).where(JournalMeta.key == "change_counter")
+            ).scalar()
+        except Exception:
+            db.session.rollback()
+            return None
+
+    def _load_snapshot(self) -> bool:
+        """
+        Fill entries_dict from the startup snapshot if it matches the database's change counter
+        (needs an app context). Returns False, having loaded nothing, when there's no current snapshot.
+        """
+        path = snapshot_path_for(db.engine.url.database)
+        counter = self._change_counter()
+        if path is None or counter is None:
+            return False
+        entries = read_snapshot(path, counter, self._load_deferred_body)
+        if entries is None:
+            return False
+        for entry in entries:
+            if self.entries_dict.setdefault(entry.entry_id_str, entry) is entry:
+                self._index_entry(entry, loaded=True)
+                if not entry.body_loaded:
+                    self._deferred_ids[entry.entry_id_str] = None
+        return True
+
+    def _write_snapshot(self, counter: Optional[int]):
+        """
+        Save the resident journal as the startup snapshot, stamped with counter (needs an app
+        context). Only call this right after loading the whole table into an empty journal,
+        with counter read before the rows: nothing is written if the counter has moved since,
+        since the rows may then be from a later state than the stamp says.
+        """
+        path = snapshot_path_for(db.engine.url.database)
+        if path is None or counter is None or self._change_counter() != counter:
+            return
+        try:
+            write_snapshot(
+                path, self.entries_dict.values(), counter, with_bodies=not self.defer_bodies
+            )
+        except OSError as e:
+            print(f"Warning: Could not write journal snapshot: {e}")
+
+    def _load_entries_from_db(self, start: date = date.min, end: date = date.max):
+        """
+        Load entries dated start..end from the database into memory (needs an app context).
+        Entries already in memory are kept as they are; they're at least as new as the stored row.
+        """
+        in_range = MoodEntry.entry_date.between(start, end)
+        tags_by_id = self._tags_by_entry_id(
+            select(EntryTag.entry_id, EntryTag.tag)
+            .join(MoodEntry, MoodEntry.entry_id_str == EntryTag.entry_id)
+            .where(in_range)
+        )
+        # Plain column rows rather than ORM objects: no identity map or change tracking to build
+        rows = db.session.execute(
+            MoodEntry.entry_select(with_body=not self.defer_bodies).where(in_range)
+        )
+        self._add_rows(rows, tags_by_id)
+
+    def _load_entries_by_ids(self, entry_ids: List[str]):
+        """Load the given entries that aren't resident yet, a chunk of ids per query (needs an app context)"""
+        missing = [i for i in entry_ids if i not in self.entries_dict]
+        for chunk in _chunks(missing):
+            tags_by_id = self._tags_by_entry_id(
+                select(EntryTag.entry_id, EntryTag.tag).where(EntryTag.entry_id.in_(chunk))
+            )
+            rows = db.session.execute(
+                MoodEntry.entry_select(with_body=not self.defer_bodies).where(
+                    MoodEntry.entry_id_str.in_(chunk)
+                )
+            )
+            self._add_rows(rows, tags_by_id)
+
+    def _add_rows(self, rows, tags_by_id: Dict[str, List[str]]):
+        """Hydrate entry_select() rows that aren't resident yet into entries_dict"""
+        entries_dict = self.entries_dict
+        entry_from_row = MoodEntry.entry_from_row
+        body_loader = self._load_deferred_body if self.defer_bodies else None
+        index_entry = self._index_entry
+        # Every object built here stays alive, so cyclic GC passes during a big load are
+        # pure overhead; hold them off until the load is done
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for row in rows:
+                entry_id = row[0]
+                if entry_id not in entries_dict:
+                    entry = entries_dict[entry_id] = entry_from_row(
+                        row, tags_by_id.get(entry_id), body_loader
                     )
-                self.entries_dict[entry.entry_id_str] = entry
+                    index_entry(entry, loaded=True)
+                    if body_loader:
+                        self._deferred_ids[entry_id] = None
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def _load_deferred_body(self, entry: Entry):
+        """
+        Body loader for metadata-only entries: reads this entry's body together with the next
+        bodies still waiting (one IN query per batch), since a view that needs one body usually
+        goes on to the neighbouring ones. Raises if the database can't be read, rather than
+        letting a missing body look like an empty one.
+        """
+        batch = [entry.entry_id_str]
+        for entry_id in self._deferred_ids:
+            if len(batch) >= _CHUNK_SIZE:
+                break
+            if entry_id != entry.entry_id_str:
+                batch.append(entry_id)
+
+        bodies = dict(self._stored_bodies(batch))
+        for entry_id in batch:
+            self._deferred_ids.pop(entry_id, None)
+            resident = self.entries_dict.get(entry_id)
+            if resident is not None and entry_id in bodies:
+                resident._fill_body(bodies[entry_id])
+        # The row is gone (deleted elsewhere): nothing left to load
+        entry._fill_body(bodies.get(entry.entry_id_str, ""))
+
+    def _stored_bodies(self, entry_ids: List[str]):
+        """Yield (entry_id, entry_body) from the database, a chunk of ids per query"""
+        app = self._get_app()
+        if not app:
+            raise RuntimeError("entry bodies are deferred but no database is available")
+        with app.app_context():
+            for chunk in _chunks(entry_ids):
+                rows = db.session.execute(
+                    select(MoodEntry.entry_id_str, MoodEntry.stored_body()).where(
+                        MoodEntry.entry_id_str.in_(chunk)
+                    )
+                )
+                for entry_id, stored in rows:
+                    yield entry_id, decode_body(stored)
+
+    @staticmethod
+    def _tags_by_entry_id(tag_select) -> Dict[str, List[str]]:
+        """Group (entry_id, tag) rows by entry, keeping the order the tags were written in"""
+        tags_by_id: Dict[str, List[str]] = {}
+        rows = db.session.execute(
+            tag_select.order_by(EntryTag.entry_id, text("entry_tags.rowid"))
+        )
+        for entry_id, tag in rows:
+            tags_by_id.setdefault(entry_id, []).append(tag)
+        return tags_by_id
+
+    def _load_entry_by_id(self, entry_id_str: str):
+        """Fetch a single entry that isn't resident yet (windowed mode)"""
+        app = self._get_app()
+        if not app or not self.use_database:
+            return
+        self._flush_pending_writes()
+        try:
+            with app.app_context():
+                self._load_entries_by_ids([entry_id_str])
+        except Exception as e:
+            print(f"Warning: Could not load from database: {e}")
+
+    def _ensure_initial_load(self):
+        """First-use load: the recent window in windowed mode, otherwise the whole table"""
+        today = date.today()
+        self._ensure_range_loaded(today, today)
+
+    def _index_entry(self, entry: Entry, loaded: bool = False):
+        """
+        Add a resident entry to the date and tag indexes and attach it to this journal
+
+        Parameters -------------------------
+        - entry : Entry             // The entry, already in entries_dict
+        - loaded : bool             // True when it was read from storage rather than written
+        """
+        entry._journal = self
+        with self._similar_cache.lock:
+            self._columns.add(entry)
+            self._similarity_index.add(entry)
+            self._similar_cache.changed(entry.entry_id_str, written=not loaded)
+        self._index_date(entry)
+        self._index_ranking(entry, entry.ranking)
+        for tag in entry._tags:
+            self._on_tag_added(entry, tag)
+
+    def _unindex_entry(self, entry: Entry):
+        """Remove an entry from the indexes and detach it (it's no longer resident here)"""
+        if entry._journal is not self:
+            return
+        self._unindex_date(entry, entry.entry_ordinal)
+        self._unindex_ranking(entry, entry.ranking, entry.mood_rating)
+        with self._similar_cache.lock:
+            self._columns.remove(entry.entry_id_str)
+            self._similarity_index.remove(entry.entry_id_str)
+            self._similar_cache.changed(entry.entry_id_str)
+        for tag in entry._tags:
+            self._on_tag_removed(entry, tag)
+        entry._journal = None
+
+    def _clear_indexes(self):
+        for entry in self.entries_dict.values():
+            if entry._journal is self:
+                entry._journal = None
+        self._date_index.clear()
+        self._date_ordinals.clear()
+        self._tag_index.clear()
+        self._sorted_tags.clear()
+        self._tag_ranking.clear()
+        self._streak_runs.clear()
+        for name, labels in _TREND_BUCKETS:
+            self._trend_sums[name] = [0] * len(labels)
+            self._trend_counts[name] = [0] * len(labels)
+        self._histogram.clear()
+        self._ranking_index.clear()
+        self._ranking_moods.clear()
+        with self._similar_cache.lock:
+            self._columns.clear()
+            self._similarity_index.clear()
+            self._similar_cache.clear()
+
+    def _index_date(self, entry: Entry):
+        ordinal = entry.entry_ordinal
+        bucket = self._date_index.get(ordinal)
+        if bucket is None:
+            bucket = self._date_index[ordinal] = {}
+            insort(self._date_ordinals, ordinal)
+            self._streak_runs.add_day(ordinal)
+            self._sync_streak()
+        bucket[entry.entry_id_str] = None
+        self._add_to_trends(ordinal, entry.mood_rating, 1)
+        self._add_to_histogram(entry, ordinal, 1)
+
+    def _unindex_date(self, entry: Entry, ordinal: int):
+        bucket = self._date_index.get(ordinal)
+        if bucket is None or bucket.pop(entry.entry_id_str, False) is False:
+            return
+        self._add_to_trends(ordinal, entry.mood_rating, -1)
+        self._add_to_histogram(entry, ordinal, -1)
+        if not bucket:
+            del self._date_index[ordinal]
+            del self._date_ordinals[bisect_left(self._date_ordinals, ordinal)]
+            self._streak_runs.remove_day(ordinal)
+            self._sync_streak()
+
+    def _on_date_changed(self, entry: Entry, old_ordinal: int):
+        """Entry callback: an indexed entry's date was changed"""
+        self._unindex_date(entry, old_ordinal)
+        self._index_date(entry)
+        self._on_column_changed(entry)
+
+    def _on_mood_changed(self, entry: Entry, old_rating: int):
+        """Entry callback: an indexed entry's mood_rating was changed"""
+        ordinal = entry.entry_ordinal
+        self._add_to_trends(ordinal, old_rating, -1)
+        self._add_to_trends(ordinal, entry.mood_rating, 1)
+        self._histogram.add(ordinal, old_rating - 1, -1)
+        self._histogram.add(ordinal, entry.mood_rating - 1, 1)
+        moods = self._ranking_moods[entry.ranking]
+        moods[old_rating - 1] -= 1
+        moods[entry.mood_rating - 1] += 1
+        self._on_column_changed(entry)
+
+    def _on_ranking_changed(self, entry: Entry, old_ranking: int, old_excluded: bool):
+        """Entry callback: an indexed entry's ranking or is_excluded_from_reports was changed"""
+        if old_ranking != entry.ranking:
+            self._unindex_ranking(entry, old_ranking, entry.mood_rating)
+            self._index_ranking(entry, entry.ranking)
+        ordinal = entry.entry_ordinal
+        if not old_excluded:
+            self._histogram.add(ordinal, _RANKING_BUCKET + old_ranking - 1, -1)
+        if not entry.is_excluded_from_reports:
+            self._histogram.add(ordinal, _RANKING_BUCKET + entry.ranking - 1, 1)
+        self._on_column_changed(entry)
+
+    def _on_column_changed(self, entry: Entry):
+        """Entry callback (and the other change callbacks): refresh an indexed entry's row"""
+        if entry.entry_id_str not in self._columns:
+            return  # being unindexed
+        with self._similar_cache.lock:
+            self._columns.update(entry)
+            self._similarity_index.update(entry)
+            self._similar_cache.changed(entry.entry_id_str)
+
+    def _index_ranking(self, entry: Entry, ranking: int):
+        ids = self._ranking_index.get(ranking)
+        if ids is None:
+            ids = self._ranking_index[ranking] = {}
+            self._ranking_moods[ranking] = [0] * _MOOD_BUCKETS
+        ids[entry.entry_id_str] = None
+        self._ranking_moods[ranking][entry.mood_rating - 1] += 1
+
+    def _unindex_ranking(self, entry: Entry, ranking: int, mood_rating: int):
+        ids = self._ranking_index.get(ranking)
+        if ids is None or ids.pop(entry.entry_id_str, False) is False:
+            return
+        self._ranking_moods[ranking][mood_rating - 1] -= 1
+
+    def _add_to_histogram(self, entry: Entry, ordinal: int, sign: int):
+        """Add (sign=1) or take back (sign=-1) one entry in the date-range histogram"""
+        self._histogram.add(ordinal, entry.mood_rating - 1, sign)
+        if not entry.is_excluded_from_reports:
+            self._histogram.add(ordinal, _RANKING_BUCKET + entry.ranking - 1, sign)
+
+    def _add_to_trends(self, ordinal: int, mood_rating: int, sign: int):
+        """Add (sign=1) or take back (sign=-1) one entry's mood_rating in the trend accumulators"""
+        for (name, _), slot in zip(_TREND_BUCKETS, _trend_slots(ordinal)):
+            self._trend_sums[name][slot] += sign * mood_rating
+            self._trend_counts[name][slot] += sign
+
+    def _on_tag_added(self, entry: Entry, tag: str):
+        """Entry callback (and _index_entry): an indexed entry gained tag"""
+        ids = self._tag_index.get(tag)
+        if ids is None:
+            ids = self._tag_index[tag] = set()
+            insort(self._sorted_tags, tag)
+        elif entry.entry_id_str in ids:
+            return
+        else:
+            self._move_in_ranking(tag, len(ids), None)
+        ids.add(entry.entry_id_str)
+        self._move_in_ranking(tag, None, len(ids))
+        self._on_column_changed(entry)
+
+    def _on_tag_removed(self, entry: Entry, tag: str):
+        """Entry callback (and _unindex_entry): an indexed entry lost tag"""
+        ids = self._tag_index.get(tag)
+        if ids is None or entry.entry_id_str not in ids:
+            return
+        self._move_in_ranking(tag, len(ids), None)
+        ids.discard(entry.entry_id_str)
+        self._on_column_changed(entry)
+        if ids:
+            self._move_in_ranking(tag, None, len(ids))
+        else:
+            del self._tag_index[tag]
+            del self._sorted_tags[bisect_left(self._sorted_tags, tag)]
+
+    def _move_in_ranking(self, tag: str, old_count: Optional[int], new_count: Optional[int]):
+        """Keep _tag_ranking sorted as (-count, tag) when one tag's count changes"""
+        ranking = self._tag_ranking
+        if old_count is not None:
+            del ranking[bisect_left(ranking, (-old_count, tag))]
+        if new_count is not None:
+            insort(ranking, (-new_count, tag))
+
+    def _indexed_days(self, start: date, end: date):
+        """Yield (day ordinal, [entries]) for each resident day in start..end, oldest first"""
+        ordinals = self._date_ordinals
+        low = bisect_left(ordinals, start.toordinal())
+        high = bisect_right(ordinals, end.toordinal())
+        entries_dict = self.entries_dict
+        for ordinal in ordinals[low:high]:
+            yield ordinal, [entries_dict[i] for i in self._date_index[ordinal]]
+
+    def _missing_ranges(self, start: date, end: date) -> List[Tuple[date, date]]:
+        """The parts of start..end not covered by _resident_ranges"""
+        gaps = []
+        cursor = start
+        for resident_start, resident_end in self._resident_ranges:
+            if resident_end < cursor:
+                continue
+            if resident_start > end:
+                break
+            if resident_start > cursor:
+                gaps.append((cursor, resident_start - timedelta(days=1)))
+            if resident_end >= end:
+                return gaps
+            cursor = resident_end + timedelta(days=1)
+        gaps.append((cursor, end))
+        return gaps
+
+    def _mark_resident(self, start: date, end: date):
+        """Record start..end as loaded, merging with touching or overlapping ranges"""
+        merged = []
+        for resident_start, resident_end in sorted(self._resident_ranges + [(start, end)]):
+            if merged and (
+                resident_start <= merged[-1][1]
+                or resident_start - merged[-1][1] == timedelta(days=1)
+            ):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], resident_end))
+            else:
+                merged.append((resident_start, resident_end))
+        self._resident_ranges = merged
+
+    def _all_entry_dates(self) -> set:
+        """
+        Every distinct entry date. While only part of the journal is resident this asks the
+        database (one DISTINCT over the entry_date index) instead of hydrating everything.
+        """
+        dates = set(map(date.fromordinal, self._date_ordinals))
+        if self._db_loaded or self.load_window_days is None or not self.use_database:
+            return dates
+        app = self._get_app()
+        if app:
+            self._flush_pending_writes()
+            try:
+                with app.app_context():
+                    rows = db.session.query(MoodEntry.entry_date).distinct()
+                    dates.update(row[0] for row in rows)
+            except Exception as e:
+                print(f"Warning: Could not read entry dates from database: {e}")
+        return dates
+
+    def _unloaded_db_app(self):
+        """
+        The Flask app to answer a query from SQL with, when the journal isn't fully resident
+        (so the in-memory entries can't answer it alone). None means use memory.
+        """
+        if self._db_loaded or not self.use_database:
+            return None
+        app = self._get_app()
+        if app:
+            self._flush_pending_writes()
+        return app
+
+    @staticmethod
+    def _save_op(entry: Entry) -> tuple:
+        return ("save", (MoodEntry.columns_from_entry(entry), list(entry.tags)))
 
     def _save_entry_to_db(self, entry: Entry):
-        """Save to database only if enabled"""
+        """Save to database only if enabled (queued instead when write-behind is on)"""
         if not self.use_database:
             return
 
+        op = self._save_op(entry)
+        if self._writer is not None:
+            self._writer.put(op)
+            return
+
         app = self._get_app()
         if app:
             try:
                 with app.app_context():
-                    existing = MoodEntry.query.filter_by(
-                        entry_id_str=entry.entry_id_str
-                    ).first()
-
-                    if existing:
-                        # Update existing
-                        existing.entry_name = entry.entry_name
-                        existing.entry_date = entry.entry_date
-                        existing.ranking = entry.ranking
-                        existing.mood_rating = entry.mood_rating
-                        existing.difficulty_ranking = getattr(
-                            entry, "difficulty_ranking", 3
-                        )
-                        existing.entry_body = entry.entry_body
-                        existing.tags_raw = (
-                            ",".join(entry.tags)
-                            if getattr(entry, "tags", None)
-                            else None
-                        )
-                        existing.biometrics_raw = (
-                            json.dumps(entry.biometrics)
-                            if getattr(entry, "biometrics", None)
-                            else None
-                        )
-                        existing.is_private = getattr(entry, "is_private", False)
-                        if hasattr(existing, "is_excluded_from_reports"):
-                            existing.is_excluded_from_reports = getattr(
-                                entry, "is_excluded_from_reports", False
-                            )
-                    else:
-                        # Create new
-                        db_entry = MoodEntry.from_entry(entry)
-                        if hasattr(db_entry, "is_excluded_from_reports"):
-                            db_entry.is_excluded_from_reports = getattr(
-                                entry, "is_excluded_from_reports", False
-                            )
-                        db.session.add(db_entry)
-
-                    db.session.commit()
+                    self._apply_writes([op])
             except Exception as e:
                 print(f"Warning: Could not save to database: {e}")
 
+    def _save_entries_to_db(self, entries: List[Entry]):
+        """Upsert many entries with a single executemany in one transaction"""
+        if not self.use_database or not entries:
+            return
+
+        app = self._get_app()
+        if app:
+            self._flush_pending_writes()
+            try:
+                with app.app_context():
+                    self._apply_writes([self._save_op(e) for e in entries])
+            except Exception as e:
+                print(f"Warning: Could not save entries to database: {e}")
+
     def _delete_entry_from_db(self, entry_id_str: str):
-        """Delete from database only if enabled"""
+        """Delete from database only if enabled (queued instead when write-behind is on)"""
         if not self.use_database:
             return
 
+        op = ("delete", entry_id_str)
+        if self._writer is not None:
+            self._writer.put(op)
+            return
+
         app = self._get_app()
         if app:
             try:
                 with app.app_context():
-                    entry = MoodEntry.query.filter_by(
-                        entry_id_str=entry_id_str
-                    ).first()
-                    if entry:
-                        db.session.delete(entry)
-                        db.session.commit()
+                    self._apply_writes([op])
             except Exception as e:
                 print(f"Warning: Could not delete from database: {e}")
 
+    def _apply_writes(self, ops: List[tuple]):
+        """
+        Apply ("save", (columns, tags)) / ("delete", entry_id_str) operations in order and
+        commit once. Runs of consecutive saves become one upsert, runs of deletes one DELETE ... IN.
+        Needs an app context; raises (after rolling back) if the commit fails.
+        """
+        try:
+            run_kind, run = None, []
+            for kind, payload in ops + [(None, None)]:
+                if kind != run_kind and run:
+                    if run_kind == "save":
+                        self._upsert_rows([columns for columns, _ in run])
+                        self._replace_tags(
+                            [(columns["entry_id_str"], tags) for columns, tags in run]
+                        )
+                    else:
+                        for chunk in _chunks(run):
+                            db.session.execute(
+                                delete(EntryTag).where(EntryTag.entry_id.in_(chunk))
+                            )
+                            db.session.execute(
+                                delete(MoodEntry).where(MoodEntry.entry_id_str.in_(chunk))
+                            )
+                    run = []
+                run_kind = kind
+                run.append(payload)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _upsert_rows(self, rows: List[dict]):
+        """
+        INSERT ... ON CONFLICT(entry_id_str) DO UPDATE through SQLAlchemy Core: one statement
+        (executemany for several rows) instead of a SELECT plus ORM change tracking per save.
+        created_at keeps the value from the first insert.
+        """
+        stmt = sqlite_insert(MoodEntry.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MoodEntry.entry_id_str],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0]
+                if column != "entry_id_str"
+            },
+        )
+        db.session.execute(stmt, rows)
+
+    def _replace_tags(self, tags_by_entry: List[Tuple[str, List[str]]]):
+        """Rewrite the entry_tags rows of the given entries (in written order, so reloads keep it)"""
+        for chunk in _chunks(tags_by_entry):
+            db.session.execute(
+                delete(EntryTag).where(EntryTag.entry_id.in_([i for i, _ in chunk]))
+            )
+            rows = [{"entry_id": i, "tag": t} for i, tags in chunk for t in tags]
+            if rows:
+                db.session.execute(sqlite_insert(EntryTag.__table__).on_conflict_do_nothing(), rows)
+
+    def _write_queued_batch(self, ops: List[tuple]):
+        """Runs on the write-behind thread: one app context and one commit per group"""
+        app = self._get_app()
+        if not app:
+            raise RuntimeError("no Flask app available for the write-behind queue")
+        with app.app_context():
+            self._apply_writes(ops)
+
+    def _flush_pending_writes(self):
+        """Make the database catch up with memory before reading from it"""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def mj_flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Barrier for write-behind mode: returns once every queued write has been committed
+        (True), or False if timeout ran out first. Always True when write-behind is off.
+        """
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def mj_close(self):
+        """
+        Flush any queued writes and stop the write-behind and similar-entry threads. The
+        journal keeps working afterwards, writing synchronously.
+
+        The startup snapshot isn't refreshed here: entries_dict may miss writes made by other
+        processes or hold entries whose database write failed. The next start that finds the
+        snapshot out of date writes a new one from the rows it loads.
+        """
+        if self._writer is not None:
+            writer = self._writer
+            self._writer = None
+            writer.close()
+        self._similar_cache.close()
+
+    def mj_write_stats(self) -> Dict[str, int]:
+        """
+        Durability counters for write-behind mode: { "pending" : int, "flushed" : int, "failed" : int }
+        """
+        if self._writer is None:
+            return {"pending": 0, "flushed": 0, "failed": 0}
+        return self._writer.stats()
+
     def _to_date(self, d) -> date:
         """
         Normalize various date shapes to datetime.date.
@@ -193,7 +847,8 @@ class Mood_Journal:
         """
         Create an entry and update the streaks. Returns the new entry's id.
         """
-        entry_id = self.mj_create_entry(
+        # mj_create_entry already brings the streak up to date
+        return self.mj_create_entry(
             entry_name,
             entry_day,
             entry_month,
@@ -205,9 +860,6 @@ class Mood_Journal:
             tags,
             biometrics,
         )
-        new_entry = self.mj_get_entry(entry_id)
-        self.update_streak(new_entry.entry_date)
-        return entry_id
 
     def mj_create_entry(
         self,
@@ -222,6 +874,8 @@ class Mood_Journal:
         tags=None,
         biometrics=None,
     ):
+        # Checked up front: the indexes below assume in-range values
+        validate_entry_fields(entry_name, ranking, mood_rating, difficulty_ranking, biometrics)
         new_entry = Entry(
             entry_name,
             entry_day,
@@ -236,11 +890,108 @@ class Mood_Journal:
         )
         new_entry_id = new_entry.entry_id_str
         self.entries_dict[new_entry_id] = new_entry
+        self._index_entry(new_entry)
         self._save_entry_to_db(new_entry)
 
         self.recompute_streak()
         return new_entry_id
 
+    def mj_bulk_create(self, entries_iterable) -> Dict[str, list]:
+        """
+        Create many entries at once. Every valid row is written with one bulk insert in a single
+        transaction, and the streak is recomputed once at the end instead of once per entry.
+        Invalid rows are skipped and reported; they don't abort the rest of the batch.
+
+        Returns a dictionary of the form:
+            { "created" : [new_entry_id (str), ...],
+              "failed"  : [(row_index (int), reason (str)), ...] }
+
+        Parameters -------------------------
+        - entries_iterable : iterable   // Rows holding mj_create_entry's arguments, either as a dict
+                                           keyed by parameter name or as a positional sequence
+        """
+        new_entries: List[Entry] = []
+        failed: List[Tuple[int, str]] = []
+
+        for index, row in enumerate(entries_iterable):
+            try:
+                if isinstance(row, Mapping):
+                    new_entry = Entry(**row)
+                    biometrics = row.get("biometrics")
+                else:
+                    new_entry = Entry(*row)
+                    biometrics = row[9] if len(row) > 9 else None
+                validate_entry_fields(
+                    new_entry.entry_name,
+                    new_entry.ranking,
+                    new_entry.mood_rating,
+                    new_entry.difficulty_ranking,
+                    biometrics,
+                )
+            except (TypeError, ValueError, AttributeError) as e:
+                failed.append((index, str(e)))
+                continue
+            new_entries.append(new_entry)
+
+        for new_entry in new_entries:
+            self.entries_dict[new_entry.entry_id_str] = new_entry
+            self._index_entry(new_entry)
+        self._save_entries_to_db(new_entries)
+
+        if new_entries:
+            self.recompute_streak()
+        return {
+            "created": [e.entry_id_str for e in new_entries],
+            "failed": failed,
+        }
+
+    def mj_import_entries(self, entries: List[Entry]) -> List[str]:
+        """
+        Write already-validated entries in one transaction, skipping any whose entry_id_str
+        is already in the journal (or repeated within the batch). Unlike mj_bulk_create this
+        doesn't pull the whole journal into memory: entries only join entries_dict when their
+        date is already resident, the rest are read on demand like any other stored entry.
+        The streak isn't touched; call mj_refresh_streak once the import is done.
+        Raises if the database write fails, so the caller knows the batch wasn't committed.
+
+        Returns the ids that were written.
+
+        Parameters -------------------------
+        - entries : list[Entry]     // Entries to add, keeping their entry_id_str
+        """
+        unique: Dict[str, Entry] = {}
+        for entry in entries:
+            if entry.entry_id_str not in self.entries_dict:
+                unique.setdefault(entry.entry_id_str, entry)
+
+        app = self._get_app() if self.use_database else None
+        if app:
+            self._flush_pending_writes()
+            with app.app_context():
+                ids = list(unique)
+                for chunk in _chunks(ids):
+                    stored = db.session.query(MoodEntry.entry_id_str).filter(
+                        MoodEntry.entry_id_str.in_(chunk)
+                    )
+                    for (entry_id,) in stored:
+                        del unique[entry_id]
+                if unique:
+                    self._apply_writes([self._save_op(e) for e in unique.values()])
+
+        for entry in unique.values():
+            if not app or self._db_loaded or not self._missing_ranges(entry.entry_date, entry.entry_date):
+                self.entries_dict[entry.entry_id_str] = entry
+                self._index_entry(entry)
+        return list(unique)
+
+    def mj_refresh_streak(self):
+        """
+        Recompute the streak after entries were added behind the journal's back (e.g. an import).
+        A journal that hasn't loaded anything yet is left alone: loading computes it anyway.
+        """
+        if self._db_loaded or self._resident_ranges or not self.use_database:
+            self.recompute_streak()
+
     def mj_edit_entry(
         self,
         entry_id_str: str,
@@ -253,7 +1004,10 @@ class Mood_Journal:
         new_mood_rating: int,
         new_difficulty_ranking: int,
     ):
-        entry = self.entries_dict[entry_id_str]
+        entry = self.mj_get_entry(entry_id_str)
+        if not entry:
+            raise KeyError(entry_id_str)
+        validate_entry_fields(new_name, new_ranking, new_mood_rating, new_difficulty_ranking)
         entry.edit_entry(
             new_name,
             new_day,
@@ -266,6 +1020,7 @@ class Mood_Journal:
         )
         # Update database if enabled
         self._save_entry_to_db(entry)
+        self.recompute_streak()
 
     def mj_delete_entry(self, entry_id_str: str):
         # I imagine this would search for an entry's unique id and remove it from the database.
@@ -278,11 +1033,12 @@ class Mood_Journal:
         # In the meantime: use the del statement to delete the entry of the given entry_id from
         # self.entries_dict // example of formatting: del my_dict[id]
 
-        if entry_id_str in self.entries_dict:
+        if self.mj_get_entry(entry_id_str):
             # Delete from database if enabled
             self._delete_entry_from_db(entry_id_str)
             # Delete from memory
-            del self.entries_dict[entry_id_str]
+            self._unindex_entry(self.entries_dict.pop(entry_id_str))
+            self._deferred_ids.pop(entry_id_str, None)
             self.recompute_streak()
             return True
         return False
@@ -298,10 +1054,37 @@ class Mood_Journal:
         if entry_id_str in self.entries_dict:
             return self.entries_dict[entry_id_str]
 
-        # If not found, try loading from database
-        self._ensure_db_loaded()
+        # If not found, try loading from database (just this row when loading is windowed)
+        if self.load_window_days is None:
+            self._ensure_db_loaded()
+        elif not self._db_loaded:
+            self._load_entry_by_id(entry_id_str)
         return self.entries_dict.get(entry_id_str, False)
 
+    def mj_get_entries(self, entry_ids: List[str]) -> List[Entry]:
+        """
+        Returns the Entry objects of the given ids that exist, in the same order; entries that
+        aren't resident yet are loaded together (one query per chunk of ids in windowed mode).
+
+        Parameters -------------------------
+        - entry_ids : list[str]     // The ids of the Entry objects to look up
+        """
+        missing = [i for i in entry_ids if i not in self.entries_dict]
+        if missing:
+            if self.load_window_days is None:
+                self._ensure_db_loaded()
+            elif not self._db_loaded and self.use_database:
+                app = self._get_app()
+                if app:
+                    self._flush_pending_writes()
+                    try:
+                        with app.app_context():
+                            self._load_entries_by_ids(missing)
+                    except Exception as e:
+                        print(f"Warning: Could not load from database: {e}")
+        entries_dict = self.entries_dict
+        return [entries_dict[i] for i in entry_ids if i in entries_dict]
+
     def mj_get_entry_privacy_status(self, entry_id_str: str):
         """
         Returns the privacy status of an Entry of entry_id_str if such an entry exists.
@@ -310,7 +1093,6 @@ class Mood_Journal:
         Parameters -------------------------
         - entry_id_str : str        // The id of the Entry object the user wishes to search for
         """
-        self._ensure_db_loaded()
         if self.mj_get_entry(entry_id_str) == False:
             return None  # No such entry exists
         else:
@@ -325,20 +1107,50 @@ class Mood_Journal:
         Toggle whether an entry should be excluded from weekly/monthly reports.
         Returns True if the entry was found and updated, False otherwise.
         """
-        self._ensure_db_loaded()
-        entry = self.entries_dict.get(entry_id_str)
+        entry = self.mj_get_entry(entry_id_str)
         if not entry:
             return False
         entry.set_excluded_from_reports(excluded)
         self._save_entry_to_db(entry)
         return True
 
+    def mj_add_tag(self, entry_id_str: str, tag: str) -> bool:
+        """
+        Adds a tag to an entry and saves it. Returns True if the tag was added,
+        False if the entry doesn't exist or the tag is blank/already there.
+        """
+        entry = self.mj_get_entry(entry_id_str)
+        if not entry or not entry.add_tag(tag):
+            return False
+        self._save_entry_to_db(entry)
+        return True
+
+    def mj_remove_tag(self, entry_id_str: str, tag: str) -> bool:
+        """
+        Removes a tag from an entry and saves it. Returns True if the tag was removed.
+        """
+        entry = self.mj_get_entry(entry_id_str)
+        if not entry or not entry.remove_tag(tag):
+            return False
+        self._save_entry_to_db(entry)
+        return True
+
+    def mj_clear_tags(self, entry_id_str: str) -> bool:
+        """
+        Removes every tag from an entry and saves it. Returns False if the entry doesn't exist.
+        """
+        entry = self.mj_get_entry(entry_id_str)
+        if not entry:
+            return False
+        entry.clear_tags()
+        self._save_entry_to_db(entry)
+        return True
+
     def mj_is_entry_excluded_from_reports(self, entry_id_str: str):
         """
         Returns True/False if the entry exists, or None if it doesn't.
         """
-        self._ensure_db_loaded()
-        entry = self.entries_dict.get(entry_id_str)
+        entry = self.mj_get_entry(entry_id_str)
         if not entry:
             return None
         return entry.is_excluded_from_reports_check()
@@ -352,17 +1164,22 @@ class Mood_Journal:
 
     def recompute_streak(self):
         """
-        Recompute current/longest streak from all entries.
+        Recompute current/longest streak from all entries. Once the whole journal is resident
+        this is O(1): the date index keeps _streak_runs up to date on every write.
         """
-        entries = self.mj_get_all_entries()
+        if self.load_window_days is None:
+            self._ensure_db_loaded()
+        if self._streak_is_indexed():
+            self._sync_streak()
+            return
+        # Part of the journal isn't resident: get unqiue entry dates (from the database too)
+        dates = sorted(self._all_entry_dates())
 
-        if not entries:
+        if not dates:
             self.streak_current = 0
             self.streak_longest = 0
             self.last_entry_date = None
             return
-        # get unqiue entry dates
-        dates = sorted({e.entry_date for e in entries})
         self.last_entry_date = dates[-1]
 
         # Longest streak
@@ -385,8 +1202,26 @@ class Mood_Journal:
         self.streak_current = current
         self.streak_longest = longest
 
+    def _streak_is_indexed(self) -> bool:
+        """True when the date index holds every entry date, so _streak_runs is the whole story"""
+        return self._db_loaded or not self.use_database or self.load_window_days is None
+
+    def _sync_streak(self):
+        """Copy the streak out of _streak_runs (O(1) amortized)"""
+        if not self._streak_is_indexed():
+            return
+        latest = self._streak_runs.latest()
+        if latest is None:
+            self.streak_current = 0
+            self.streak_longest = 0
+            self.last_entry_date = None
+            return
+        self.streak_current, last_ordinal = latest
+        self.streak_longest = self._streak_runs.longest()
+        self.last_entry_date = date.fromordinal(last_ordinal)
+
     def get_streak_summary(self):
-        self._ensure_db_loaded()
+        self._ensure_initial_load()
         return {
             "current_streak": self.streak_current,
             "longest_streak": self.streak_longest,
@@ -394,7 +1229,10 @@ class Mood_Journal:
         }
 
     def update_streak(self, entry_date: date):
-        "Used by log entry to update streak when entry is added for that day"
+        """
+        Advance the streak for a new entry on entry_date. The journal keeps its streak up to date
+        on every write by itself; this remains for callers tracking a streak by hand.
+        """
         if self.last_entry_date is None:
             self.last_entry_date = entry_date
             self.streak_current = 1
@@ -417,114 +1255,115 @@ class Mood_Journal:
         self.recompute_streak()
 
     def mj_weekly_report(self, curr_day, curr_month, curr_year):
-        self._ensure_db_loaded()
+        """
+        Returns how many entries of each ranking (index = ranking - 1) fall in the 7 days
+        ending on the given date, skipping excluded entries; None if there are none.
+        """
         curr_date = date(curr_year, curr_month, curr_day)
-        weekly_dates = []
-
-        for i in range(7):
-            weekly_dates.append(curr_date - timedelta(days=i))
-
-        entries_to_report = []
-
-        for i in self.entries_dict.keys():
-            entry = self.entries_dict[i]
-            # Skip entries the user has chosen to exclude
-            if getattr(entry, "is_excluded_from_reports", False):
-                continue
-            for d in weekly_dates:
-                if entry.entry_date == d:
-                    entries_to_report.append(i)
-
-        emoji_count = [0, 0, 0, 0, 0, 0, 0, 0]
-
-        if len(entries_to_report) == 0:
-            return None
-        else:
-            for i in entries_to_report:
-                emoji_count[self.entries_dict[i].ranking - 1] += 1
-            return emoji_count
+        return self._ranking_counts(curr_date - timedelta(days=6), curr_date)
 
     def mj_monthly_report(self, curr_day, curr_month, curr_year):
-        self._ensure_db_loaded()
+        """
+        Same as mj_weekly_report, over the 30 days ending on the given date.
+        """
         curr_date = date(curr_year, curr_month, curr_day)
-        monthly_dates = []
+        return self._ranking_counts(curr_date - timedelta(days=29), curr_date)
 
-        for i in range(30):
-            monthly_dates.append(curr_date - timedelta(days=i))
+    def mj_range_report(self, start: date, end: date):
+        """
+        Same as mj_weekly_report, over any range of days.
 
-        entries_to_report = []
+        Parameters -------------------------
+        - start : date      // First day of the report
+        - end : date        // Last day of the report (inclusive)
+        """
+        return self._ranking_counts(start, end)
 
-        for i in self.entries_dict.keys():
-            entry = self.entries_dict[i]
-            # Skip entries the user has chosen to exclude
-            if getattr(entry, "is_excluded_from_reports", False):
-                continue
-            for d in monthly_dates:
-                if entry.entry_date == d:
-                    entries_to_report.append(i)
+    def _ranking_counts(self, start: date, end: date):
+        """
+        8-slot ranking histogram of the non-excluded entries dated start..end (inclusive),
+        or None when there are none. When the range isn't resident it is counted by SQLite
+        (GROUP BY ranking over the entry_date index) instead of loading the entries.
+        """
+        app = self._unloaded_db_app()
+        if app and self._missing_ranges(start, end):
+            try:
+                with app.app_context():
+                    rows = (
+                        db.session.query(MoodEntry.ranking, func.count())
+                        .filter(
+                            MoodEntry.entry_date.between(start, end),
+                            func.coalesce(MoodEntry.is_excluded_from_reports, False).is_(False),
+                            MoodEntry.ranking.between(1, 8),
+                        )
+                        .group_by(MoodEntry.ranking)
+                    )
+                    emoji_count = [0] * 8
+                    for ranking, count in rows:
+                        emoji_count[ranking - 1] = count
+                return emoji_count if any(emoji_count) else None
+            except Exception as e:
+                print(f"Warning: Could not build report from database: {e}")
 
-        emoji_count = [0, 0, 0, 0, 0, 0, 0, 0]
+        # Excluded entries are left out of the histogram's ranking buckets
+        emoji_count = self._range_counts(start, end)[_RANKING_BUCKET:]
+        return emoji_count if any(emoji_count) else None
 
-        if len(entries_to_report) == 0:
-            return None
-        else:
-            for i in entries_to_report:
-                emoji_count[self.entries_dict[i].ranking - 1] += 1
-            return emoji_count
+    def _range_counts(self, start: date, end: date) -> List[int]:
+        """
+        _HISTOGRAM_BUCKETS counts over the entries dated start..end (inclusive): one per
+        mood_rating, then one per ranking of the entries not excluded from reports.
+        """
+        self._ensure_range_loaded(start, end)
+        return self._histogram.counts(start.toordinal(), end.toordinal())
 
     def mj_entries_on(self, year: int, month: int, day: int) -> List[Entry]:
         """
         UI selects a date → return entries for that date
         """
-        self._ensure_db_loaded()
         target = date(year, month, day)
-        items = [
-            e for e in self.entries_dict.values() if self._entry_date(e) == target
-        ]
-
-        items.sort(
-            key=lambda e: (
-                getattr(
-                    e,
-                    "created_at",
-                    datetime.combine(self._entry_date(e), datetime.min.time()),
-                ),
-                getattr(e, "entry_name", ""),
-                getattr(e, "entry_id_str", ""),
-            )
-        )
+        self._ensure_range_loaded(target, target)
+        bucket = self._date_index.get(target.toordinal(), {})
+        items = [self.entries_dict[i] for i in bucket]
+        items.sort(key=self._calendar_key)
         return items
 
     def mj_entries_between(self, start: date, end: date) -> List[Entry]:
         """
         Return all entries where start <= entry_date <= end, sorted by date then created_at.
         """
-        self._ensure_db_loaded()
+        self._ensure_range_loaded(start, end)
         items = []
-        for e in self.entries_dict.values():
-            d = self._entry_date(e)
-            if start <= d <= end:
-                items.append(e)
-        items.sort(
-            key=lambda e: (
-                self._entry_date(e),
-                getattr(
-                    e,
-                    "created_at",
-                    datetime.combine(self._entry_date(e), datetime.min.time()),
-                ),
-                getattr(e, "entry_id_str", ""),
-            )
-        )
+        # Days come out of the index in order, so only each day's entries need sorting
+        for _, day_entries in self._indexed_days(start, end):
+            day_entries.sort(key=self._between_key)
+            items.extend(day_entries)
         return items
 
+    @staticmethod
+    def _between_key(e: Entry):
+        """mj_entries_between's order within one day: created_at (midnight if unknown), then id"""
+        return (
+            getattr(e, "created_at", None) or datetime.combine(e.entry_date, datetime.min.time()),
+            e.entry_id_str,
+        )
+
+    @staticmethod
+    def _calendar_key(e: Entry):
+        """Order of a calendar day's entries: created_at (midnight if unknown), name, id"""
+        return (
+            getattr(e, "created_at", None) or datetime.combine(e.entry_date, datetime.min.time()),
+            e.entry_name,
+            e.entry_id_str,
+        )
+
     def mj_entries_grouped_by_day(
         self, start: date, end: date
     ) -> Dict[date, List[Entry]]:
         """
         Calendar-friendly structure: {date: [entries...]}, including empty days in range.
         """
-        self._ensure_db_loaded()
+        self._ensure_range_loaded(start, end)
         # all days start with empty lists so the UI can render blanks for no-entry dates
         days: Dict[date, List[Entry]] = {}
         cur = start
@@ -532,30 +1371,15 @@ class Mood_Journal:
             days[cur] = []
             cur += timedelta(days=1)
 
-        for e in self.entries_dict.values():
-            d = self._entry_date(e)
-            if start <= d <= end:
-                days[d].append(e)
-
-        for d, lst in days.items():
-            lst.sort(
-                key=lambda e: (
-                    getattr(
-                        e,
-                        "created_at",
-                        datetime.combine(self._entry_date(e), datetime.min.time()),
-                    ),
-                    getattr(e, "entry_name", ""),
-                    getattr(e, "entry_id_str", ""),
-                )
-            )
+        for ordinal, day_entries in self._indexed_days(start, end):
+            day_entries.sort(key=self._calendar_key)
+            days[date.fromordinal(ordinal)] = day_entries
         return days
 
     def mj_month_calendar(self, year: int, month: int) -> Dict[date, List[Entry]]:
         """
         give the whole visible month grid (from the calendar’s first weekday to last).
         """
-        self._ensure_db_loaded()
         # First of month
         first = date(year, month, 1)
         # Start on Monday (ISO) for backend; align with UI if it uses Sunday
@@ -588,12 +1412,10 @@ class Mood_Journal:
         - start_date : date         // The beginning of the time period the user wants to see their mood_ratings for
         - end_date : date           // The ending of the time period the user wants to see their mood_ratings for
         """
-        self._ensure_db_loaded()
-        entries_grouped_by_day = self.mj_entries_grouped_by_day(start_date, end_date)
-
         rating_graph_info = {}
 
         if type_of_graph == "line":
+            entries_grouped_by_day = self.mj_entries_grouped_by_day(start_date, end_date)
             for curr_day, list_of_entries in entries_grouped_by_day.items():
                 # Setting mood_ratings_avg to 0 (an invalid mood_rating value) by default; indicates no entries for the day
                 mood_ratings_avg = 0
@@ -607,79 +1429,99 @@ class Mood_Journal:
                 rating_graph_info[curr_day] = mood_ratings_avg
 
         elif type_of_graph == "bar":
-            # Initializing rating_graph_info to have a count for each rating (1 to 100)
-            for i in range(1, 101):
-                rating_graph_info[i] = 0
-
-            # Iterating through every day's entries, and incrementing the count for each encountered mood_rating accordingly
-            for curr_day, list_of_entries in entries_grouped_by_day.items():
-                for curr_entry in list_of_entries:
-                    curr_rating = curr_entry.mood_rating
-                    rating_graph_info[curr_rating] = (
-                        rating_graph_info[curr_rating] + 1
-                    )
+            # A count for each rating (1 to 100), straight from the date-range histogram
+            counts = self._range_counts(start_date, end_date)
+            for i in range(1, _MOOD_BUCKETS + 1):
+                rating_graph_info[i] = counts[i - 1]
 
         return rating_graph_info
 
     # Organize tags
     def mj_all_tags(self):
         """Returns sorted list of all unique tags"""
+        app = self._unloaded_db_app()
+        if app:
+            # Distinct tags straight off the entry_tags index, no entries hydrated
+            try:
+                with app.app_context():
+                    rows = db.session.query(EntryTag.tag).distinct().order_by(EntryTag.tag)
+                    return [row[0] for row in rows]
+            except Exception as e:
+                print(f"Warning: Could not read tags from database: {e}")
         self._ensure_db_loaded()
-        tag_set: set[str] = set()
-        for e in self.entries_dict.values():
-            # Entry.tags is already cleaned (lowercased, stripped) by Entry.add_tag
-            for t in getattr(e, "tags", []):
-                tag_set.add(t)
-        return sorted(tag_set)
+        return list(self._sorted_tags)
 
     def mj_entries_with_tag(self, tag):
         """Returns all entries with given tag sorted by date and name"""
-        self._ensure_db_loaded()
         items: list[Entry] = []
-        for e in self.entries_dict.values():
-            if e.has_tag(tag):
-                items.append(e)
-        items.sort(
-            key=lambda e: (
-                self._entry_date(e),
-                getattr(e, "entry_name", ""),
-                getattr(e, "entry_id_str", ""),
-            )
-        )
+        app = self._unloaded_db_app()
+        if app:
+            # Find the ids through the tag index and only hydrate those entries
+            try:
+                with app.app_context():
+                    rows = db.session.query(EntryTag.entry_id).filter(
+                        EntryTag.tag == tag.strip().lower()
+                    )
+                    entry_ids = [row[0] for row in rows]
+                    self._load_entries_by_ids(entry_ids)
+                items = [self.entries_dict[i] for i in entry_ids if i in self.entries_dict]
+            except Exception as e:
+                print(f"Warning: Could not read tags from database: {e}")
+                app = None
+        if not app:
+            self._ensure_db_loaded()
+            # Entry.tags is already cleaned (lowercased, stripped) by Entry.add_tag
+            entry_ids = self._tag_index.get(tag.strip().lower(), ())
+            items = [self.entries_dict[i] for i in entry_ids]
+        items.sort(key=lambda e: (e.entry_ordinal, e.entry_name, e.entry_id_str))
         return items
 
     def mj_tag_summary(self):
         """Returns a list of  pairs summarizing how often a tag is used"""
+        app = self._unloaded_db_app()
+        if app:
+            # GROUP BY over the entry_tags index, no entries hydrated
+            try:
+                with app.app_context():
+                    uses = func.count(EntryTag.entry_id)
+                    rows = (
+                        db.session.query(EntryTag.tag, uses)
+                        .group_by(EntryTag.tag)
+                        .order_by(uses.desc(), EntryTag.tag)
+                    )
+                    return [(tag, count) for tag, count in rows]
+            except Exception as e:
+                print(f"Warning: Could not read tags from database: {e}")
         self._ensure_db_loaded()
-        counts: dict[str, int] = {}
-        for e in self.entries_dict.values():
-            for t in getattr(e, "tags", []):
-                counts[t] = counts.get(t, 0) + 1
-
-        # Convert to sorted list of (tag, count)
-        return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [(tag, -negative_count) for negative_count, tag in self._tag_ranking]
 
     # takes into account ranking(emoji), mood rating(scale from 1-100)
     def mj_emoji_groups(self, emoji):
-        # creates a list with the keys of every entry that has a given emoji
+        # the mood_rating counts and the keys of every entry that has a given emoji,
+        # straight from the ranking index
         self._ensure_db_loaded()
-        keys = []
-        ratingCount = [0] * 100
-
-        for i in self.entries_dict.keys():
-            if self.entries_dict[i].ranking == emoji:
-                ratingCount[self.entries_dict[i].mood_rating - 1] += 1
-                keys.append(i)
-
+        ratingCount = list(self._ranking_moods.get(emoji, [0] * _MOOD_BUCKETS))
+        keys = list(self._ranking_index.get(emoji, ()))
         return ratingCount, keys
 
+    def mj_emoji_groups_all(self) -> Dict[int, Tuple[List[int], List[str]]]:
+        """
+        mj_emoji_groups for every ranking (1 to 8) at once: { ranking : (ratingCount, keys) }
+        """
+        return {ranking: self.mj_emoji_groups(ranking) for ranking in range(1, 9)}
+
     def mj_clear_all_data(self):
+        self._clear_indexes()
         self.entries_dict.clear()
+        self._deferred_ids.clear()
         if self.use_database:
             app = self._get_app()
             if app:
+                # Queued writes must land before the wipe, or they would bring entries back
+                self._flush_pending_writes()
                 try:
                     with app.app_context():
+                        EntryTag.query.delete()
                         MoodEntry.query.delete()
                         db.session.commit()
                 except Exception as e:
@@ -707,213 +1549,20 @@ class Mood_Journal:
         (None)
         """
         self._ensure_db_loaded()
-        mood_ratings_by_day_of_week = {
-            "Monday": [],
-            "Tuesday": [],
-            "Wednesday": [],
-            "Thursday": [],
-            "Friday": [],
-            "Saturday": [],
-            "Sunday": [],
-        }
-        mood_ratings_by_time_of_month = {
-            "First third": [],
-            "Second third": [],
-            "Last third": [],
-        }
-        mood_ratings_by_month_of_year = {
-            "January": [],
-            "February": [],
-            "March": [],
-            "April": [],
-            "May": [],
-            "June": [],
-            "July": [],
-            "August": [],
-            "September": [],
-            "October": [],
-            "November": [],
-            "December": [],
-        }
-
-        # Sorting all entries by day of the week // day of the month range (1-10, 11-20, 20-onward) // month of the year
-        for entry in self.entries_dict.values():
-            entry_day_of_week_num = entry.entry_date.weekday()  # 0 = Monday, ..., 6 = Sunday
-            entry_day_of_month = entry.entry_date.day
-            entry_month = entry.entry_date.month  # 1 = January, ..., 12 = December
-
-            match entry_day_of_week_num:
-                case 0:
-                    mood_ratings_by_day_of_week["Monday"].append(entry.mood_rating)
-                case 1:
-                    mood_ratings_by_day_of_week["Tuesday"].append(entry.mood_rating)
-                case 2:
-                    mood_ratings_by_day_of_week["Wednesday"].append(entry.mood_rating)
-                case 3:
-                    mood_ratings_by_day_of_week["Thursday"].append(entry.mood_rating)
-                case 4:
-                    mood_ratings_by_day_of_week["Friday"].append(entry.mood_rating)
-                case 5:
-                    mood_ratings_by_day_of_week["Saturday"].append(entry.mood_rating)
-                case 6:
-                    mood_ratings_by_day_of_week["Sunday"].append(entry.mood_rating)
-
-            if entry_day_of_month < 11:
-                mood_ratings_by_time_of_month["First third"].append(entry.mood_rating)
-            elif entry_day_of_month < 21:
-                mood_ratings_by_time_of_month["Second third"].append(
-                    entry.mood_rating
-                )
-            else:
-                mood_ratings_by_time_of_month["Last third"].append(entry.mood_rating)
-
-            match entry_month:
-                case 1:
-                    mood_ratings_by_month_of_year["January"].append(entry.mood_rating)
-                case 2:
-                    mood_ratings_by_month_of_year["February"].append(entry.mood_rating)
-                case 3:
-                    mood_ratings_by_month_of_year["March"].append(entry.mood_rating)
-                case 4:
-                    mood_ratings_by_month_of_year["April"].append(entry.mood_rating)
-                case 5:
-                    mood_ratings_by_month_of_year["May"].append(entry.mood_rating)
-                case 6:
-                    mood_ratings_by_month_of_year["June"].append(entry.mood_rating)
-                case 7:
-                    mood_ratings_by_month_of_year["July"].append(entry.mood_rating)
-                case 8:
-                    mood_ratings_by_month_of_year["August"].append(entry.mood_rating)
-                case 9:
-                    mood_ratings_by_month_of_year["September"].append(
-                        entry.mood_rating
-                    )
-                case 10:
-                    mood_ratings_by_month_of_year["October"].append(entry.mood_rating)
-                case 11:
-                    mood_ratings_by_month_of_year["November"].append(
-                        entry.mood_rating
-                    )
-                case 12:
-                    mood_ratings_by_month_of_year["December"].append(
-                        entry.mood_rating
-                    )
-
-        mood_rating_day_of_week_avgs = {
-            "Monday": 0,
-            "Tuesday": 0,
-            "Wednesday": 0,
-            "Thursday": 0,
-            "Friday": 0,
-            "Saturday": 0,
-            "Sunday": 0,
-        }
-        mood_ratings_time_of_month_avgs = {
-            "First third": 0,
-            "Second third": 0,
-            "Last third": 0,
-        }
-        mood_rating_month_of_year_avgs = {
-            "January": 0,
-            "February": 0,
-            "March": 0,
-            "April": 0,
-            "May": 0,
-            "June": 0,
-            "July": 0,
-            "August": 0,
-            "September": 0,
-            "October": 0,
-            "November": 0,
-            "December": 0,
-        }
-
-        # Calculating average mood rating for each day of the week
-        for day in mood_ratings_by_day_of_week.keys():
-            if len(mood_ratings_by_day_of_week[day]) != 0:
-                mood_rating_day_of_week_avgs[day] = (
-                    sum(mood_ratings_by_day_of_week[day])
-                    / len(mood_ratings_by_day_of_week[day])
-                )
-
-        # Calculating average mood rating for each day of the month range (1-10, 11-20, 20-onward)
-        for time_of_month in mood_ratings_by_time_of_month.keys():
-            if len(mood_ratings_by_time_of_month[time_of_month]) != 0:
-                mood_ratings_time_of_month_avgs[time_of_month] = (
-                    sum(mood_ratings_by_time_of_month[time_of_month])
-                    / len(mood_ratings_by_time_of_month[time_of_month])
-                )
-
-        # Calculating average mood rating for each month of the year
-        for month_of_year in mood_ratings_by_month_of_year.keys():
-            if len(mood_ratings_by_month_of_year[month_of_year]) != 0:
-                mood_rating_month_of_year_avgs[month_of_year] = (
-                    sum(mood_ratings_by_month_of_year[month_of_year])
-                    / len(mood_ratings_by_month_of_year[month_of_year])
-                )
-
-        # Finding highest (happiest) and lowest (saddest) mood rating for each category
-        happiest_day_of_week_avg = 0
-        saddest_day_of_week_avg = 999
-        happiest_day_of_week = ""
-        saddest_day_of_week = ""
-        for day, avg in mood_rating_day_of_week_avgs.items():
-            if len(mood_ratings_by_day_of_week[day]) > 0:
-                if avg > happiest_day_of_week_avg:
-                    happiest_day_of_week_avg = avg
-                    happiest_day_of_week = day
-                elif avg == happiest_day_of_week_avg:
-                    happiest_day_of_week += ", " + day
-
-                if avg < saddest_day_of_week_avg:
-                    saddest_day_of_week_avg = avg
-                    saddest_day_of_week = day
-                elif avg == saddest_day_of_week_avg:
-                    saddest_day_of_week += ", " + day
-
-        happiest_time_of_month_avg = 0
-        saddest_time_of_month_avg = 999
-        happiest_time_of_month = ""
-        saddest_time_of_month = ""
-        for time_of_month, avg in mood_ratings_time_of_month_avgs.items():
-            if len(mood_ratings_by_time_of_month[time_of_month]) > 0:
-                if avg > happiest_time_of_month_avg:
-                    happiest_time_of_month_avg = avg
-                    happiest_time_of_month = time_of_month
-                elif avg == happiest_time_of_month_avg:
-                    happiest_time_of_month = (
-                        happiest_time_of_month + ", " + time_of_month
-                    )
-
-                if avg < saddest_time_of_month_avg:
-                    saddest_time_of_month_avg = avg
-                    saddest_time_of_month = time_of_month
-                elif avg == saddest_time_of_month_avg:
-                    saddest_time_of_month = (
-                        saddest_time_of_month + ", " + time_of_month
-                    )
-
-        happiest_month_of_year_avg = 0
-        saddest_month_of_year_avg = 999
-        happiest_month_of_year = ""
-        saddest_month_of_year = ""
-        for month_of_year, avg in mood_rating_month_of_year_avgs.items():
-            if len(mood_ratings_by_month_of_year[month_of_year]) > 0:
-                if avg > happiest_month_of_year_avg:
-                    happiest_month_of_year_avg = avg
-                    happiest_month_of_year = month_of_year
-                elif avg == happiest_month_of_year_avg:
-                    happiest_month_of_year = (
-                        happiest_month_of_year + ", " + month_of_year
-                    )
-
-                if avg < saddest_month_of_year_avg:
-                    saddest_month_of_year_avg = avg
-                    saddest_month_of_year = month_of_year
-                elif avg == saddest_month_of_year_avg:
-                    saddest_month_of_year = (
-                        saddest_month_of_year + ", " + month_of_year
-                    )
+        # The date index keeps per-bucket sums and counts (see _add_to_trends), so this only
+        # compares 22 averages however big the journal is
+        (
+            (happiest_day_of_week, happiest_day_of_week_avg),
+            (saddest_day_of_week, saddest_day_of_week_avg),
+        ) = self._trend_extremes("day_of_week")
+        (
+            (happiest_time_of_month, happiest_time_of_month_avg),
+            (saddest_time_of_month, saddest_time_of_month_avg),
+        ) = self._trend_extremes("time_of_month")
+        (
+            (happiest_month_of_year, happiest_month_of_year_avg),
+            (saddest_month_of_year, saddest_month_of_year_avg),
+        ) = self._trend_extremes("month_of_year")
 
         mood_graph_trends = {
             "happiest_day_of_week": [
@@ -944,6 +1593,53 @@ class Mood_Journal:
 
         return mood_graph_trends
 
+    def mj_difficulty_by_weekday(self) -> List[Tuple[Optional[float], int]]:
+        """
+        Returns the average difficulty_ranking and the number of entries for each day of the
+        week, Monday first: [ (monday_avg (float, None if no entries), monday_count (int)), ... ]
+        """
+        self._ensure_db_loaded()
+        # One reduction over the column store instead of reading every Entry
+        sums, counts = self._columns.weekday_sums("difficulty_ranking")
+        return [
+            (total / count if count else None, count) for total, count in zip(sums, counts)
+        ]
+
+    def _trend_extremes(self, name: str):
+        """
+        ((happiest label(s), avg), (saddest label(s), avg)) over the buckets of name that have
+        entries. Tied buckets are joined with ", " in bucket order; with no entries at all the
+        result is (("", 0), ("", 999)).
+        """
+        labels = dict(_TREND_BUCKETS)[name]
+        sums, counts = self._trend_sums[name], self._trend_counts[name]
+        happiest_avg, saddest_avg = 0, 999
+        happiest, saddest = "", ""
+        for label, total, count in zip(labels, sums, counts):
+            if count > 0:
+                avg = total / count
+                if avg > happiest_avg:
+                    happiest_avg = avg
+                    happiest = label
+                elif avg == happiest_avg:
+                    happiest += ", " + label
+
+                if avg < saddest_avg:
+                    saddest_avg = avg
+                    saddest = label
+                elif avg == saddest_avg:
+                    saddest += ", " + label
+        return (happiest, happiest_avg), (saddest, saddest_avg)
+
+    def _deferred_body_matches(self, search: str) -> set:
+        """Ids of metadata-only entries whose stored body contains search (already lowercased)"""
+        matches = set()
+        if self._deferred_ids:
+            for entry_id, body in self._stored_bodies(list(self._deferred_ids)):
+                if search in body.lower():
+                    matches.add(entry_id)
+        return matches
+
     def mj_search_entries(self, search: str) -> List[Entry]:
         """
         Search entries for matching text in body, title, tags, or rating.
@@ -960,12 +1656,16 @@ class Mood_Journal:
         
         search = search.strip().lower()
         results = []
+        # Bodies that aren't resident are scanned straight from the database and dropped again
+        deferred_matches = self._deferred_body_matches(search)
         
         for entry in self.entries_dict.values():
             found = False
             
             # Search in entry body (case-insensitive)
-            if search in entry.entry_body.lower():
+            if entry.entry_id_str in deferred_matches:
+                found = True
+            elif entry.body_loaded and search in entry.entry_body.lower():
                 found = True
             
             # Search in entry name/title (case-insensitive)
@@ -1029,12 +1729,14 @@ class Mood_Journal:
         
         return results
     
-    def mj_find_similar_entries(self, entry_id_str: str, limit: int = 3) -> List[Tuple[Entry, float]]:
+    def mj_find_similar_entries(
+        self, entry_id_str: str, limit: int = 3, weights: Optional[Dict[str, float]] = None
+    ) -> List[Tuple[Entry, float]]:
         """
         Find the N most similar entries to a given entry.
         Returns a list of (entry, similarity_score) tuples sorted by similarity.
         
-        Similarity is calculated based on:
+        Similarity is calculated based on (default weights, see similarity.SIMILARITY_WEIGHTS):
         - Mood rating (0-100, 30% weight)
         - Ranking (1-8, 30% weight)
         - Difficulty ranking (1-5, 20% weight)
@@ -1044,83 +1746,25 @@ class Mood_Journal:
         Parameters -------------------------
         - entry_id_str : str        // The id of the entry to find similar entries for
         - limit : int              // Maximum number of similar entries to return
+        - weights : dict           // Optional overrides for the weights above (keys: mood, ranking, difficulty, tags, date)
         """
         self._ensure_db_loaded()
-        
-        # Get the target entry
-        target_entry = self.entries_dict.get(entry_id_str)
-        if not target_entry:
+        if entry_id_str not in self.entries_dict:
             return []
-        
-        # Normalize weights (sum to 1.0)
-        weights = {
-            'mood': 0.3,
-            'ranking': 0.3,
-            'difficulty': 0.2,
-            'tags': 0.1,
-            'date': 0.1
-        }
-        
-        # Calculate similarity for each other entry
-        similarities = []
-        target_date = self._to_date(target_entry.entry_date)
-        
-        for entry_id, entry in self.entries_dict.items():
-            # Skip the target entry itself
-            if entry_id == entry_id_str:
-                continue
-            
-            entry_date = self._to_date(entry.entry_date)
-            
-            # 1. Mood rating similarity (0-1)
-            mood_diff = abs(target_entry.mood_rating - entry.mood_rating)
-            mood_sim = 1.0 - (mood_diff / 100.0)
-            
-            # 2. Ranking similarity (0-1)
-            ranking_diff = abs(target_entry.ranking - entry.ranking)
-            ranking_sim = 1.0 - (ranking_diff / 7.0)  # 8 rankings, max diff = 7
-            
-            # 3. Difficulty similarity (0-1)
-            target_diff = getattr(target_entry, 'difficulty_ranking', 3)
-            entry_diff = getattr(entry, 'difficulty_ranking', 3)
-            # If difficulty ranking is not set (-999), use default of 3
-            if target_diff == -999:
-                target_diff = 3
-            if entry_diff == -999:
-                entry_diff = 3
-            
-            difficulty_diff = abs(target_diff - entry_diff)
-            difficulty_sim = 1.0 - (difficulty_diff / 4.0)  # 5 difficulty levels, max diff = 4
-            
-            # 4. Tag similarity (Jaccard index)
-            target_tags = set(getattr(target_entry, 'tags', []))
-            entry_tags = set(getattr(entry, 'tags', []))
-            
-            if target_tags or entry_tags:
-                intersection = len(target_tags.intersection(entry_tags))
-                union = len(target_tags.union(entry_tags))
-                tag_sim = intersection / union if union > 0 else 0.0
-            else:
-                tag_sim = 1.0  # Both have no tags = perfect match
-                
-            # 5. Date proximity similarity (0-1)
-            # Days difference capped at 365 (one year)
-            days_diff = abs((target_date - entry_date).days)
-            date_sim = 1.0 - min(days_diff / 365.0, 1.0)
-            
-            # Calculate weighted similarity score
-            total_similarity = (
-                mood_sim * weights['mood'] +
-                ranking_sim * weights['ranking'] +
-                difficulty_sim * weights['difficulty'] +
-                tag_sim * weights['tags'] +
-                date_sim * weights['date']
-            )
-            
-            similarities.append((entry, total_similarity))
-        
-        # Sort by similarity score (highest first) and return top N
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return the top N entries with their similarity scores
-        return similarities[:limit]
\ No newline at end of file
+        if weights is None and limit <= self._similar_cache.limit:
+            # Default weights: served from the neighbour cache
+            found = self._similar_cache.get(entry_id_str, limit)
+        else:
+            with self._similar_cache.lock:
+                found = self._search_similar(entry_id_str, limit, resolve_weights(weights))
+        return [(self.entries_dict[entry_id], score) for entry_id, score in found]
+
+    def _search_similar(
+        self, entry_id_str: str, limit: int, weights: Dict[str, float]
+    ) -> List[Tuple[str, float]]:
+        """Search the indexed entries for entry_id_str's neighbours (weights complete); hold the cache lock"""
+        if SimilarityIndex.worth_searching(self._columns, weights):
+            # Branch and bound over the similarity index: only the target's neighbourhood is scored
+            return self._similarity_index.top_similar(self._columns, entry_id_str, limit, weights)
+        # Scored over the column store in one pass (vectorized when NumPy is installed)
+        return top_similar(self._columns, entry_id_str, limit, weights)
\ No newline at end of file
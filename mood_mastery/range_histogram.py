@@ -0,0 +1,64 @@
+"""
+Date-range histograms for the mood journal.
+
+RangeHistogram is a Fenwick (binary indexed) tree over day ordinals whose nodes hold a
+whole row of bucket counts. Counting one entry into (or out of) a bucket touches
+O(log days) nodes, and the counts of every bucket over any [first, last] day range are
+two prefix sums, so graphs and reports over arbitrary ranges never walk the entries.
+
+Nodes are only allocated for the positions that have been touched, so covering every
+possible date costs nothing for the days a journal doesn't have.
+"""
+
+from array import array
+from datetime import date
+from operator import add, sub
+from typing import Dict, List
+
+# Day ordinals run from 1 (date.min) to this
+_LAST_ORDINAL = date.max.toordinal()
+
+
+class RangeHistogram:
+    def __init__(self, buckets: int):
+        self.buckets = buckets
+        self._empty = array("i", bytes(4 * buckets))
+        self._nodes: Dict[int, array] = {}  # Fenwick position -> bucket counts
+
+    def clear(self):
+        self._nodes.clear()
+
+    def add(self, ordinal: int, bucket: int, delta: int = 1):
+        """Count delta more (or fewer, if negative) items into bucket on day ordinal"""
+        nodes = self._nodes
+        position = ordinal
+        while position <= _LAST_ORDINAL:
+            node = nodes.get(position)
+            if node is None:
+                node = nodes[position] = array("i", self._empty)
+            node[bucket] += delta
+            position += position & -position
+
+    def _prefix(self, ordinal: int) -> List[int]:
+        """Bucket counts over days 1..ordinal"""
+        total = list(self._empty)
+        nodes = self._nodes
+        position = min(ordinal, _LAST_ORDINAL)
+        while position > 0:
+            node = nodes.get(position)
+            if node is not None:
+                total = list(map(add, total, node))
+            position &= position - 1
+        return total
+
+    def counts(self, first: int, last: int) -> List[int]:
+        """
+        Count of each bucket over the days first..last (inclusive)
+
+        Parameters -------------------------
+        - first : int       // Day ordinal the range starts on
+        - last : int        // Day ordinal the range ends on
+        """
+        if last < first:
+            return list(self._empty)
+        return list(map(sub, self._prefix(last), self._prefix(first - 1)))
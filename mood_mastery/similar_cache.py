@@ -0,0 +1,291 @@
+"""
+Precomputed similar entries for the mood journal.
+
+NeighbourCache keeps the `limit` most similar entries of each entry, scored with the
+default weights, so opening an entry reads its neighbours from a dict instead of searching
+the journal. The journal reports every change to an entry's scored fields with
+changed(entry id), and a cached list is only dropped when that change can alter it:
+
+    - the changed entry is the cached entry itself, or one of its neighbours
+    - the changed entry now beats the list's last neighbour (a higher score, or the same
+      score and added earlier, as similarity.top_similar breaks ties)
+
+Every other list is still exactly what a new search would return. To avoid scoring a
+changed entry against every cached one, cached entries are grouped by their (mood, ranking,
+difficulty) cell with the lowest last-neighbour score in the cell. A cell whose best
+possible score against the changed entry (similarity_index.axis_terms) is below that is
+skipped whole, and within a cell an entry is only scored if the exact date term still
+leaves it in reach.
+
+Writes only record the change. With start(), a background thread works through the
+recorded changes and then refills the dropped lists and fills the entries that were
+written; entries that were only loaded are left to get(), so a start-up load costs no
+searches. Until it gets to a change, get() checks the asked-for list against it directly.
+Without the thread, get() settles the recorded changes first and fills lists as they're
+asked for.
+
+lock also guards the column store's rows: the journal holds it while it changes them, and
+searches hold it while they read them.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mood_mastery.similarity import resolve_weights, row_scorer
+from mood_mastery.similarity_index import axis_terms, row_cell
+
+Neighbours = List[Tuple[str, float]]
+
+
+class NeighbourCache:
+    def __init__(
+        self,
+        store,
+        search: Callable[[str, int, Dict[str, float]], Neighbours],
+        limit: int = 3,
+        quiet_interval: float = 0.05,
+    ):
+        """
+        Parameters -------------------------
+        - store : ColumnStore           // The journal's column store
+        - search : callable             // search(entry id, limit, weights) -> [(entry id, score)], best first
+        - limit : int                   // Neighbours kept per entry; get() serves up to this many
+        - quiet_interval : float        // The background thread waits for writes to pause this long before working
+        """
+        self.lock = threading.RLock()
+        self.limit = limit
+        self.weights = resolve_weights(None)
+        self.quiet_interval = quiet_interval
+        self._store = store
+        self._search = search
+
+        self._generation = 0  # bumped by every changed()
+        # entry id -> (neighbours, cell, floor, generation): floor is the last neighbour as
+        # (score, -sequence), None while the list holds every other entry
+        self._cached: Dict[str, tuple] = {}
+        self._cited_by: Dict[str, Dict[str, None]] = {}  # entry id -> cached entries listing it
+        self._cells: Dict[Tuple[int, int, int], Dict[str, None]] = {}  # cell -> cached entries in it
+        # cell -> lowest floor score in it (may be lower than the live ones, never higher)
+        self._cell_floors: Dict[Tuple[int, int, int], float] = {}
+        self._pending: Dict[str, int] = {}  # changed entry id -> generation of its last change, oldest first
+        self._unfilled: Dict[str, None] = {}  # entries waiting for the background thread
+
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._cached)
+
+    def start(self):
+        """Start the background thread that settles changes and fills written entries' lists"""
+        with self.lock:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="mood-journal-neighbours", daemon=True
+            )
+            self._thread.start()
+            self._wake.set()
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop the background thread; lists are then settled and filled on get()"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        thread.join(timeout)
+        with self.lock:
+            self._thread = None
+            self._unfilled.clear()
+
+    def clear(self):
+        with self.lock:
+            self._cached.clear()
+            self._cited_by.clear()
+            self._cells.clear()
+            self._cell_floors.clear()
+            self._pending.clear()
+            self._unfilled.clear()
+
+    def changed(self, entry_id_str: str, written: bool = True):
+        """
+        An entry was added or removed, or one of its scored fields changed
+
+        Parameters -------------------------
+        - entry_id_str : str        // The entry's id
+        - written : bool            // False for an entry that was only loaded: the background
+                                       thread leaves its list to get()
+        """
+        with self.lock:
+            fill = written and self._thread is not None and entry_id_str in self._store
+            if fill:
+                self._unfilled.pop(entry_id_str, None)
+                self._unfilled[entry_id_str] = None  # most recent last
+            if not self._cached:
+                # Nothing to invalidate
+                if fill:
+                    self._wake.set()
+                return
+            self._generation += 1
+            self._pending.pop(entry_id_str, None)
+            self._pending[entry_id_str] = self._generation
+            if self._thread is not None:
+                self._wake.set()
+
+    def get(self, entry_id_str: str, limit: int) -> Neighbours:
+        """
+        The limit (at most self.limit) entries most similar to entry_id_str, as (entry id,
+        score), best first: what search would return with the default weights
+        """
+        if limit <= 0:
+            return []
+        with self.lock:
+            if self._thread is None:
+                self._settle(len(self._pending))
+            record = self._cached.get(entry_id_str)
+            if record is not None and self._pending and self._is_stale(entry_id_str, record):
+                self._drop(entry_id_str)
+                record = None
+            if record is None:
+                record = self._fill(entry_id_str)
+            return record[0][:limit]
+
+    def _fill(self, entry_id_str: str) -> tuple:
+        """Search for entry_id_str's neighbours and cache them"""
+        self._unfilled.pop(entry_id_str, None)
+        store = self._store
+        row = store.row_of(entry_id_str)
+        if row is None:
+            return [], None, None, self._generation
+        neighbours = self._search(entry_id_str, self.limit, self.weights)
+        floor = None
+        if len(neighbours) == self.limit:
+            last_id, last_score = neighbours[-1]
+            floor = (last_score, -store.sequence[store.row_of(last_id)])
+        cell = row_cell(store, row)
+        record = (neighbours, cell, floor, self._generation)
+        self._cached[entry_id_str] = record
+        for other_id, _ in neighbours:
+            self._cited_by.setdefault(other_id, {})[entry_id_str] = None
+        self._cells.setdefault(cell, {})[entry_id_str] = None
+        floor_score = floor[0] if floor else -math.inf
+        self._cell_floors[cell] = min(self._cell_floors.get(cell, floor_score), floor_score)
+        return record
+
+    def _drop(self, entry_id_str: str):
+        neighbours, cell, _, _ = self._cached.pop(entry_id_str)
+        for other_id, _ in neighbours:
+            cited = self._cited_by[other_id]
+            del cited[entry_id_str]
+            if not cited:
+                del self._cited_by[other_id]
+        ids = self._cells[cell]
+        del ids[entry_id_str]
+        if not ids:
+            del self._cells[cell]
+            del self._cell_floors[cell]
+        if self._thread is not None and entry_id_str in self._store:
+            self._unfilled[entry_id_str] = None
+
+    def _beats_floor(self, changed_id: str, entry_id_str: str, floor, score) -> bool:
+        """Whether changed_id (scored by score) now makes entry_id_str's list"""
+        store = self._store
+        row = store.row_of(entry_id_str)
+        if row is None:
+            return False  # removed since: its own recorded change drops the list
+        if floor is None:
+            return True
+        return (score(row), -store.sequence[store.row_of(changed_id)]) > floor
+
+    def _is_stale(self, entry_id_str: str, record: tuple) -> bool:
+        """Whether a change recorded after record was cached alters it"""
+        neighbours, _, floor, generation = record
+        for changed_id, changed_generation in reversed(self._pending.items()):
+            if changed_generation <= generation:
+                break
+            if changed_id == entry_id_str or any(changed_id == other for other, _ in neighbours):
+                return True
+            row = self._store.row_of(changed_id)
+            if row is not None and self._beats_floor(
+                changed_id, entry_id_str, floor, row_scorer(self._store, row, self.weights)
+            ):
+                return True
+        return False
+
+    def _settle(self, count: int):
+        """Apply up to count recorded changes, oldest first"""
+        pending = self._pending
+        for _ in range(min(count, len(pending))):
+            changed_id = next(iter(pending))
+            self._settle_change(changed_id, pending.pop(changed_id))
+
+    def _settle_change(self, changed_id: str, generation: int):
+        """Drop the lists cached before generation that changed_id's change can alter"""
+        cached = self._cached
+        if changed_id in cached and cached[changed_id][3] < generation:
+            self._drop(changed_id)
+        for entry_id in list(self._cited_by.get(changed_id, ())):
+            if cached[entry_id][3] < generation:
+                self._drop(entry_id)
+
+        store = self._store
+        row = store.row_of(changed_id)
+        if row is None:
+            return
+        if not self._cells:
+            return
+        score = row_scorer(store, row, self.weights)
+        moods, rankings, difficulties = axis_terms(row_cell(store, row), self.weights)
+        best_tags, best_date = 1.0 * self.weights["tags"], 1.0 * self.weights["date"]
+        w_date = self.weights["date"]
+        ordinals = store.columns["ordinal"]
+        ordinal = ordinals[row]
+        floors = self._cell_floors
+        # Bounds add the score's terms in its order, so rounding can't lift a score above them
+        for cell, ids in list(self._cells.items()):
+            cell_terms = moods[cell[0]] + rankings[cell[1]] + difficulties[cell[2]]
+            if cell_terms + best_tags + best_date < floors[cell]:
+                continue  # changed_id can't make any list in this cell
+            for entry_id in list(ids):
+                _, _, floor, cached_generation = cached[entry_id]
+                if cached_generation >= generation:
+                    continue
+                other = store.row_of(entry_id)
+                if floor is not None and other is not None:
+                    days = abs(ordinal - ordinals[other])
+                    date_term = (1.0 - min(days / 365.0, 1.0)) * w_date
+                    if cell_terms + best_tags + date_term < floor[0]:
+                        continue
+                if self._beats_floor(changed_id, entry_id, floor, score):
+                    self._drop(entry_id)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            # Let a burst of writes (a load, an import) finish before working through it
+            while True:
+                self._wake.clear()
+                if self._stopping:
+                    return
+                if not self._wake.wait(self.quiet_interval):
+                    break
+            # One change or one list per hold of the lock, so requests never wait long for it
+            while not self._stopping:
+                with self.lock:
+                    if self._pending:
+                        self._settle(1)
+                    elif self._unfilled:
+                        # Most recently added or changed first
+                        entry_id = next(reversed(self._unfilled))
+                        if entry_id in self._cached:
+                            del self._unfilled[entry_id]
+                        else:
+                            self._fill(entry_id)
+                    else:
+                        break
+                time.sleep(0)  # let waiting requests take the lock
@@ -0,0 +1,161 @@
+"""
+Similar-entry scoring over the journal's column store (see column_store.py).
+
+An entry's similarity to the target is a weighted sum of five terms, each 1.0 for a
+perfect match:
+
+    mood        1 - |mood_rating difference| / 100
+    ranking     1 - |ranking difference| / 7
+    difficulty  1 - |difficulty_ranking difference| / 4
+    tags        Jaccard index of the two tag sets (1.0 when neither has tags)
+    date        1 - min(days apart / 365, 1)
+
+With NumPy the terms are computed for every row at once (tag sets as bit vectors, counted
+with a popcount) and the top entries picked with argpartition; without it, a loop over the
+columns feeds heapq.nlargest. Both evaluate the same float expressions in the same order,
+and ties go to the entry added first, so they return exactly what the original per-Entry
+loop did.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from mood_mastery import column_store
+
+SIMILARITY_WEIGHTS = {
+    "mood": 0.3,
+    "ranking": 0.3,
+    "difficulty": 0.2,
+    "tags": 0.1,
+    "date": 0.1,
+}
+
+# Stand-in for a difficulty_ranking that was never set
+_UNSET_DIFFICULTY = -999
+_DEFAULT_DIFFICULTY = 3
+
+
+def top_similar(
+    store, entry_id_str: str, limit: int = 3, weights: Optional[Dict[str, float]] = None
+) -> List[Tuple[str, float]]:
+    """
+    The limit entries most similar to entry_id_str, as (entry id, score), best first
+
+    Parameters -------------------------
+    - store : ColumnStore       // The journal's column store
+    - entry_id_str : str        // The entry to compare every other entry against
+    - limit : int               // Maximum number of entries to return
+    - weights : dict            // Overrides for SIMILARITY_WEIGHTS (keys: mood, ranking, difficulty, tags, date)
+    """
+    row = store.row_of(entry_id_str)
+    if row is None:
+        return []
+    limit = min(limit, len(store) - 1)
+    if limit <= 0:
+        return []
+    weights = resolve_weights(weights)
+    if column_store.numpy is not None:
+        return _top_similar_numpy(store, row, limit, weights)
+    return _top_similar_loop(store, row, limit, weights)
+
+
+def resolve_weights(weights: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """SIMILARITY_WEIGHTS with the given overrides applied"""
+    return dict(SIMILARITY_WEIGHTS, **(weights or {}))
+
+
+def _top_similar_numpy(store, row: int, limit: int, weights: Dict[str, float]):
+    numpy = column_store.numpy
+    columns = {
+        name: values.astype(numpy.int64)
+        for name, values in store.numpy_columns(
+            "ordinal", "mood_rating", "ranking", "difficulty_ranking"
+        ).items()
+    }
+    difficulty = columns["difficulty_ranking"]
+    difficulty[difficulty == _UNSET_DIFFICULTY] = _DEFAULT_DIFFICULTY
+
+    mood_sim = 1.0 - numpy.abs(columns["mood_rating"] - columns["mood_rating"][row]) / 100.0
+    ranking_sim = 1.0 - numpy.abs(columns["ranking"] - columns["ranking"][row]) / 7.0
+    difficulty_sim = 1.0 - numpy.abs(difficulty - difficulty[row]) / 4.0
+
+    intersection = numpy.zeros(len(store), dtype=numpy.int64)
+    union = numpy.zeros(len(store), dtype=numpy.int64)
+    for word in store.tag_words:
+        word = numpy.array(word)
+        intersection += _popcount(word & word[row])
+        union += _popcount(word | word[row])
+    tag_sim = numpy.ones(len(store))
+    numpy.divide(intersection, union, out=tag_sim, where=union > 0)
+
+    days = numpy.abs(columns["ordinal"] - columns["ordinal"][row])
+    date_sim = 1.0 - numpy.minimum(days / 365.0, 1.0)
+
+    scores = (
+        mood_sim * weights["mood"]
+        + ranking_sim * weights["ranking"]
+        + difficulty_sim * weights["difficulty"]
+        + tag_sim * weights["tags"]
+        + date_sim * weights["date"]
+    )
+    scores[row] = -numpy.inf
+
+    # Everything scoring at least the limit-th best score, then best first, earliest added first
+    best = numpy.argpartition(-scores, limit - 1)[:limit]
+    candidates = numpy.flatnonzero(scores >= scores[best].min())
+    sequence = numpy.array(store.sequence)[candidates]
+    order = candidates[numpy.lexsort((sequence, -scores[candidates]))[:limit]]
+    return [(store.ids[i], float(scores[i])) for i in order]
+
+
+def _popcount(words):
+    """Set bits in each uint64 of words"""
+    numpy = column_store.numpy
+    if hasattr(numpy, "bitwise_count"):  # NumPy 2.0+
+        return numpy.bitwise_count(words).astype(numpy.int64)
+    bytes_per_word = words.view(numpy.uint8).reshape(len(words), 8)
+    return numpy.unpackbits(bytes_per_word, axis=1).sum(axis=1, dtype=numpy.int64)
+
+
+def row_scorer(store, row: int, weights: Dict[str, float]):
+    """
+    score(i): row i's similarity to row, computed exactly as the vectorized path does. Kept
+    for scoring a few rows at a time (the plain loop here, SimilarityIndex's candidates).
+    """
+    columns = store.columns
+    ordinals = columns["ordinal"]
+    moods = columns["mood_rating"]
+    rankings = columns["ranking"]
+    difficulties = columns["difficulty_ranking"]
+    w_mood, w_ranking, w_difficulty, w_tags, w_date = (
+        weights[name] for name in ("mood", "ranking", "difficulty", "tags", "date")
+    )
+    target_ordinal, target_mood, target_ranking = ordinals[row], moods[row], rankings[row]
+    target_difficulty = difficulty_value(difficulties[row])
+    target_tags = store.tag_mask(row)
+
+    def score(i: int) -> float:
+        tags = store.tag_mask(i)
+        union = bin(tags | target_tags).count("1")  # int.bit_count() needs Python 3.10
+        tag_sim = bin(tags & target_tags).count("1") / union if union else 1.0
+        return (
+            (1.0 - abs(target_mood - moods[i]) / 100.0) * w_mood
+            + (1.0 - abs(target_ranking - rankings[i]) / 7.0) * w_ranking
+            + (1.0 - abs(target_difficulty - difficulty_value(difficulties[i])) / 4.0) * w_difficulty
+            + tag_sim * w_tags
+            + (1.0 - min(abs(target_ordinal - ordinals[i]) / 365.0, 1.0)) * w_date
+        )
+
+    return score
+
+
+def difficulty_value(difficulty: int) -> int:
+    """difficulty_ranking as scored: an unset one counts as the default"""
+    return _DEFAULT_DIFFICULTY if difficulty == _UNSET_DIFFICULTY else difficulty
+
+
+def _top_similar_loop(store, row: int, limit: int, weights: Dict[str, float]):
+    score = row_scorer(store, row, weights)
+    sequence = store.sequence
+    scored = ((score(i), -sequence[i], i) for i in range(len(store)) if i != row)
+    return [(store.ids[i], score) for score, _, i in heapq.nlargest(limit, scored)]
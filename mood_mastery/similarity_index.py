@@ -0,0 +1,195 @@
+"""
+Exact nearest-neighbour index for similar-entry lookups.
+
+SimilarityIndex buckets the resident entries into cells by their exact (mood_rating,
+ranking, difficulty_ranking), and keeps the values in use along each of those three axes.
+For a target entry, each axis is sorted by its score term, best first; a cell's upper bound
+is the sum of its three terms plus full marks for tags and date. Cells are then generated
+best bound first (a heap over positions on the three sorted axes, as in merging sorted
+lists), their entries scored one by one (similarity.row_scorer), and the search stops at
+the first cell whose bound is below the current limit-th best score. A lookup therefore
+only scores the target's neighbourhood instead of the whole journal.
+
+Bounds and scores use the same float expressions, added in the same order, so the result
+is exactly what the full scan in similarity.top_similar returns (ties to the entry added
+first). Bounds only hold for non-negative weights, and a small journal is scanned faster
+with NumPy; callers use the full scan in those cases (see worth_searching).
+"""
+
+import heapq
+from typing import Dict, List, Tuple
+
+from mood_mastery import column_store
+from mood_mastery.similarity import difficulty_value, row_scorer
+
+# With NumPy, a full vectorized scan beats the index below about this many entries
+# (see benchmarks/bench_similarity_index.py)
+NUMPY_SCAN_ENTRIES = 40_000
+
+# Score term divisors per axis: mood_rating, ranking, difficulty_ranking (see similarity.py)
+_AXIS_SCALES = (100.0, 7.0, 4.0)
+_AXIS_WEIGHTS = ("mood", "ranking", "difficulty")
+
+
+def _cell_key(entry) -> Tuple[int, int, int]:
+    return entry.mood_rating, entry.ranking, difficulty_value(entry.difficulty_ranking)
+
+
+def row_cell(store, row: int) -> Tuple[int, int, int]:
+    """The cell of a column store row (same key as the entry's)"""
+    columns = store.columns
+    return (
+        columns["mood_rating"][row],
+        columns["ranking"][row],
+        difficulty_value(columns["difficulty_ranking"][row]),
+    )
+
+
+def _axis_term(axis: int, target_value: int, value: int, weights: Dict[str, float]) -> float:
+    """The score term of one axis, written exactly as similarity.row_scorer computes it"""
+    return (1.0 - abs(target_value - value) / _AXIS_SCALES[axis]) * weights[_AXIS_WEIGHTS[axis]]
+
+
+class _AxisTerms(dict):
+    """value -> score term of one axis against a target value, computed on first use"""
+
+    def __init__(self, axis: int, target_value: int, weights: Dict[str, float]):
+        super().__init__()
+        self._args = axis, target_value, weights
+
+    def __missing__(self, value: int) -> float:
+        axis, target_value, weights = self._args
+        term = self[value] = _axis_term(axis, target_value, value, weights)
+        return term
+
+
+def axis_terms(target: Tuple[int, int, int], weights: Dict[str, float]) -> tuple:
+    """
+    (moods, rankings, difficulties): value -> score term against cell target, per axis. A
+    cell's terms plus full marks for tags and date bound the score of any entry in it, for
+    weights that pass SimilarityIndex.can_search.
+    """
+    return tuple(_AxisTerms(axis, value, weights) for axis, value in enumerate(target))
+
+
+class SimilarityIndex:
+    def __init__(self):
+        self._cells: Dict[Tuple[int, int, int], Dict[str, None]] = {}
+        self._cell_of: Dict[str, Tuple[int, int, int]] = {}  # entry id -> its cell
+        # Per axis: value -> number of indexed entries with it
+        self._axis_counts: Tuple[Dict[int, int], ...] = ({}, {}, {})
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def clear(self):
+        self._cells.clear()
+        self._cell_of.clear()
+        for counts in self._axis_counts:
+            counts.clear()
+
+    def add(self, entry):
+        """Put entry in its cell, moving it if its mood/ranking/difficulty changed"""
+        key = _cell_key(entry)
+        old_key = self._cell_of.get(entry.entry_id_str)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self.remove(entry.entry_id_str)
+        self._cells.setdefault(key, {})[entry.entry_id_str] = None
+        self._cell_of[entry.entry_id_str] = key
+        for counts, value in zip(self._axis_counts, key):
+            counts[value] = counts.get(value, 0) + 1
+
+    update = add
+
+    def remove(self, entry_id_str: str):
+        key = self._cell_of.pop(entry_id_str, None)
+        if key is None:
+            return
+        cell = self._cells[key]
+        del cell[entry_id_str]
+        if not cell:
+            del self._cells[key]
+        for counts, value in zip(self._axis_counts, key):
+            if counts[value] == 1:
+                del counts[value]
+            else:
+                counts[value] -= 1
+
+    @staticmethod
+    def can_search(weights: Dict[str, float]) -> bool:
+        """The cell bounds only hold when no term counts against similarity"""
+        return all(weight >= 0 for weight in weights.values())
+
+    @classmethod
+    def worth_searching(cls, store, weights: Dict[str, float]) -> bool:
+        """Whether a lookup should go through the index rather than a full scan of store"""
+        if not cls.can_search(weights):
+            return False
+        return column_store.numpy is None or len(store) >= NUMPY_SCAN_ENTRIES
+
+    def top_similar(
+        self, store, entry_id_str: str, limit: int, weights: Dict[str, float]
+    ) -> List[Tuple[str, float]]:
+        """
+        Same result as similarity.top_similar, for weights that pass can_search
+
+        Parameters -------------------------
+        - store : ColumnStore       // The journal's column store (rows of the indexed entries)
+        - entry_id_str : str        // The entry to find neighbours for
+        - limit : int               // Maximum number of entries to return
+        - weights : dict            // Complete weights (similarity.resolve_weights)
+        """
+        row = store.row_of(entry_id_str)
+        target = self._cell_of.get(entry_id_str)
+        if row is None or target is None or limit <= 0:
+            return []
+
+        # Each axis as [(score term, value)], best term first
+        axes = [
+            sorted(
+                ((_axis_term(axis, target[axis], value, weights), value) for value in counts),
+                reverse=True,
+            )
+            for axis, counts in enumerate(self._axis_counts)
+        ]
+        moods, rankings, difficulties = axes
+        best_tags, best_date = 1.0 * weights["tags"], 1.0 * weights["date"]
+
+        def bound(i: int, j: int, k: int) -> float:
+            # Added in the score's order, so rounding can't lift a score above its bound
+            return moods[i][0] + rankings[j][0] + difficulties[k][0] + best_tags + best_date
+
+        score = row_scorer(store, row, weights)
+        sequence = store.sequence
+        row_of = store.row_of
+        best: List[Tuple[float, int, int]] = []  # min-heap of (score, -sequence, row)
+        frontier = [(-bound(0, 0, 0), 0, 0, 0)]
+        seen = {(0, 0, 0)}
+        while frontier:
+            negative_bound, i, j, k = heapq.heappop(frontier)
+            if len(best) == limit and -negative_bound < best[0][0]:
+                break
+            cell = self._cells.get((moods[i][1], rankings[j][1], difficulties[k][1]))
+            if cell:
+                for other_id in cell:
+                    other = row_of(other_id)
+                    if other == row:
+                        continue
+                    item = (score(other), -sequence[other], other)
+                    if len(best) < limit:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+            for step in ((i + 1, j, k), (i, j + 1, k), (i, j, k + 1)):
+                if (
+                    step not in seen
+                    and step[0] < len(moods)
+                    and step[1] < len(rankings)
+                    and step[2] < len(difficulties)
+                ):
+                    seen.add(step)
+                    heapq.heappush(frontier, (-bound(*step), *step))
+        best.sort(reverse=True)
+        return [(store.ids[i], item_score) for item_score, _, i in best]
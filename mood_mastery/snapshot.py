@@ -0,0 +1,217 @@
+"""
+Columnar startup snapshot for Mood_Journal.
+
+Hydrating every MoodEntry row through the ORM is what makes a cold start slow. The snapshot
+keeps the same entries in a file next to app.db: one typed array per numeric field and,
+for text, one offsets array plus a single UTF-8 blob. Loading it is a few bulk reads
+followed by plain slicing.
+
+The file is stamped with the journal_meta change counter it was built at. Any insert,
+update or delete on mood_entry / entry_tags bumps that counter, so a snapshot is only
+trusted while the counter still matches. It is only written right after the whole table was
+read, stamped with the counter from before the read, so it never holds anything the table
+didn't (see Mood_Journal._write_snapshot).
+"""
+
+import gc
+import json
+import math
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime
+from typing import List, Optional
+
+from mood_mastery.entry import Entry
+
+MAGIC = b"MJSNAP01"
+_HEADER_LENGTH = struct.Struct("<I")
+_TAG_SEPARATOR = "\x1f"  # unit separator; can't appear in a cleaned tag
+
+# Bit flags packed into the "flags" column
+_PRIVATE = 1
+_EXCLUDED = 2
+_BODY_DEFERRED = 4  # entry_body column holds the preview; the body stays in the database
+
+_TEXT_COLUMNS = ("entry_id_str", "entry_name", "entry_body", "tags", "biometrics")
+
+
+def snapshot_path_for(database_path: Optional[str]) -> Optional[str]:
+    """Where the snapshot of a SQLite file lives (None for in-memory databases)"""
+    if not database_path or database_path == ":memory:":
+        return None
+    return database_path + ".snapshot"
+
+
+def _text_column(values: List[str]):
+    """(offsets, blob): value i is blob.decode()[offsets[i]:offsets[i + 1]]"""
+    offsets = array("Q", [0])
+    total = 0
+    for value in values:
+        total += len(value)
+        offsets.append(total)
+    return offsets, "".join(values).encode("utf-8")
+
+
+def write_snapshot(path: str, entries, change_counter: int, with_bodies: bool = True) -> None:
+    """
+    Write entries to path as a columnar snapshot stamped with change_counter.
+    The file is written under a temporary name and renamed into place, so readers never
+    see a half-written snapshot. Without with_bodies (and for entries whose body was never
+    loaded) only the preview is stored, and the body is read from the database on demand.
+    """
+    entries = list(entries)
+    deferred = [not (with_bodies and e.body_loaded) for e in entries]
+    columns = {
+        "ordinal": array("i", (e.entry_date.toordinal() for e in entries)),
+        "ranking": array("h", (e.ranking for e in entries)),
+        "mood_rating": array("h", (e.mood_rating for e in entries)),
+        "difficulty_ranking": array("h", (e.difficulty_ranking for e in entries)),
+        "flags": array(
+            "B",
+            (
+                (_PRIVATE if e.is_private else 0)
+                | (_EXCLUDED if getattr(e, "is_excluded_from_reports", False) else 0)
+                | (_BODY_DEFERRED if d else 0)
+                for e, d in zip(entries, deferred)
+            ),
+        ),
+        "created_at": array(
+            "d",
+            (
+                e.created_at.timestamp() if getattr(e, "created_at", None) else math.nan
+                for e in entries
+            ),
+        ),
+    }
+    text = {
+        "entry_id_str": [e.entry_id_str for e in entries],
+        "entry_name": [e.entry_name for e in entries],
+        "entry_body": [
+            e.entry_preview if d else (e.entry_body or "") for e, d in zip(entries, deferred)
+        ],
+        "tags": [_TAG_SEPARATOR.join(e.tags) for e in entries],
+        "biometrics": [json.dumps(e.biometrics) if e.biometrics else "" for e in entries],
+    }
+    for name in _TEXT_COLUMNS:
+        columns[name + ".offsets"], columns[name] = _text_column(text[name])
+
+    blobs = []
+    layout = []
+    for name, column in columns.items():
+        raw = column.tobytes() if isinstance(column, array) else column
+        layout.append([name, column.typecode if isinstance(column, array) else "blob", len(raw)])
+        blobs.append(raw)
+    header = json.dumps(
+        {
+            "change_counter": change_counter,
+            "count": len(entries),
+            "byteorder": sys.byteorder,
+            "columns": layout,
+        }
+    ).encode("utf-8")
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for raw in blobs:
+            f.write(raw)
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path: str, change_counter: int, body_loader=None) -> Optional[List[Entry]]:
+    """
+    Returns the entries stored at path, or None when there is no usable snapshot
+    (missing, unreadable, from another platform, or stamped with a different change_counter).
+    Entries stored without their body get body_loader (see Entry._from_trusted); a snapshot
+    holding such entries is unusable without one.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(MAGIC):
+        return None
+
+    try:
+        start = len(MAGIC) + _HEADER_LENGTH.size
+        (header_length,) = _HEADER_LENGTH.unpack_from(data, len(MAGIC))
+        header = json.loads(data[start:start + header_length])
+        if header["change_counter"] != change_counter or header["byteorder"] != sys.byteorder:
+            return None
+
+        columns = {}
+        position = start + header_length
+        view = memoryview(data)
+        for name, typecode, length in header["columns"]:
+            raw = view[position:position + length]
+            position += length
+            if typecode == "blob":
+                columns[name] = bytes(raw).decode("utf-8")
+            else:
+                column = array(typecode)
+                column.frombytes(raw)
+                columns[name] = column
+    except (ValueError, KeyError, struct.error):
+        return None
+
+    # Allocating ~10 objects per entry would otherwise trigger a cyclic GC pass every few
+    # hundred entries; none of them can be garbage yet, so skip collecting until the end
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _entries_from_columns(columns, header["count"], body_loader)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _entries_from_columns(columns, count: int, body_loader) -> Optional[List[Entry]]:
+    def texts(name):
+        blob, offsets = columns[name], columns[name + ".offsets"]
+        return [blob[offsets[i]:offsets[i + 1]] for i in range(count)]
+
+    entry_ids = texts("entry_id_str")
+    names = texts("entry_name")
+    bodies = texts("entry_body")
+    tags = texts("tags")
+    biometrics = texts("biometrics")
+    ordinals = columns["ordinal"]
+    rankings = columns["ranking"]
+    mood_ratings = columns["mood_rating"]
+    difficulties = columns["difficulty_ranking"]
+    flags = columns["flags"]
+    created = columns["created_at"]
+
+    dates = list(map(date.fromordinal, ordinals))
+    tag_lists = [t.split(_TAG_SEPARATOR) if t else [] for t in tags]
+    biometric_dicts = [json.loads(b) if b else {} for b in biometrics]
+    created_ats = [None if math.isnan(c) else datetime.fromtimestamp(c) for c in created]
+    if body_loader is None and any(f & _BODY_DEFERRED for f in flags):
+        return None
+
+    # Entry._from_trusted skips __init__: these values were validated when first saved (and
+    # it clamps legacy rankings / mood_ratings into the ranges the journal's indexes need)
+    from_trusted = Entry._from_trusted
+    return [
+        from_trusted(
+            entry_ids[i],
+            names[i],
+            dates[i],
+            bodies[i],
+            rankings[i],
+            mood_ratings[i],
+            difficulties[i],
+            tag_lists[i],
+            biometric_dicts[i],
+            bool(flags[i] & _PRIVATE),
+            bool(flags[i] & _EXCLUDED),
+            created_ats[i],
+            body_loader if flags[i] & _BODY_DEFERRED else None,
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,95 @@
+"""
+Run-length bookkeeping for journal streaks.
+
+A streak is a run of consecutive days that each have at least one entry. StreakRuns keeps
+those runs as sorted start ordinals plus start -> end, and a count of runs per length with a
+max-heap over the lengths. Adding or removing a day touches at most the two runs around it,
+so the current and longest streak stay up to date without re-sorting every date.
+"""
+
+import heapq
+from bisect import bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+
+class StreakRuns:
+    def __init__(self):
+        self._starts: List[int] = []  # sorted run start ordinals
+        self._ends: Dict[int, int] = {}  # run start -> run end (inclusive)
+        self._length_counts: Dict[int, int] = {}  # run length -> how many runs have it
+        self._length_heap: List[int] = []  # negated lengths; stale ones are skipped lazily
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def clear(self):
+        self._starts.clear()
+        self._ends.clear()
+        self._length_counts.clear()
+        self._length_heap.clear()
+
+    def add_day(self, ordinal: int):
+        """A day gained its first entry: extend, join or start a run"""
+        index = bisect_right(self._starts, ordinal) - 1
+        if index >= 0 and self._ends[self._starts[index]] >= ordinal:
+            return  # already part of a run
+        start = end = ordinal
+        if index >= 0 and self._ends[self._starts[index]] == ordinal - 1:
+            start = self._starts[index]
+            self._remove_run(start)
+        if ordinal + 1 in self._ends:
+            end = self._ends[ordinal + 1]
+            self._remove_run(ordinal + 1)
+        self._add_run(start, end)
+
+    def remove_day(self, ordinal: int):
+        """A day lost its last entry: shorten its run, or split it in two"""
+        index = bisect_right(self._starts, ordinal) - 1
+        if index < 0:
+            return
+        start = self._starts[index]
+        end = self._ends[start]
+        if end < ordinal:
+            return  # not part of any run
+        self._remove_run(start)
+        if start < ordinal:
+            self._add_run(start, ordinal - 1)
+        if ordinal < end:
+            self._add_run(ordinal + 1, end)
+
+    def latest(self) -> Optional[Tuple[int, int]]:
+        """(length, last day ordinal) of the most recent run; None when there are no days"""
+        if not self._starts:
+            return None
+        start = self._starts[-1]
+        end = self._ends[start]
+        return end - start + 1, end
+
+    def longest(self) -> int:
+        heap = self._length_heap
+        while heap and not self._length_counts.get(-heap[0]):
+            heapq.heappop(heap)
+        return -heap[0] if heap else 0
+
+    def _add_run(self, start: int, end: int):
+        insort(self._starts, start)
+        self._ends[start] = end
+        length = end - start + 1
+        count = self._length_counts.get(length, 0)
+        self._length_counts[length] = count + 1
+        if not count:
+            heapq.heappush(self._length_heap, -length)
+            if len(self._length_heap) > 2 * len(self._length_counts) + 16:
+                # Too many stale lengths: rebuild from the live ones
+                self._length_heap = [-n for n in self._length_counts]
+                heapq.heapify(self._length_heap)
+
+    def _remove_run(self, start: int):
+        end = self._ends.pop(start)
+        del self._starts[bisect_right(self._starts, start) - 1]
+        length = end - start + 1
+        count = self._length_counts[length] - 1
+        if count:
+            self._length_counts[length] = count
+        else:
+            del self._length_counts[length]
@@ -0,0 +1,150 @@
+"""
+Write-behind persistence for Mood_Journal.
+
+Journal mutations update entries_dict right away and only queue their database write here.
+A background thread drains the queue and hands the writes over in groups, so one commit
+(and one fsync) covers many writes and the request thread never waits on SQLite.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Markers travel through the same queue as the writes so they keep their place in line
+_FLUSH = object()
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """
+    A bounded queue of pending writes drained by a background writer thread.
+
+    Attributes -------------------------
+     - pending : int    // Writes accepted but not yet committed (or failed)
+     - flushed : int    // Writes committed successfully
+     - failed : int     // Writes whose group commit raised an error
+    """
+
+    def __init__(
+        self,
+        apply_batch: Callable[[List[tuple]], None],
+        max_pending: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+    ):
+        """
+        Parameters -------------------------
+        - apply_batch : callable    // Writes a list of queued operations in one transaction; raises on failure
+        - max_pending : int         // Queue capacity; put() blocks while it is full (backpressure)
+        - batch_size : int          // A group commit happens once this many writes are waiting...
+        - flush_interval : float    // ...or this many seconds after the first write of the group arrived
+        """
+        self._apply_batch = apply_batch
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.pending = 0
+        self.flushed = 0
+        self.failed = 0
+        self._closed = False
+        self._idle = threading.Condition()
+
+        self._thread = threading.Thread(
+            target=self._run, name="mood-journal-writer", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, op: tuple, timeout: Optional[float] = None) -> None:
+        """
+        Queue one write. Blocks while the queue is full; raises queue.Full if timeout runs out first.
+        """
+        if self._closed:
+            raise RuntimeError("write-behind queue is closed")
+        with self._idle:
+            self.pending += 1
+        try:
+            self._queue.put(op, timeout=timeout)
+        except queue.Full:
+            with self._idle:
+                self.pending -= 1
+                self._idle.notify_all()
+            raise
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Barrier: commit everything queued so far and wait for it.
+        Returns True once nothing is pending, False if timeout ran out first.
+        """
+        if self._closed:
+            return self.pending == 0
+        self._queue.put(_FLUSH)
+        with self._idle:
+            return self._idle.wait_for(lambda: self.pending == 0, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Flush the remaining writes and stop the writer thread. Later put() calls raise.
+        """
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the durability counters: { "pending" : int, "flushed" : int, "failed" : int }
+        """
+        with self._idle:
+            return {
+                "pending": self.pending,
+                "flushed": self.flushed,
+                "failed": self.failed,
+            }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+
+            # Gather writes until the group is big enough, the interval runs out or a marker asks to commit now
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                if item is _FLUSH:
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._commit(batch)
+
+    def _commit(self, batch: List[tuple]):
+        try:
+            self._apply_batch(batch)
+            succeeded = True
+        except Exception as e:
+            succeeded = False
+            print(f"Warning: Could not write {len(batch)} queued change(s) to database: {e}")
+
+        with self._idle:
+            if succeeded:
+                self.flushed += len(batch)
+            else:
+                self.failed += len(batch)
+            self.pending -= len(batch)
+            self._idle.notify_all()
@@ -0,0 +1,80 @@
+from sqlalchemy import event
+
+from extensions import db
+
+# Applied to every new SQLite connection. WAL lets readers keep going while a writer commits,
+# and synchronous=NORMAL only fsyncs at checkpoints instead of on every commit.
+DEFAULT_SQLITE_PROFILE = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,  # bytes of the db file memory-mapped for reads
+    "cache_size": -64000,  # negative = KiB, so ~64 MB of page cache per connection
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,  # ms a connection waits on a lock before raising "database is locked"
+}
+
+
+class SQLiteTuning:
+
+    @staticmethod
+    def pragma_statements(profile):
+        return [f"PRAGMA {name}={value}" for name, value in profile.items()]
+
+    @staticmethod
+    def apply_profile(app, profile=None):
+        """
+        Run the profile's PRAGMAs on every new connection of the app's engine.
+        Uses app.config["SQLITE_PERFORMANCE_PROFILE"] when no profile is given;
+        a falsy profile or a non-SQLite engine leaves things untouched.
+        """
+        if profile is None:
+            profile = app.config.get("SQLITE_PERFORMANCE_PROFILE")
+        if not profile:
+            return
+
+        statements = SQLiteTuning.pragma_statements(profile)
+
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for statement in statements:
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+
+        with app.app_context():
+            engine = db.engine
+            if engine.dialect.name != "sqlite":
+                return
+            event.listen(engine, "connect", set_pragmas)
+            # Connections opened before the listener existed would keep the old settings
+            engine.dispose()
+
+    @staticmethod
+    def checkpoint(app, mode="PASSIVE"):
+        """
+        Copy WAL pages back into the main db file so the -wal file doesn't keep growing.
+        Returns SQLite's (busy, wal_pages, checkpointed_pages) row.
+        """
+        with app.app_context():
+            with db.engine.connect() as conn:
+                return tuple(conn.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").one())
+
+    @staticmethod
+    def schedule_checkpoint(scheduler, app, minutes=None):
+        """
+        Add (or replace) the periodic WAL checkpoint job on the APScheduler.
+        Uses app.config["SQLITE_WAL_CHECKPOINT_MINUTES"] when minutes isn't given.
+        """
+        if minutes is None:
+            minutes = app.config.get("SQLITE_WAL_CHECKPOINT_MINUTES")
+        if not minutes:
+            return
+
+        scheduler.add_job(
+            id="wal-checkpoint",
+            func=lambda: SQLiteTuning.checkpoint(app),
+            trigger="interval",
+            minutes=minutes,
+            replace_existing=True,
+        )
@@ -4,12 +4,19 @@ Pytest configuration and fixtures for testing.
 This module provides shared fixtures used across all test files:
 - app: Flask application instance with test configuration
 - client: Flask test client for making HTTP requests
+- journal_app: Separate Flask application bound to its own temporary database,
+  for Mood_Journal(app=...) persistence tests
+- app_routes: Test client serving app.py's own routes against journal_app's database
 """
 
 import pytest
+from flask import Flask
 
+import app as app_module
 from app import app as flask_app
 from extensions import db
+from migrations import run_migrations
+from mood_mastery.mood_journal import Mood_Journal
 
 
 @pytest.fixture
@@ -53,4 +60,65 @@ def client(app):
     Returns:
         Flask test client instance
     """
-    return app.test_client()
\ No newline at end of file
+    return app.test_client()
+
+
+@pytest.fixture
+def journal_app(tmp_path):
+    """
+    Create a standalone Flask application with its own temporary SQLite database.
+
+    The main app's engine is created when app.py is imported, so changing its
+    config afterwards does not move it off instance/app.db. Persistence tests pass
+    this app to Mood_Journal(app=...) instead, so they never touch real data.
+
+    Yields:
+        Flask application with all tables created
+    """
+    test_app = Flask(__name__)
+    test_app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'journal.db'}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    db.init_app(test_app)
+
+    with test_app.app_context():
+        db.create_all()
+        run_migrations(db.engine)
+
+    yield test_app
+
+    with test_app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def app_routes(journal_app, monkeypatch):
+    """
+    Serve app.py's view functions from journal_app, with app.mj swapped for a journal
+    bound to journal_app's temporary database.
+
+    The view functions are the real ones (same code, same module globals); only the
+    Flask app they run under differs, so their database work lands in the temporary
+    database instead of instance/app.db. Redirects are not followed.
+
+    Yields:
+        (test client, Mood_Journal) pair
+    """
+    mj = Mood_Journal(app=journal_app, write_behind=True)
+    monkeypatch.setattr(app_module, "mj", mj)
+    journal_app.secret_key = "test"
+    for rule in flask_app.url_map.iter_rules():
+        if rule.endpoint != "static":
+            journal_app.add_url_rule(
+                rule.rule,
+                rule.endpoint,
+                flask_app.view_functions[rule.endpoint],
+                methods=rule.methods,
+            )
+
+    yield journal_app.test_client(), mj
+
+    mj.mj_close()
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+from journal_export import EXPORT_FIELDS, JournalExport
+from mood_mastery.mood_journal import Mood_Journal
+
+
+def test_iter_rows_pages_through_every_entry_in_insert_order(journal_app):
+    mj = Mood_Journal(app=journal_app)
+    ids = mj.mj_bulk_create(
+        [("E%d" % i, 1 + i % 28, 1, 2025, "b", 1, 50, 5) for i in range(25)]
+    )["created"]
+
+    with journal_app.app_context():
+        rows = list(JournalExport.iter_rows(batch_size=7))
+    assert [row["entry_id_str"] for row in rows] == ids
+    assert set(rows[0]) == set(EXPORT_FIELDS)
+
+
+def test_csv_and_jsonl_round_trip_values(journal_app):
+    mj = Mood_Journal(app=journal_app)
+    e_id = mj.mj_create_entry(
+        "First", 1, 1, 2025, "hello, world", 1, 80, 10,
+        tags=["work", "gym"], biometrics={"Sleep": "meh"},
+    )
+
+    with journal_app.app_context():
+        text = "".join(JournalExport.csv_chunks(JournalExport.iter_rows(), rows_per_chunk=1))
+        lines = "".join(JournalExport.jsonl_chunks(JournalExport.iter_rows())).splitlines()
+
+    (row,) = list(csv.DictReader(io.StringIO(text)))
+    assert row["entry_id_str"] == e_id
+    assert row["entry_body"] == "hello, world"
+    assert row["tags"] == "work,gym"
+    assert json.loads(row["biometrics"]) == {"Sleep": "meh"}
+
+    (obj,) = [json.loads(line) for line in lines]
+    assert obj["entry_date"] == "2025-01-01"
+    assert obj["tags"] == ["work", "gym"]
+    assert obj["mood_rating"] == 80
+
+
+def test_export_routes_stream_every_entry_and_blank_private_bodies(app_routes):
+    client, mj = app_routes
+    public = mj.mj_create_entry("Public", 1, 1, 2025, "open body", 1, 80, 10, tags=["work"])
+    secret = mj.mj_create_entry("Secret", 2, 1, 2025, "hidden body", 4, 20, 60)
+    mj.mj_get_entry(secret).set_privacy_setting(True)
+    mj._save_entry_to_db(mj.mj_get_entry(secret))  # queued: the route flushes it first
+
+    response = client.get("/export.jsonl")
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["Content-Disposition"] == "attachment; filename=mood_journal.jsonl"
+    objs = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [obj["entry_id_str"] for obj in objs] == [public, secret]
+    assert objs[0]["entry_body"] == "open body" and objs[0]["tags"] == ["work"]
+    assert objs[1]["is_private"] is True and objs[1]["entry_body"] == ""
+
+    response = client.get("/export.csv")
+    assert response.mimetype == "text/csv"
+    assert response.headers["Content-Disposition"] == "attachment; filename=mood_journal.csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [(row["entry_name"], row["entry_body"]) for row in rows] == [
+        ("Public", "open body"),
+        ("Secret", ""),
+    ]
@@ -0,0 +1,143 @@
+import io
+import json
+
+from journal_export import JournalExport
+from journal_import import JournalImport
+from mood_mastery.mood_journal import Mood_Journal
+
+CSV_TEXT = (
+    "entry_id_str,entry_name,entry_date,entry_body,ranking,mood_rating,difficulty_ranking,tags,biometrics\n"
+    'a-1,First,2024-05-01,body one,1,80,10,"work,gym","{""Sleep"": ""meh""}"\n'
+    "a-2,Second,2024-05-02,body two,9,80,10,,\n"
+    "a-3,Third,2024-05-03,body three,2,40,20,family,\n"
+    "a-1,First again,2024-05-01,dupe,1,80,10,,\n"
+)
+
+
+def test_csv_import_validates_dedupes_and_keeps_ids(journal_app):
+    mj = Mood_Journal(app=journal_app)
+    summary = JournalImport.import_stream(mj, io.StringIO(CSV_TEXT), "csv", chunk_size=2)
+
+    assert summary["imported"] == 2
+    assert summary["duplicates"] == 1
+    assert summary["failed"] == 1
+    assert summary["errors"] == [(2, "ranking must be between 1 and 8")]
+
+    stored = Mood_Journal(app=journal_app)
+    first = stored.mj_get_entry("a-1")
+    assert first.entry_name == "First"
+    assert first.tags == ["work", "gym"]
+    assert first.biometrics == {"Sleep": "meh"}
+
+    again = JournalImport.import_stream(stored, io.StringIO(CSV_TEXT), "csv")
+    assert again["imported"] == 0 and again["duplicates"] == 3
+
+
+def test_export_output_imports_back_into_an_empty_journal(journal_app, tmp_path):
+    mj = Mood_Journal(app=journal_app)
+    e_id = mj.mj_create_entry("Round", 3, 3, 2024, "trip", 5, 55, 30, tags=["travel"])
+    with journal_app.app_context():
+        exported = "".join(JournalExport.jsonl_chunks(JournalExport.iter_rows()))
+    mj.mj_clear_all_data()
+
+    summary = JournalImport.import_stream(mj, io.StringIO(exported), "jsonl")
+    assert summary["imported"] == 1
+    entry = mj.mj_get_entry(e_id)
+    assert (entry.entry_name, entry.tags, entry.mood_rating) == ("Round", ["travel"], 55)
+
+
+def test_import_resumes_after_the_last_committed_chunk(journal_app, tmp_path):
+    lines = [
+        json.dumps({"entry_id_str": f"r-{i}", "entry_name": f"E{i}", "entry_date": "2024-01-01",
+                    "ranking": 1, "mood_rating": 50, "difficulty_ranking": 5})
+        for i in range(10)
+    ]
+    checkpoint = str(tmp_path / "import.checkpoint")
+    mj = Mood_Journal(app=journal_app)
+
+    # Simulate a crash while committing the third chunk
+    original = mj.mj_import_entries
+    calls = []
+
+    def crashing(entries):
+        calls.append(len(entries))
+        if len(calls) == 3:
+            raise RuntimeError("killed")
+        return original(entries)
+
+    mj.mj_import_entries = crashing
+    try:
+        JournalImport.import_stream(mj, io.StringIO("\n".join(lines)), "jsonl",
+                                    chunk_size=3, checkpoint_path=checkpoint)
+    except RuntimeError:
+        pass
+    assert JournalImport.read_checkpoint(checkpoint) == 6
+
+    mj.mj_import_entries = original
+    summary = JournalImport.import_stream(mj, io.StringIO("\n".join(lines)), "jsonl",
+                                          chunk_size=3, checkpoint_path=checkpoint)
+    assert summary["resumed_from"] == 6
+    assert summary["imported"] == 4
+    assert len(Mood_Journal(app=journal_app).mj_get_all_entries()) == 10
+
+
+def _upload(client, name, data):
+    return client.post(
+        "/import",
+        data={"file": (io.BytesIO(data), name)},
+        content_type="multipart/form-data",
+    )
+
+
+def _flashes(client):
+    with client.session_transaction() as session:
+        return session.get("_flashes", [])
+
+
+def test_import_route_imports_an_upload_and_reports_the_summary(app_routes):
+    client, mj = app_routes
+    response = _upload(client, "history.csv", CSV_TEXT.encode("utf-8-sig"))
+    assert response.status_code == 302
+    assert _flashes(client) == [
+        ("error", "Imported 2 entries (1 already present, 1 invalid).")
+    ]
+    assert mj.mj_get_entry("a-3").tags == ["family"]
+
+    response = _upload(client, "notes.txt", b"whatever")
+    assert response.status_code == 302
+    assert _flashes(client)[-1] == ("error", "Choose a .csv or .jsonl file to import.")
+
+
+def test_unusable_rows_and_unreadable_input_are_reported_not_raised(journal_app):
+    mj = Mood_Journal(app=journal_app)
+    lines = [
+        '{"entry_id_str": "t-1", "entry_name": "Ok", "entry_date": "2024-01-01", "ranking": 1, "mood_rating": 50, "difficulty_ranking": 5}',
+        '{"entry_id_str": "t-2", "entry_name": "Bad", "entry_date": "2024-01-01", "ranking": 1, "mood_rating": 50, "difficulty_ranking": 5, "tags": [1]}',
+        '{"entry_id_str": "t-3", "entry_name": "Bad", "entry_date": "2024-01-01", "ranking": 1, "mood_rating": 50, "difficulty_ranking": 5, "entry_body": 7}',
+    ]
+    summary = JournalImport.import_stream(mj, io.StringIO("\n".join(lines)), "jsonl")
+    assert (summary["imported"], summary["failed"], summary["stopped"]) == (1, 2, None)
+    assert [row for row, _ in summary["errors"]] == [2, 3]
+
+    oversized = CSV_TEXT.splitlines()[0] + "\n" + "a-9,Big," + "x" * 200_000 + "\n"
+    csv_text = CSV_TEXT.replace("a-1,First again", "a-4,Fourth") + oversized.split("\n", 1)[1]
+    summary = JournalImport.import_stream(mj, io.StringIO(csv_text), "csv")
+    assert summary["imported"] == 3 and summary["failed"] == 2
+    assert summary["stopped"].startswith("unreadable input after row 4")
+    assert mj.mj_get_entry("a-4").entry_name == "Fourth"
+
+
+def test_import_route_flashes_bad_uploads_instead_of_failing(app_routes, monkeypatch):
+    client, mj = app_routes
+    response = _upload(client, "history.csv", b"entry_id_str,entry_name\n\xff\xfe\xfa,bad\n")
+    assert response.status_code == 302
+    category, message = _flashes(client)[-1]
+    assert category == "error" and "Stopped early: unreadable input" in message
+
+    def broken_import(entries):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(mj, "mj_import_entries", broken_import)
+    response = _upload(client, "history.csv", CSV_TEXT.encode())
+    assert response.status_code == 302
+    assert _flashes(client)[-1] == ("error", "Import failed: database is locked")
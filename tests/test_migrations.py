@@ -0,0 +1,99 @@
+import sqlite3
+
+from sqlalchemy import create_engine, inspect
+
+from migrations import MIGRATIONS, run_migrations, schema_version
+from mood_mastery.body_codec import decode_body
+
+# mood_entry as it existed before the migration runner (no exclusion flag, no secondary indexes)
+LEGACY_MOOD_ENTRY = """
+CREATE TABLE mood_entry (
+    id INTEGER NOT NULL PRIMARY KEY,
+    mood VARCHAR(50) NOT NULL,
+    notes TEXT,
+    created_at DATETIME,
+    entry_id_str VARCHAR(36) NOT NULL UNIQUE,
+    entry_name VARCHAR(200) NOT NULL,
+    entry_date DATE NOT NULL,
+    ranking INTEGER NOT NULL,
+    mood_rating INTEGER NOT NULL,
+    difficulty_ranking INTEGER NOT NULL,
+    entry_body TEXT NOT NULL,
+    tags_raw TEXT,
+    biometrics_raw TEXT,
+    is_private BOOLEAN
+)
+"""
+
+
+def _legacy_db(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute(LEGACY_MOOD_ENTRY)
+    conn.execute(
+        "INSERT INTO mood_entry (mood, notes, created_at, entry_id_str, entry_name, entry_date,"
+        " ranking, mood_rating, difficulty_ranking, entry_body, tags_raw, biometrics_raw, is_private)"
+        " VALUES ('70', 'old body', '2025-01-01 09:00:00', 'legacy-1', 'Old', '2025-01-01',"
+        " 2, 70, 3, 'old body', 'work,gym', NULL, 0)"
+    )
+    conn.commit()
+    conn.close()
+    return create_engine(f"sqlite:///{path}")
+
+
+def test_run_migrations_upgrades_legacy_table_without_losing_rows(tmp_path):
+    engine = _legacy_db(tmp_path)
+    assert schema_version(engine) == 0
+
+    applied = run_migrations(engine)
+    assert applied == [version for version, _, _ in MIGRATIONS]
+    assert schema_version(engine) == MIGRATIONS[-1][0]
+
+    columns = {c["name"] for c in inspect(engine).get_columns("mood_entry")}
+    assert "is_excluded_from_reports" in columns
+    index_names = {i["name"] for i in inspect(engine).get_indexes("mood_entry")}
+    assert {"ix_mood_entry_date_created", "ix_mood_entry_ranking_date"} <= index_names
+
+    with engine.connect() as conn:
+        row = conn.exec_driver_sql(
+            "SELECT entry_name, tags_raw, is_excluded_from_reports, entry_preview,"
+            " entry_body, notes FROM mood_entry"
+        ).one()
+        stored_body = conn.exec_driver_sql("SELECT entry_body_z FROM mood_entry").scalar()
+        tags = conn.exec_driver_sql(
+            "SELECT entry_id, tag FROM entry_tags ORDER BY rowid"
+        ).all()
+    assert tuple(row) == ("Old", None, 0, "old body", "", None)
+    assert decode_body(stored_body) == "old body"
+    assert [tuple(t) for t in tags] == [("legacy-1", "work"), ("legacy-1", "gym")]
+
+
+def test_run_migrations_is_idempotent(tmp_path):
+    engine = _legacy_db(tmp_path)
+    run_migrations(engine)
+    assert run_migrations(engine) == []
+
+
+def test_fresh_database_is_already_at_latest_version(journal_app):
+    from extensions import db
+
+    with journal_app.app_context():
+        assert schema_version(db.engine) == MIGRATIONS[-1][0]
+        assert run_migrations(db.engine) == []
+
+
+def test_change_counter_moves_on_every_row_change(tmp_path):
+    engine = _legacy_db(tmp_path)
+    run_migrations(engine)
+
+    def counter():
+        with engine.connect() as conn:
+            return conn.exec_driver_sql(
+                "SELECT value FROM journal_meta WHERE key = 'change_counter'"
+            ).scalar()
+
+    before = counter()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE mood_entry SET mood_rating = 10")
+        conn.exec_driver_sql("DELETE FROM entry_tags WHERE tag = 'gym'")
+    assert counter() == before + 2
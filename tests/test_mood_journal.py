@@ -5,7 +5,7 @@
 from mood_mastery.entry import Entry
 from mood_mastery.mood_journal import Mood_Journal
 from mood_mastery.user import User
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 import pytest
 
 """Create Entry Test"""
@@ -950,4 +950,1022 @@ def test_mj_find_similar_entries():
     print("✓ Test Case 3: Entry is not included in its own similar entries")
     
     print("✅ mj_find_similar_entries test passed!")
-    print()
\ No newline at end of file
+    print()
+"""Bulk Create Test"""
+def test_mj_bulk_create_reports_failed_rows_and_keeps_valid_ones():
+    mj = Mood_Journal(use_database=False)
+
+    result = mj.mj_bulk_create([
+        {"entry_name": "D1", "entry_day": 1, "entry_month": 3, "entry_year": 2025,
+         "entry_body": "one", "ranking": 1, "mood_rating": 80, "difficulty_ranking": 10,
+         "tags": ["Work"]},
+        ("D2", 2, 3, 2025, "two", 2, 70, 20),
+        ("Bad date", 31, 2, 2025, "x", 1, 50, 5),          # Feb 31st
+        ("Bad rating", 3, 3, 2025, "x", 1, 500, 5),        # mood_rating out of range
+        {"entry_name": "Bad bio", "entry_day": 3, "entry_month": 3, "entry_year": 2025,
+         "entry_body": "x", "ranking": 1, "mood_rating": 50, "difficulty_ranking": 5,
+         "biometrics": {"Sleep": "amazing"}},
+        ("D3", 3, 3, 2025, "three", 3, 60, 30),
+    ])
+
+    assert len(result["created"]) == 3
+    assert [index for index, _ in result["failed"]] == [2, 3, 4]
+    assert len(mj.entries_dict) == 3
+    assert mj.mj_all_tags() == ["work"]
+
+    # Streak is recomputed once for the whole batch
+    s = mj.get_streak_summary()
+    assert s["current_streak"] == 3
+    assert s["last_entry_date"] == date(2025, 3, 3)
+
+
+def test_mj_bulk_create_persists_batch(journal_app):
+    from models import MoodEntry
+
+    mj = Mood_Journal(app=journal_app)
+    rows = [("E%d" % i, 1 + i % 28, 1, 2025, "body", 1 + i % 8, 50, 5) for i in range(50)]
+    result = mj.mj_bulk_create(rows)
+    assert result["failed"] == []
+
+    with journal_app.app_context():
+        assert MoodEntry.query.count() == 50
+
+    # A fresh journal over the same database sees every row
+    reloaded = Mood_Journal(app=journal_app)
+    assert len(reloaded.mj_get_all_entries()) == 50
+
+"""Write-Behind Persistence Tests"""
+def test_write_behind_flush_barrier_and_counters(journal_app):
+    from models import MoodEntry
+
+    mj = Mood_Journal(app=journal_app, write_behind=True, write_batch_size=10, write_flush_interval=5)
+    ids = [mj.mj_create_entry("E%d" % i, 1, 2, 2025, "body", 1, 50, 5) for i in range(25)]
+    mj.mj_edit_entry(ids[0], "Edited", 2, 2, 2025, "new body", 2, 60, 6)
+    mj.mj_delete_entry(ids[1])
+
+    # Memory is updated right away, whatever the writer has done so far
+    assert mj.entries_dict[ids[0]].entry_name == "Edited"
+    assert ids[1] not in mj.entries_dict
+
+    assert mj.mj_flush(timeout=10) is True
+    assert mj.mj_write_stats() == {"pending": 0, "flushed": 27, "failed": 0}
+
+    with journal_app.app_context():
+        assert MoodEntry.query.count() == 24
+        assert MoodEntry.query.filter_by(entry_id_str=ids[0]).first().entry_name == "Edited"
+
+    mj.mj_close()
+    # After close the journal falls back to synchronous writes
+    mj.mj_create_entry("Late", 3, 2, 2025, "body", 1, 50, 5)
+    with journal_app.app_context():
+        assert MoodEntry.query.count() == 25
+
+
+def test_write_behind_counts_failed_group_commits():
+    from mood_mastery.write_behind import WriteBehindQueue
+
+    def broken_writer(ops):
+        raise RuntimeError("disk full")
+
+    writer = WriteBehindQueue(broken_writer, max_pending=2, batch_size=5, flush_interval=0.01)
+    for i in range(4):
+        writer.put(("save", {"entry_id_str": str(i)}))  # blocks while the queue is full
+    assert writer.flush(timeout=5) is True
+    assert writer.stats() == {"pending": 0, "flushed": 0, "failed": 4}
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.put(("save", {}))
+
+"""Windowed Loading Tests"""
+def test_windowed_loading_loads_recent_window_then_ranges_on_demand(journal_app):
+    from datetime import timedelta
+
+    today = date.today()
+    old_day = today - timedelta(days=400)
+    recent_day = today - timedelta(days=3)
+
+    writer = Mood_Journal(app=journal_app)
+    old_id = writer.mj_create_entry("Old", old_day.day, old_day.month, old_day.year, "old", 2, 20, 5)
+    writer.mj_create_entry("Older", old_day.day, old_day.month, old_day.year, "older", 2, 25, 5)
+    recent_id = writer.mj_create_entry("Recent", recent_day.day, recent_day.month, recent_day.year, "new", 1, 90, 5)
+
+    mj = Mood_Journal(app=journal_app, load_window_days=90)
+    loaded_ranges = []
+    original_loader = mj._load_entries_from_db
+    mj._load_entries_from_db = lambda start, end: (loaded_ranges.append((start, end)), original_loader(start, end))
+
+    # First use only hydrates the recent window, but the streak still sees every stored date
+    summary = mj.get_streak_summary()
+    assert set(mj.entries_dict) == {recent_id}
+    assert summary["last_entry_date"] == recent_day
+    assert summary["longest_streak"] == 1
+
+    # Asking for an old range pulls it in once
+    assert {e.entry_name for e in mj.mj_entries_between(old_day, old_day)} == {"Old", "Older"}
+    calls = len(loaded_ranges)
+    mj.mj_entries_on(old_day.year, old_day.month, old_day.day)
+    assert len(loaded_ranges) == calls, "an already resident range must not be read again"
+    assert old_id in mj.entries_dict
+
+    # Anything that needs the whole journal loads the remaining gaps
+    assert len(mj.mj_get_all_entries()) == 3
+    assert mj._db_loaded is True
+
+
+def test_windowed_loading_fetches_single_entry_by_id(journal_app):
+    writer = Mood_Journal(app=journal_app)
+    old_id = writer.mj_create_entry("Old", 1, 1, 2015, "old", 2, 20, 5)
+
+    mj = Mood_Journal(app=journal_app, load_window_days=30)
+    assert mj.mj_get_entry(old_id).entry_name == "Old"
+    assert mj._db_loaded is False
+    assert mj.mj_delete_entry(old_id) is True
+    assert Mood_Journal(app=journal_app).mj_get_entry(old_id) is False
+
+"""Tag Table Tests"""
+def test_tags_round_trip_through_entry_tags(journal_app):
+    writer = Mood_Journal(app=journal_app)
+    e_id = writer.mj_create_entry("Tagged", 1, 3, 2025, "body", 1, 60, 5, tags=["Work", "gym"])
+    assert writer.mj_add_tag(e_id, " Family ") is True
+    assert writer.mj_remove_tag(e_id, "gym") is True
+    assert writer.mj_add_tag(e_id, "work") is False
+
+    reloaded = Mood_Journal(app=journal_app)
+    assert reloaded.mj_get_entry(e_id).tags == ["work", "family"]
+    assert reloaded.mj_clear_tags(e_id) is True
+    assert Mood_Journal(app=journal_app).mj_get_entry(e_id).tags == []
+
+
+def test_tag_queries_answer_from_sql_without_loading_everything(journal_app):
+    writer = Mood_Journal(app=journal_app)
+    a = writer.mj_create_entry("A", 1, 3, 2015, "a", 1, 60, 5, tags=["work", "gym"])
+    writer.mj_create_entry("B", 2, 3, 2015, "b", 1, 60, 5, tags=["work"])
+    writer.mj_create_entry("C", 3, 3, 2015, "c", 1, 60, 5)
+
+    mj = Mood_Journal(app=journal_app, load_window_days=30)
+    assert mj.mj_all_tags() == ["gym", "work"]
+    assert mj.mj_tag_summary() == [("work", 2), ("gym", 1)]
+    assert mj.entries_dict == {}
+
+    assert [e.entry_id_str for e in mj.mj_entries_with_tag(" GYM ")] == [a]
+    assert set(mj.entries_dict) == {a}
+
+"""SQL Report Tests"""
+def test_reports_count_rankings_in_sql_matching_memory(journal_app):
+    writer = Mood_Journal(app=journal_app)
+    writer.mj_create_entry("A", 7, 1, 2025, "a", 2, 60, 5)
+    writer.mj_create_entry("B", 1, 1, 2025, "b", 2, 60, 5)
+    writer.mj_create_entry("C", 31, 12, 2024, "c", 8, 60, 5)  # outside the week, inside the month
+    hidden = writer.mj_create_entry("D", 5, 1, 2025, "d", 3, 60, 5)
+    writer.mj_set_entry_excluded_from_reports(hidden, True)
+
+    mj = Mood_Journal(app=journal_app)
+    assert mj.mj_weekly_report(7, 1, 2025) == [0, 2, 0, 0, 0, 0, 0, 0]
+    assert mj.mj_monthly_report(7, 1, 2025) == [0, 2, 0, 0, 0, 0, 0, 1]
+    assert mj.mj_weekly_report(7, 6, 2025) is None
+    assert mj.entries_dict == {}
+
+    mj.mj_get_all_entries()
+    assert mj.mj_weekly_report(7, 1, 2025) == [0, 2, 0, 0, 0, 0, 0, 0]
+    assert mj.mj_monthly_report(7, 1, 2025) == [0, 2, 0, 0, 0, 0, 0, 1]
+
+"""Startup Snapshot Tests"""
+def test_snapshot_is_used_on_restart_while_database_is_unchanged(journal_app):
+    writer = Mood_Journal(app=journal_app, snapshot=True)
+    e_id = writer.mj_create_entry("Snap", 4, 4, 2024, "body", 3, 70, 20, tags=["a", "b"],
+                                  biometrics={"Sleep": "meh"})
+    writer.mj_set_entry_excluded_from_reports(e_id, True)
+    writer.mj_close()
+    Mood_Journal(app=journal_app, snapshot=True).mj_get_all_entries()  # table load writes it
+
+    restarted = Mood_Journal(app=journal_app, snapshot=True)
+    restarted._load_entries_from_db = lambda *args: pytest.fail("table was scanned")
+    entry = restarted.mj_get_entry(e_id)
+    assert (entry.entry_name, entry.entry_date, entry.tags) == ("Snap", date(2024, 4, 4), ["a", "b"])
+    assert entry.biometrics == {"Sleep": "meh"}
+    assert entry.is_excluded_from_reports is True
+    assert restarted.get_streak_summary()["last_entry_date"] == date(2024, 4, 4)
+
+
+def test_snapshot_is_ignored_once_the_database_changes(journal_app):
+    writer = Mood_Journal(app=journal_app, snapshot=True)
+    writer.mj_create_entry("First", 1, 1, 2024, "body", 1, 50, 5)
+    writer.mj_close()
+
+    # Another process writes without refreshing the snapshot
+    Mood_Journal(app=journal_app).mj_create_entry("Second", 2, 1, 2024, "body", 1, 50, 5)
+
+    restarted = Mood_Journal(app=journal_app, snapshot=True)
+    names = sorted(e.entry_name for e in restarted.mj_get_all_entries())
+    assert names == ["First", "Second"]
+
+
+def test_snapshot_never_holds_what_the_table_does_not(journal_app, monkeypatch):
+    Mood_Journal(app=journal_app).mj_create_entry("first", 1, 1, 2024, "", 1, 50, 5)
+    server = Mood_Journal(app=journal_app, snapshot=True)
+    assert [e.entry_name for e in server.mj_get_all_entries()] == ["first"]
+
+    # A write from another process (e.g. flask import-entries), then one that fails here
+    Mood_Journal(app=journal_app).mj_create_entry("from cli", 2, 1, 2024, "", 1, 50, 5)
+    monkeypatch.setattr(server, "_apply_writes", lambda ops: 1 / 0)
+    server.mj_create_entry("phantom", 3, 1, 2024, "", 1, 50, 5)
+    monkeypatch.undo()
+    server.mj_close()
+
+    restarted = Mood_Journal(app=journal_app, snapshot=True)
+    assert sorted(e.entry_name for e in restarted.mj_get_all_entries()) == ["first", "from cli"]
+
+    # A load the database changes under is read, but not saved as current
+    loading = Mood_Journal(app=journal_app, snapshot=True)
+    loading._load_snapshot = lambda: False  # read the table despite the current snapshot
+    load_rows = loading._load_entries_from_db
+
+    def load_during_a_write(*args):
+        load_rows(*args)
+        Mood_Journal(app=journal_app).mj_create_entry("late", 4, 1, 2024, "", 1, 50, 5)
+
+    loading._load_entries_from_db = load_during_a_write
+    loading.mj_get_all_entries()
+    names = sorted(e.entry_name for e in Mood_Journal(app=journal_app, snapshot=True).mj_get_all_entries())
+    assert names == ["first", "from cli", "late"]
+
+"""Trusted Hydration Tests"""
+def test_from_trusted_assigns_fields_without_generating_an_id(monkeypatch):
+    import uuid
+
+    monkeypatch.setattr(uuid, "uuid4", lambda: pytest.fail("uuid4 called"))
+    created = datetime(2025, 1, 2, 3, 4, 5)
+    e = Entry._from_trusted(
+        "stored-id", "Name", date(2025, 1, 2), "body", 4, 65, 30,
+        tags=["work"], biometrics={"Sleep": "meh"}, is_private=True, created_at=created,
+    )
+    assert (e.entry_id_str, e.entry_date, e.tags, e.biometrics) == ("stored-id", date(2025, 1, 2), ["work"], {"Sleep": "meh"})
+    assert e.is_private_check() is True and e.is_excluded_from_reports_check() is False
+    assert e.created_at == created
+
+
+def test_loaded_entries_carry_their_stored_created_at(journal_app):
+    e_id = Mood_Journal(app=journal_app).mj_create_entry("Stamped", 2, 2, 2025, "b", 1, 50, 5)
+    loaded = Mood_Journal(app=journal_app).mj_get_entry(e_id)
+    assert isinstance(loaded.created_at, datetime)
+
+"""Deferred Body Tests"""
+def test_deferred_bodies_load_in_a_batch_on_first_access(journal_app):
+    long_body = "word " * 400
+    writer = Mood_Journal(app=journal_app)
+    first = writer.mj_create_entry("First", 1, 1, 2025, long_body, 1, 50, 5)
+    second = writer.mj_create_entry("Second", 2, 1, 2025, "short one", 1, 50, 5)
+
+    mj = Mood_Journal(app=journal_app, defer_bodies=True)
+    entries = {e.entry_id_str: e for e in mj.mj_get_all_entries()}
+    assert not entries[first].body_loaded
+    assert entries[first].entry_preview.endswith("…") and len(entries[first].entry_preview) == 120
+
+    assert entries[first].entry_body == long_body
+    assert entries[second].body_loaded, "neighbouring bodies come along in the same batch"
+    assert entries[second].entry_body == "short one"
+
+
+def test_deferred_search_scans_stored_bodies_without_keeping_them(journal_app):
+    writer = Mood_Journal(app=journal_app)
+    hit = writer.mj_create_entry("A", 1, 1, 2025, "went HIKING today", 1, 50, 5)
+    writer.mj_create_entry("B", 2, 1, 2025, "stayed in", 1, 50, 5)
+
+    mj = Mood_Journal(app=journal_app, defer_bodies=True)
+    assert [e.entry_id_str for e in mj.mj_search_entries("hiking")] == [hit]
+    assert not any(e.body_loaded for e in mj.entries_dict.values())
+
+
+def test_deferred_entries_save_their_real_body(journal_app):
+    writer = Mood_Journal(app=journal_app)
+    e_id = writer.mj_create_entry("A", 1, 1, 2025, "keep me", 1, 50, 5)
+
+    mj = Mood_Journal(app=journal_app, defer_bodies=True)
+    mj.mj_set_entry_excluded_from_reports(e_id, True)
+    assert Mood_Journal(app=journal_app).mj_get_entry(e_id).entry_body == "keep me"
+
+
+def test_deferred_snapshot_round_trip(journal_app):
+    writer = Mood_Journal(app=journal_app, snapshot=True, defer_bodies=True)
+    e_id = writer.mj_create_entry("A", 1, 1, 2025, "from the database", 1, 50, 5)
+    writer.mj_close()
+    Mood_Journal(app=journal_app, snapshot=True, defer_bodies=True).mj_get_all_entries()
+
+    restarted = Mood_Journal(app=journal_app, snapshot=True)
+    restarted._load_entries_from_db = lambda *args: pytest.fail("table was scanned")
+    entry = restarted.mj_get_entry(e_id)
+    assert not entry.body_loaded
+    assert entry.entry_body == "from the database"
+
+
+def test_body_codec_round_trip():
+    from mood_mastery import body_codec
+
+    long_body = "I felt really tired this morning but the walk helped. " * 20
+    for codec in body_codec.available_codecs():
+        for body in ("", "short", long_body, "ünïcödé 😀 " * 30):
+            stored = body_codec.encode_body(body, codec)
+            assert body_codec.decode_body(stored) == body
+    assert len(body_codec.encode_body(long_body)) < len(long_body) // 4
+    assert body_codec.encode_body("short")[0] == body_codec.RAW
+    assert body_codec.decode_body("legacy plain text") == "legacy plain text"
+
+
+def test_saved_body_is_stored_once_compressed(journal_app):
+    from sqlalchemy import select
+
+    from extensions import db
+    from models import MoodEntry
+
+    body = "Long day at work, then dinner with my family and an early night. " * 10
+    mj = Mood_Journal(app=journal_app)
+    e_id = mj.mj_create_entry("A", 1, 1, 2025, body, 1, 50, 5)
+
+    with journal_app.app_context():
+        row = db.session.execute(
+            select(MoodEntry.entry_body, MoodEntry.notes, MoodEntry.entry_body_z)
+        ).one()
+    assert row.entry_body == "" and row.notes is None
+    assert len(row.entry_body_z) < len(body) // 4
+    assert Mood_Journal(app=journal_app).mj_get_entry(e_id).entry_body == body
+    assert Mood_Journal(app=journal_app, defer_bodies=True).mj_search_entries("early night")
+
+
+def test_entry_is_compact_but_keeps_its_api():
+    e = Entry("A", 2, 3, 2025, "body", 1, 50, 5, tags=["Work", "gym"], biometrics={"Sleep": "meh", "Menstruation": "no"})
+    assert not hasattr(e, "__dict__")
+    assert e.entry_date == date(2025, 3, 2) and e.entry_ordinal == date(2025, 3, 2).toordinal()
+    assert e.tags == ["work", "gym"] and e._tags == ("work", "gym")
+    assert e.biometrics == {"Sleep": "meh", "Menstruation": "no"}
+    assert isinstance(e._biometrics, int)
+
+    assert e.set_biometric("Sleep", "exhausted") and not e.set_biometric("Sleep", "bogus")
+    assert e.delete_biometric("Menstruation") and not e.delete_biometric("Menstruation")
+    assert e.get_biometrics() == {"Sleep": "exhausted"}
+    e.tags = ["x"]
+    e.entry_date = date(2024, 1, 1)
+    assert (e.tags, e.entry_date) == (["x"], date(2024, 1, 1))
+
+    tag = "".join(["tr", "avel"])  # a fresh string object, as read from the database
+    other = Entry._from_trusted("id", "B", date(2025, 1, 1), "", 1, 50, 5, tags=[tag])
+    again = Entry._from_trusted("id2", "C", date(2025, 1, 1), "", 1, 50, 5, tags=["".join(["trav", "el"])])
+    assert other._tags[0] is again._tags[0]
+    with pytest.raises(AttributeError):
+        other.created_at
+
+
+def test_entry_tags_and_biometrics_change_in_place():
+    mj = Mood_Journal(use_database=False)
+    e = mj.mj_get_entry(mj.mj_create_entry("A", 1, 1, 2025, "", 1, 50, 5, tags=["work"]))
+    kept = e.tags
+    e.tags.append("gym")
+    e.add_tag("run")
+    kept.remove("work")  # starts from the entry's tags, so "run" stays
+    assert e.tags == ["gym", "run"]
+    assert [x.entry_id_str for x in mj.mj_entries_with_tag("gym")] == [e.entry_id_str]
+    assert mj.mj_entries_with_tag("work") == []
+    e.tags += ["yoga"]
+    del e.tags[0]
+    assert e.tags == ["run", "yoga"]
+
+    e.biometrics["Sleep"] = "meh"
+    e.biometrics.update({"Menstruation": "no", "Unknown": "x"})
+    assert e.biometrics == {"Sleep": "meh", "Menstruation": "no"}
+    assert e.biometrics.pop("Sleep") == "meh" and e.get_biometrics() == {"Menstruation": "no"}
+
+
+def test_indexed_entry_setters_refuse_out_of_range_values():
+    mj = Mood_Journal(use_database=False)
+    e = mj.mj_get_entry(mj.mj_create_entry("a", 1, 1, 2025, "b", 3, 50, 10, [], {}))
+    day = date(2025, 1, 1)
+    for field, value in (("ranking", 9), ("ranking", 0), ("mood_rating", 101), ("difficulty_ranking", 0)):
+        with pytest.raises(ValueError):
+            setattr(e, field, value)
+    assert (e.ranking, e.mood_rating, e.difficulty_ranking) == (3, 50, 10)
+    assert mj.mj_range_report(day, day) == [0, 0, 1, 0, 0, 0, 0, 0]
+    assert mj.mj_mood_rating_graph("bar", day, day)[50] == 1
+    assert mj.mj_delete_entry(e.entry_id_str)
+
+    loose = Entry("Unindexed", 1, 1, 2025, "", 9, 50, 5)  # as before, anything goes off the journal
+    assert loose.ranking == 9
+
+
+def test_stored_rows_out_of_range_are_clamped_on_load(journal_app):
+    from sqlalchemy import update
+
+    from extensions import db
+    from models import MoodEntry
+
+    writer = Mood_Journal(app=journal_app)
+    low = writer.mj_create_entry("Low", 1, 1, 2025, "", 1, 1, 5)
+    high = writer.mj_create_entry("High", 2, 1, 2025, "", 8, 100, 5)
+    with journal_app.app_context():
+        db.session.execute(update(MoodEntry).where(MoodEntry.entry_id_str == low).values(ranking=0, mood_rating=0))
+        db.session.execute(update(MoodEntry).where(MoodEntry.entry_id_str == high).values(ranking=9, mood_rating=250))
+        db.session.commit()
+
+    for snapshot in (False, True, True):  # the second snapshot journal starts from the snapshot
+        mj = Mood_Journal(app=journal_app, snapshot=snapshot)
+        assert len(mj.mj_get_all_entries()) == 2
+        assert (mj.mj_get_entry(low).ranking, mj.mj_get_entry(low).mood_rating) == (1, 1)
+        assert (mj.mj_get_entry(high).ranking, mj.mj_get_entry(high).mood_rating) == (8, 100)
+        assert mj.mj_range_report(date(2025, 1, 1), date(2025, 1, 2)) == [1, 0, 0, 0, 0, 0, 0, 1]
+
+
+def test_date_index_follows_creates_edits_and_deletes():
+    mj = Mood_Journal(use_database=False)
+    a = mj.mj_create_entry("A", 3, 2, 2025, "", 1, 50, 5)
+    b = mj.mj_create_entry("B", 3, 2, 2025, "", 1, 50, 5)
+    c = mj.mj_create_entry("C", 20, 2, 2025, "", 1, 50, 5)
+
+    def ids(entries):
+        return [e.entry_id_str for e in entries]
+
+    assert ids(mj.mj_entries_on(2025, 2, 3)) == [a, b]
+    mj.mj_edit_entry(a, "A", 25, 2, 2025, "", 1, 50, 5)
+    assert ids(mj.mj_entries_on(2025, 2, 3)) == [b]
+    assert ids(mj.mj_entries_between(date(2025, 2, 4), date(2025, 2, 28))) == [c, a]
+
+    mj.mj_delete_entry(b)
+    calendar = mj.mj_month_calendar(2025, 2)
+    assert calendar[date(2025, 2, 3)] == []
+    assert ids(calendar[date(2025, 2, 25)]) == [a]
+    assert mj._date_ordinals == [date(2025, 2, 20).toordinal(), date(2025, 2, 25).toordinal()]
+
+    mj.mj_clear_all_data()
+    assert mj._date_index == {} and mj.mj_entries_between(date.min, date.max) == []
+
+
+def test_tag_index_follows_entry_and_journal_changes():
+    mj = Mood_Journal(use_database=False)
+    a = mj.mj_create_entry("A", 1, 1, 2025, "", 1, 50, 5, tags=["Work", "gym"])
+    b = mj.mj_create_entry("B", 2, 1, 2025, "", 1, 50, 5, tags=["work"])
+    assert mj.mj_tag_summary() == [("work", 2), ("gym", 1)]
+
+    # Changes made straight on an entry reach the journal's indexes too
+    entry_a = mj.mj_get_entry(a)
+    entry_a.add_tag("sleep")
+    entry_a.remove_tag("work")
+    assert mj.mj_all_tags() == ["gym", "sleep", "work"]
+    assert [e.entry_id_str for e in mj.mj_entries_with_tag(" WORK ")] == [b]
+    entry_a.entry_date = date(2025, 3, 1)
+    assert mj.mj_entries_on(2025, 3, 1) == [entry_a]
+
+    mj.mj_clear_tags(a)
+    mj.mj_create_entry("C", 3, 1, 2025, "", 1, 50, 5, tags=["gym"])
+    assert mj.mj_tag_summary() == [("gym", 1), ("work", 1)]
+    mj.mj_delete_entry(b)
+    assert mj.mj_all_tags() == ["gym"] and mj.mj_entries_with_tag("work") == []
+
+    mj.mj_clear_all_data()
+    assert entry_a._journal is None and mj.mj_tag_summary() == []
+
+
+def test_streak_runs_match_a_full_recount():
+    import random
+
+    from mood_mastery.streak_runs import StreakRuns
+
+    def recount(days):
+        ordered = sorted(days)
+        runs = []
+        for d in ordered:
+            if runs and runs[-1][1] == d - 1:
+                runs[-1][1] = d
+            else:
+                runs.append([d, d])
+        if not runs:
+            return None, 0
+        return (runs[-1][1] - runs[-1][0] + 1, runs[-1][1]), max(e - s + 1 for s, e in runs)
+
+    rng = random.Random(18)
+    runs, days = StreakRuns(), set()
+    for _ in range(3000):
+        day = rng.randrange(60)
+        if day in days and rng.random() < 0.5:
+            days.discard(day)
+            runs.remove_day(day)
+        else:
+            days.add(day)
+            runs.add_day(day)
+        assert (runs.latest(), runs.longest()) == recount(days)
+
+
+def test_streak_follows_edits_and_middle_deletes():
+    mj = Mood_Journal(use_database=False)
+    ids = [mj.mj_create_entry(f"D{d}", d, 5, 2026, "", 1, 50, 5) for d in range(1, 8)]
+    extra = mj.mj_create_entry("D4 again", 4, 5, 2026, "", 1, 50, 5)
+    assert (mj.streak_current, mj.streak_longest) == (7, 7)
+
+    mj.mj_delete_entry(ids[3])  # the 4th still has another entry
+    assert (mj.streak_current, mj.streak_longest) == (7, 7)
+    mj.mj_delete_entry(extra)  # now the run splits into 1-3 and 5-7
+    assert (mj.streak_current, mj.streak_longest) == (3, 3)
+
+    mj.mj_edit_entry(ids[6], "D7", 4, 5, 2026, "", 1, 50, 5)  # 7th moves into the gap
+    assert (mj.streak_current, mj.streak_longest, mj.last_entry_date) == (6, 6, date(2026, 5, 6))
+
+
+def _full_scan_mood_trends(entries):
+    """The full-scan mj_mood_graph_trends this journal used to run on every call"""
+    weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    thirds = ["First third", "Second third", "Last third"]
+    months = ["January", "February", "March", "April", "May", "June", "July", "August",
+              "September", "October", "November", "December"]
+    by_day = {d: [] for d in weekdays}
+    by_third = {t: [] for t in thirds}
+    by_month = {m: [] for m in months}
+    for e in entries:
+        d = e.entry_date
+        by_day[weekdays[d.weekday()]].append(e.mood_rating)
+        by_third[thirds[0 if d.day < 11 else 1 if d.day < 21 else 2]].append(e.mood_rating)
+        by_month[months[d.month - 1]].append(e.mood_rating)
+
+    def extremes(groups):
+        happiest, happiest_avg, saddest, saddest_avg = "", 0, "", 999
+        for label, ratings in groups.items():
+            if ratings:
+                avg = sum(ratings) / len(ratings)
+                if avg > happiest_avg:
+                    happiest, happiest_avg = label, avg
+                elif avg == happiest_avg:
+                    happiest += ", " + label
+                if avg < saddest_avg:
+                    saddest, saddest_avg = label, avg
+                elif avg == saddest_avg:
+                    saddest += ", " + label
+        return [happiest, happiest_avg], [saddest, saddest_avg]
+
+    result = {}
+    for key, groups in (("day_of_week", by_day), ("time_of_month", by_third), ("month_of_year", by_month)):
+        result[f"happiest_{key}"], result[f"saddest_{key}"] = extremes(groups)
+    return result
+
+
+def test_mood_trend_accumulators_match_a_full_scan():
+    import random
+
+    rng = random.Random(19)
+    mj = Mood_Journal(use_database=False)
+    assert mj.mj_mood_graph_trends() == _full_scan_mood_trends([])
+    ids = []
+    for step in range(600):
+        action = rng.random()
+        if action < 0.45 or not ids:
+            d = date(2025, 1, 1) + timedelta(days=rng.randrange(400))
+            ids.append(mj.mj_create_entry("E", d.day, d.month, d.year, "", rng.randint(1, 8), rng.randint(1, 100), 5))
+        elif action < 0.6:
+            entry_id = ids.pop(rng.randrange(len(ids)))
+            mj.mj_delete_entry(entry_id)
+        elif action < 0.75:
+            d = date(2025, 1, 1) + timedelta(days=rng.randrange(400))
+            mj.mj_edit_entry(rng.choice(ids), "E", d.day, d.month, d.year, "", 1, rng.randint(1, 100), 5)
+        elif action < 0.85:
+            mj.mj_get_entry(rng.choice(ids)).mood_rating = rng.randint(1, 100)
+        elif action < 0.95:
+            mj.mj_set_entry_excluded_from_reports(rng.choice(ids), rng.random() < 0.5)
+        else:
+            mj.mj_get_entry(rng.choice(ids)).entry_date = date(2025, 1, 1) + timedelta(days=rng.randrange(400))
+        if step % 10 == 0:
+            assert mj.mj_mood_graph_trends() == _full_scan_mood_trends(mj.entries_dict.values())
+    assert mj.mj_mood_graph_trends() == _full_scan_mood_trends(mj.entries_dict.values())
+
+
+def test_range_histograms_match_a_full_scan():
+    import random
+
+    rng = random.Random(20)
+    mj = Mood_Journal(use_database=False)
+    first = date(2025, 1, 1)
+    ids = []
+
+    def random_day():
+        return first + timedelta(days=rng.randrange(300))
+
+    def scan(start, end):
+        moods, rankings = [0] * 100, [0] * 8
+        for e in mj.entries_dict.values():
+            if start <= e.entry_date <= end:
+                moods[e.mood_rating - 1] += 1
+                if not e.is_excluded_from_reports:
+                    rankings[e.ranking - 1] += 1
+        return moods, rankings
+
+    for step in range(500):
+        action = rng.random()
+        if action < 0.45 or not ids:
+            d = random_day()
+            ids.append(mj.mj_create_entry("E", d.day, d.month, d.year, "", rng.randint(1, 8), rng.randint(1, 100), 5))
+        elif action < 0.55:
+            mj.mj_delete_entry(ids.pop(rng.randrange(len(ids))))
+        elif action < 0.7:
+            d = random_day()
+            mj.mj_edit_entry(rng.choice(ids), "E", d.day, d.month, d.year, "", rng.randint(1, 8), rng.randint(1, 100), 5)
+        elif action < 0.8:
+            mj.mj_get_entry(rng.choice(ids)).ranking = rng.randint(1, 8)
+        elif action < 0.9:
+            mj.mj_set_entry_excluded_from_reports(rng.choice(ids), rng.random() < 0.5)
+        else:
+            mj.mj_get_entry(rng.choice(ids)).mood_rating = rng.randint(1, 100)
+        if step % 10 == 0:
+            start, end = sorted((random_day(), random_day()))
+            moods, rankings = scan(start, end)
+            graph = mj.mj_mood_rating_graph("bar", start, end)
+            assert [graph[i] for i in range(1, 101)] == moods
+            assert mj.mj_range_report(start, end) == (rankings if any(rankings) else None)
+
+    mj.mj_clear_all_data()
+    assert sum(mj.mj_mood_rating_graph("bar", date.min, date.max).values()) == 0
+
+
+def test_out_of_range_values_are_refused_before_anything_is_indexed():
+    mj = Mood_Journal(use_database=False)
+    kept = mj.mj_create_entry("Kept", 1, 1, 2025, "", 4, 50, 5)
+    day = date(2025, 1, 1)
+
+    for ranking, mood in ((9, 50), (0, 50), (4, 0), (4, 101)):
+        with pytest.raises(ValueError):
+            mj.mj_create_entry("Bad", 2, 1, 2025, "", ranking, mood, 5)
+        with pytest.raises(ValueError):
+            mj.mj_edit_entry(kept, "Bad", 2, 1, 2025, "", ranking, mood, 5)
+
+    assert list(mj.entries_dict) == [kept]
+    assert mj.mj_get_entry(kept).entry_name == "Kept"
+    assert mj.mj_range_report(day, day) == [0, 0, 0, 1, 0, 0, 0, 0]
+    graph = mj.mj_mood_rating_graph("bar", day, day)
+    assert (graph[50], sum(graph.values())) == (1, 1)
+    assert mj.mj_delete_entry(kept)
+    assert mj.mj_range_report(day, day) is None
+
+
+def test_entry_forms_clamp_ranking_and_drop_unknown_biometrics(app_routes):
+    client, mj = app_routes
+    form = {"title": "Form", "year": "2025", "month": "1", "day": "1", "mood_rating": "50"}
+
+    assert client.post("/entries/add", data={**form, "ranking": "9"}).status_code == 302
+    (entry_id,) = mj.entries_dict
+    assert mj.mj_get_entry(entry_id).ranking == 8
+    client.post(f"/entries/{entry_id}/edit", data={**form, "ranking": "0"})
+    assert mj.mj_get_entry(entry_id).ranking == 1
+    assert mj.mj_delete_entry(entry_id)
+
+    # Biometric values outside the vocabulary are dropped, not a failed request
+    bio = {"bio_Sleep": "bogus", "bio_Menstruation": "no"}
+    assert client.post("/entries/add", data={**form, "ranking": "3", **bio}).status_code == 302
+    (entry_id,) = mj.entries_dict
+    assert mj.mj_get_entry(entry_id).biometrics == {"Menstruation": "no"}
+
+
+def test_range_report_loads_or_counts_the_range_in_windowed_mode(journal_app):
+    writer = Mood_Journal(app=journal_app)
+    old = writer.mj_create_entry("Old", 1, 1, 2020, "", 3, 40, 5)
+    writer.mj_create_entry("Old too", 2, 1, 2020, "", 3, 60, 5)
+    writer.mj_set_entry_excluded_from_reports(old, True)
+
+    reader = Mood_Journal(app=journal_app, load_window_days=30)
+    assert reader.mj_range_report(date(2020, 1, 1), date(2020, 1, 31)) == [0, 0, 1, 0, 0, 0, 0, 0]
+    graph = reader.mj_mood_rating_graph("bar", date(2019, 12, 1), date(2020, 1, 31))
+    assert (graph[40], graph[60], sum(graph.values())) == (1, 1, 2)
+    assert reader.mj_range_report(date(2021, 1, 1), date(2021, 1, 31)) is None
+
+
+def test_ranking_index_matches_a_full_scan():
+    import random
+
+    rng = random.Random(21)
+    mj = Mood_Journal(use_database=False)
+    ids = []
+
+    def scan(ranking):
+        counts, keys = [0] * 100, set()
+        for key, e in mj.entries_dict.items():
+            if e.ranking == ranking:
+                counts[e.mood_rating - 1] += 1
+                keys.add(key)
+        return counts, keys
+
+    for step in range(400):
+        action = rng.random()
+        if action < 0.5 or not ids:
+            ids.append(mj.mj_create_entry("E", 1, 1, 2025, "", rng.randint(1, 8), rng.randint(1, 100), 5))
+        elif action < 0.6:
+            mj.mj_delete_entry(ids.pop(rng.randrange(len(ids))))
+        elif action < 0.75:
+            mj.mj_edit_entry(rng.choice(ids), "E", 2, 1, 2025, "", rng.randint(1, 8), rng.randint(1, 100), 5)
+        elif action < 0.9:
+            mj.mj_get_entry(rng.choice(ids)).ranking = rng.randint(1, 8)
+        else:
+            mj.mj_get_entry(rng.choice(ids)).mood_rating = rng.randint(1, 100)
+        if step % 20 == 0:
+            groups = mj.mj_emoji_groups_all()
+            for ranking in range(1, 9):
+                counts, keys = groups[ranking]
+                assert (counts, set(keys)) == scan(ranking)
+                assert groups[ranking] == mj.mj_emoji_groups(ranking)
+
+
+def test_get_entries_loads_missing_ids_together(journal_app):
+    writer = Mood_Journal(app=journal_app)
+    old = writer.mj_create_entry("Old", 1, 1, 2020, "", 2, 40, 5)
+    older = writer.mj_create_entry("Older", 1, 1, 2019, "", 2, 60, 5)
+    recent = writer.mj_create_entry("Recent", date.today().day, date.today().month, date.today().year, "", 2, 50, 5)
+
+    reader = Mood_Journal(app=journal_app, load_window_days=30)
+    assert reader.mj_get_entry(recent)
+    found = reader.mj_get_entries([older, "missing", old, recent])
+    assert [e.entry_name for e in found] == ["Older", "Old", "Recent"]
+    assert not reader._db_loaded
+    assert reader.mj_get_entries([]) == []
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_column_store_stays_in_sync_with_the_entries(monkeypatch, use_numpy):
+    import random
+
+    from mood_mastery import column_store
+
+    if not use_numpy:
+        monkeypatch.setattr(column_store, "numpy", None)
+    elif column_store.numpy is None:
+        pytest.skip("numpy is not installed")
+
+    rng = random.Random(22)
+    mj = Mood_Journal(use_database=False)
+    ids = []
+
+    def check():
+        store = mj._columns
+        assert sorted(store.ids) == sorted(mj.entries_dict)
+        for entry_id, e in mj.entries_dict.items():
+            row = store.row_of(entry_id)
+            assert store.ids[row] == entry_id
+            assert [store.columns[name][row] for name, _ in column_store.COLUMNS] == [
+                e.entry_ordinal, e.mood_rating, e.ranking, e.difficulty_ranking,
+                e.is_excluded_from_reports, e.is_private,
+            ]
+            assert store.tag_mask(row) == sum(1 << store._tag_bits[t] for t in e.tags)
+        expected = [[0, 0] for _ in range(7)]
+        for e in mj.entries_dict.values():
+            expected[e.entry_date.weekday()][0] += e.difficulty_ranking
+            expected[e.entry_date.weekday()][1] += 1
+        assert mj.mj_difficulty_by_weekday() == [(s / c if c else None, c) for s, c in expected]
+        reported = [[0] * 7, [0] * 7]
+        for e in mj.entries_dict.values():
+            if not e.is_excluded_from_reports:
+                reported[0][e.entry_date.weekday()] += e.mood_rating
+                reported[1][e.entry_date.weekday()] += 1
+        assert list(store.weekday_sums("mood_rating", include_excluded=False)) == reported
+
+    for step in range(400):
+        action = rng.random()
+        if action < 0.45 or not ids:
+            d = date(2025, 1, 1) + timedelta(days=rng.randrange(60))
+            ids.append(mj.mj_create_entry("E", d.day, d.month, d.year, "", rng.randint(1, 8), rng.randint(1, 100), rng.randint(1, 100), tags=[f"t{rng.randrange(70)}"]))
+        elif action < 0.6:
+            mj.mj_delete_entry(ids.pop(rng.randrange(len(ids))))
+        elif action < 0.7:
+            mj.mj_edit_entry(rng.choice(ids), "E", 9, 2, 2025, "", rng.randint(1, 8), rng.randint(1, 100), rng.randint(1, 100))
+        elif action < 0.8:
+            mj.mj_get_entry(rng.choice(ids)).difficulty_ranking = rng.randint(1, 100)
+        elif action < 0.9:
+            mj.mj_get_entry(rng.choice(ids)).set_privacy_setting(rng.random() < 0.5)
+        else:
+            mj.mj_set_entry_excluded_from_reports(rng.choice(ids), rng.random() < 0.5)
+        if step % 25 == 0:
+            check()
+    check()
+    mj.mj_clear_all_data()
+    assert len(mj._columns) == 0
+    assert mj.mj_difficulty_by_weekday() == [(None, 0)] * 7
+
+
+def _per_entry_similar(mj, entry_id_str, limit, weights):
+    """The per-Entry mj_find_similar_entries loop the column-store version replaced"""
+    target = mj.entries_dict[entry_id_str]
+    similarities = []
+    for entry_id, entry in mj.entries_dict.items():
+        if entry_id == entry_id_str:
+            continue
+        mood_sim = 1.0 - (abs(target.mood_rating - entry.mood_rating) / 100.0)
+        ranking_sim = 1.0 - (abs(target.ranking - entry.ranking) / 7.0)
+        difficulty_sim = 1.0 - (abs(target.difficulty_ranking - entry.difficulty_ranking) / 4.0)
+        target_tags, entry_tags = set(target.tags), set(entry.tags)
+        if target_tags or entry_tags:
+            tag_sim = len(target_tags & entry_tags) / len(target_tags | entry_tags)
+        else:
+            tag_sim = 1.0
+        days_diff = abs((target.entry_date - entry.entry_date).days)
+        date_sim = 1.0 - min(days_diff / 365.0, 1.0)
+        similarities.append((entry_id, (
+            mood_sim * weights["mood"] + ranking_sim * weights["ranking"]
+            + difficulty_sim * weights["difficulty"] + tag_sim * weights["tags"]
+            + date_sim * weights["date"]
+        )))
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:limit]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_similar_entries_match_the_per_entry_scores(monkeypatch, use_numpy):
+    import random
+
+    from mood_mastery import column_store
+    from mood_mastery.similarity import SIMILARITY_WEIGHTS
+
+    if not use_numpy:
+        monkeypatch.setattr(column_store, "numpy", None)
+    elif column_store.numpy is None:
+        pytest.skip("numpy is not installed")
+
+    rng = random.Random(23)
+    mj = Mood_Journal(use_database=False)
+    # Few distinct values, so plenty of ties; 80 tags, so tag sets span two bit words
+    tag_pool = [f"tag{i}" for i in range(80)]
+    ids = []
+    for _ in range(300):
+        d = date(2025, 1, 1) + timedelta(days=rng.randrange(500))
+        ids.append(mj.mj_create_entry(
+            "E", d.day, d.month, d.year, "", rng.randint(1, 3), rng.choice((40, 50, 60)),
+            rng.randint(1, 3), tags=rng.sample(tag_pool, rng.randrange(0, 4)),
+        ))
+    for entry_id in rng.sample(ids, 40):
+        mj.mj_delete_entry(entry_id)
+        ids.remove(entry_id)
+    mj.mj_get_entry(ids[0]).add_tag("tag79")
+    mj.mj_get_entry(ids[1]).clear_tags()
+
+    custom = {"mood": 0.5, "tags": 0.4, "date": 0.0}
+    for entry_id in rng.sample(ids, 25):
+        for limit, weights in ((3, None), (10, custom), (len(ids) + 5, None)):
+            expected = _per_entry_similar(mj, entry_id, limit, dict(SIMILARITY_WEIGHTS, **(weights or {})))
+            found = mj.mj_find_similar_entries(entry_id, limit=limit, weights=weights)
+            assert [(e.entry_id_str, score) for e, score in found] == expected
+    assert mj.mj_find_similar_entries("missing") == []
+    assert mj.mj_find_similar_entries(ids[0], limit=0) == []
+
+
+def test_column_store_reuses_the_bits_of_tags_no_entry_holds():
+    import random
+
+    from mood_mastery.similarity import SIMILARITY_WEIGHTS
+
+    rng = random.Random(23)
+    mj = Mood_Journal(use_database=False)
+    store = mj._columns
+    ids = [mj.mj_create_entry("E", 1 + i % 28, 1, 2025, "", 4, 50, 5) for i in range(1000)]
+    weights = dict(SIMILARITY_WEIGHTS)
+
+    for cycle in range(640):
+        tag = f"cycle{cycle}"
+        tagged = rng.sample(ids, 5)
+        for entry_id in tagged:
+            mj.mj_add_tag(entry_id, tag)
+        if cycle % 64 == 0:
+            found = mj.mj_find_similar_entries(tagged[0], limit=3)
+            assert [(e.entry_id_str, score) for e, score in found] == _per_entry_similar(mj, tagged[0], 3, weights)
+        for entry_id in tagged:
+            mj.mj_remove_tag(entry_id, tag)
+        assert len(store.tag_words) <= 1
+
+    assert store._tag_bits == {} and store.tag_words == []
+    keep = mj.mj_create_entry("Kept", 1, 1, 2025, "", 4, 50, 5, tags=["kept"])
+    assert store.tag_mask(store.row_of(keep)) == 1 << store._tag_bits["kept"]
+    assert not any(store.tag_mask(store.row_of(entry_id)) for entry_id in ids)
+
+
+def test_similarity_index_follows_changes_and_matches_the_full_scan():
+    import random
+
+    from mood_mastery.similarity import resolve_weights, top_similar
+    from mood_mastery.similarity_index import SimilarityIndex
+
+    rng = random.Random(24)
+    mj = Mood_Journal(use_database=False)
+    ids = []
+    for step in range(500):
+        action = rng.random()
+        if action < 0.5 or not ids:
+            d = date(2025, 1, 1) + timedelta(days=rng.randrange(90))
+            ids.append(mj.mj_create_entry(
+                "E", d.day, d.month, d.year, "", rng.randint(1, 4), rng.randint(45, 55),
+                rng.randint(1, 5), tags=rng.sample(["a", "b", "c", "d"], rng.randrange(0, 3)),
+            ))
+        elif action < 0.6:
+            mj.mj_delete_entry(ids.pop(rng.randrange(len(ids))))
+        elif action < 0.7:
+            mj.mj_edit_entry(rng.choice(ids), "E", 1, 2, 2025, "", rng.randint(1, 4), rng.randint(45, 55), rng.randint(1, 5))
+        elif action < 0.8:
+            mj.mj_get_entry(rng.choice(ids)).difficulty_ranking = rng.randint(1, 5)
+        elif action < 0.9:
+            mj.mj_get_entry(rng.choice(ids)).mood_rating = rng.randint(45, 55)
+        else:
+            mj.mj_get_entry(rng.choice(ids)).ranking = rng.randint(1, 4)
+        if step % 25 == 0:
+            assert len(mj._similarity_index) == len(mj.entries_dict)
+            for weights in (None, {"date": 0.5, "tags": 0.0}):
+                weights = resolve_weights(weights)
+                for entry_id in rng.sample(ids, min(5, len(ids))):
+                    for limit in (1, 3, 8):
+                        assert mj._similarity_index.top_similar(mj._columns, entry_id, limit, weights) == (
+                            top_similar(mj._columns, entry_id, limit, weights)
+                        )
+
+    # A negative weight breaks the cell bounds, so those lookups take the full scan
+    assert not SimilarityIndex.worth_searching(mj._columns, resolve_weights({"date": -0.1}))
+    weights = {"date": -0.1}
+    assert [(e.entry_id_str, s) for e, s in mj.mj_find_similar_entries(ids[0], 5, weights)] == (
+        top_similar(mj._columns, ids[0], 5, weights)
+    )
+    mj.mj_clear_all_data()
+    assert len(mj._similarity_index) == 0
+
+
+@pytest.mark.parametrize("prefill", [False, True])
+def test_similar_cache_only_drops_lists_a_change_can_alter(prefill):
+    import random
+    import time
+
+    from mood_mastery.similarity import resolve_weights
+
+    rng = random.Random(25)
+    mj = Mood_Journal(use_database=False, prefill_similar=prefill)
+    cache = mj._similar_cache
+    cache.quiet_interval = 0.001
+
+    def create():
+        d = date(2025, 1, 1) + timedelta(days=rng.randrange(120))
+        return mj.mj_create_entry(
+            "E", d.day, d.month, d.year, "", rng.randint(1, 8), rng.randint(1, 100),
+            rng.randint(1, 5), tags=rng.sample(["a", "b", "c", "d"], rng.randrange(0, 3)),
+        )
+
+    def check(entry_ids):
+        for entry_id in entry_ids:
+            expected = mj._search_similar(entry_id, 3, resolve_weights(None))
+            found = mj.mj_find_similar_entries(entry_id, limit=3)
+            assert [(e.entry_id_str, score) for e, score in found] == expected
+            assert [e.entry_id_str for e, _ in mj.mj_find_similar_entries(entry_id, limit=1)] == [
+                i for i, _ in expected[:1]
+            ]
+
+    ids = [create() for _ in range(300)]
+    if prefill:
+        deadline = time.monotonic() + 10
+        while len(cache) < len(ids) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    check(ids)
+    assert len(cache) == len(ids)
+
+    # One edit leaves most of the journal's lists in place
+    mj.mj_get_entry(ids[0]).mood_rating = 100 - mj.mj_get_entry(ids[0]).mood_rating // 2
+    with cache.lock:
+        cache._settle(len(cache._pending))
+        assert len(ids) // 2 < len(cache) < len(ids)
+
+    for step in range(200):
+        action = rng.random()
+        if action < 0.3:
+            ids.append(create())
+        elif action < 0.45:
+            mj.mj_delete_entry(ids.pop(rng.randrange(len(ids))))
+        elif action < 0.6:
+            mj.mj_get_entry(rng.choice(ids)).mood_rating = rng.randint(1, 100)
+        elif action < 0.7:
+            mj.mj_get_entry(rng.choice(ids)).ranking = rng.randint(1, 8)
+        elif action < 0.8:
+            mj.mj_get_entry(rng.choice(ids)).difficulty_ranking = rng.randint(1, 5)
+        elif action < 0.9:
+            mj.mj_get_entry(rng.choice(ids)).add_tag(rng.choice(["a", "b", "e"]))
+        else:
+            mj.mj_get_entry(rng.choice(ids)).entry_date = date(2025, 1, 1) + timedelta(days=rng.randrange(120))
+        if step % 20 == 0:
+            check(rng.sample(ids, 10))
+    check(ids)
+
+    mj.mj_clear_all_data()
+    assert len(cache) == 0 and mj.mj_find_similar_entries(ids[0]) == []
+    mj.mj_close()
+
+
+def test_similar_cache_thread_fills_written_entries_and_leaves_loaded_ones(journal_app):
+    import time
+
+    writer = Mood_Journal(app=journal_app)
+    loaded = [writer.mj_create_entry("Old", 1 + i, 1, 2025, "", 1 + i % 8, 10 * i + 5, 3) for i in range(8)]
+
+    mj = Mood_Journal(app=journal_app, prefill_similar=True)
+    cache = mj._similar_cache
+    cache.quiet_interval = 0.001
+    assert len(mj.mj_get_all_entries()) == 8
+    written = mj.mj_create_entry("New", 20, 1, 2025, "", 4, 50, 3)
+    deadline = time.monotonic() + 10
+    while written not in cache._cached and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)  # give it time to (wrongly) go on to the loaded entries
+    with cache.lock:
+        assert list(cache._cached) == [written] and not cache._unfilled
+
+    # A loaded entry is searched (and cached) when it's first opened
+    assert [e.entry_id_str for e, _ in mj.mj_find_similar_entries(loaded[0], limit=1)]
+    assert loaded[0] in cache._cached
+    mj.mj_close()
@@ -0,0 +1,42 @@
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from extensions import db
+from sqlite_tuning import DEFAULT_SQLITE_PROFILE, SQLiteTuning
+
+
+def _pragma(app, name):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_apply_profile_sets_pragmas_on_new_connections(journal_app):
+    SQLiteTuning.apply_profile(journal_app, DEFAULT_SQLITE_PROFILE)
+
+    assert _pragma(journal_app, "journal_mode") == "wal"
+    assert _pragma(journal_app, "synchronous") == 1  # NORMAL
+    assert _pragma(journal_app, "temp_store") == 2  # MEMORY
+    assert _pragma(journal_app, "busy_timeout") == 5000
+    assert _pragma(journal_app, "cache_size") == -64000
+
+    busy, _, _ = SQLiteTuning.checkpoint(journal_app)
+    assert busy == 0
+
+
+def test_apply_profile_disabled_keeps_defaults(journal_app):
+    journal_app.config["SQLITE_PERFORMANCE_PROFILE"] = None
+    SQLiteTuning.apply_profile(journal_app)
+    assert _pragma(journal_app, "journal_mode") == "delete"
+
+
+def test_schedule_checkpoint_adds_interval_job(journal_app):
+    scheduler = BackgroundScheduler()
+    scheduler.start(paused=True)
+    try:
+        SQLiteTuning.schedule_checkpoint(scheduler, journal_app, minutes=5)
+        SQLiteTuning.schedule_checkpoint(scheduler, journal_app, minutes=10)  # replaces, no duplicate
+        jobs = scheduler.get_jobs()
+        assert [job.id for job in jobs] == ["wal-checkpoint"]
+        assert jobs[0].trigger.interval.total_seconds() == 600
+    finally:
+        scheduler.shutdown(wait=False)